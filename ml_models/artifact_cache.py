@@ -0,0 +1,188 @@
+"""
+Persistent cache of per-recording intermediate representations
+
+Re-extracting an archive after adding or tweaking a feature mostly repeats
+the same decoding, STFT and mel transforms. ArtifactCache keeps those
+arrays on local disk, compressed, keyed by a hash of the recording's bytes
+and of the extractor parameters that shape them, so a later extraction
+only computes what is new. The cache is bounded in size and evicts the
+least recently used recordings first. Writes keep a running size estimate,
+so the directory is only scanned when the estimate crosses the bound or
+every few hundred writes, not on every put.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Bump when a cached transform changes so stale artifacts are not reused
+ARTIFACT_VERSION = 1
+
+
+def content_hash(source, chunk_size=1 << 20):
+    """
+    SHA-256 of a recording's bytes
+
+    Args:
+        source: File path or raw audio bytes
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    else:
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Size-bounded LRU store of compressed NumPy arrays on local disk
+
+    Each entry is one .npz file holding named arrays (decoded signal, STFT
+    magnitude, log-mel spectrogram, ...). Reading an entry refreshes its
+    modification time, which is the recency used for eviction, so several
+    processes can share one cache directory.
+    """
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024 ** 3, low_water=0.9, rescan_every=256):
+        """
+        Args:
+            cache_dir: Directory for the cache files
+            max_bytes: Total size above which least recently used entries
+                are evicted
+            low_water: Fraction of max_bytes eviction trims down to, so a
+                full cache is not rescanned on every write
+            rescan_every: Writes after which the directory is rescanned
+                anyway, to account for other processes sharing it
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.rescan_every = rescan_every
+        self._lock = threading.Lock()
+        self._estimated_bytes = 0
+        self._writes_since_scan = 0
+        self.counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'scans': 0}
+        self.evict()  # The bound may have shrunk since the last run
+
+    @staticmethod
+    def key(source_hash, **params):
+        """
+        Cache key for a recording and the parameters its artifacts depend on
+
+        Args:
+            source_hash: content_hash() of the recording
+            **params: Sample rate, resampler, transform settings, ...
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256(source_hash.encode())
+        digest.update(json.dumps({'version': ARTIFACT_VERSION, **params}, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / f'{key}.npz'
+
+    def get(self, key):
+        """
+        Load the arrays stored for key
+
+        Returns:
+            dict: Array name -> np.ndarray, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+            os.utime(path)
+        except (OSError, ValueError, EOFError):
+            # Missing, evicted by another process or truncated
+            with self._lock:
+                self.counters['misses'] += 1
+            return None
+        with self._lock:
+            self.counters['hits'] += 1
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Store arrays for key (replacing any previous entry), evicting least
+        recently used entries once the running size estimate exceeds
+        max_bytes
+        """
+        path = self._path(key)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        # Write then rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+                written = f.tell()
+            os.replace(temp_path, path)
+        except OSError:
+            Path(temp_path).unlink(missing_ok=True)
+            return
+        with self._lock:
+            self.counters['writes'] += 1
+            self._estimated_bytes += written - replaced
+            self._writes_since_scan += 1
+            due = (self._estimated_bytes > self.max_bytes
+                   or self._writes_since_scan >= self.rescan_every)
+        if due:
+            self.evict()
+
+    def evict(self):
+        """
+        Rescan the directory and, if it exceeds max_bytes, delete least
+        recently used entries until it fits low_water * max_bytes
+        """
+        entries = []
+        for path in self.cache_dir.glob('*.npz'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            target = self.max_bytes * self.low_water
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                with self._lock:
+                    self.counters['evictions'] += 1
+        with self._lock:
+            self._estimated_bytes = total
+            self._writes_since_scan = 0
+            self.counters['scans'] += 1
+
+    def size(self):
+        """Bytes currently on disk"""
+        total = 0
+        for path in self.cache_dir.glob('*.npz'):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def stats(self):
+        return {'bytes': self.size(), 'max_bytes': self.max_bytes, **self.counters}
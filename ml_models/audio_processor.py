@@ -2,111 +2,753 @@
 Audio Feature Extraction Utilities
 Extracts speech features from audio files for ML model prediction
 """
+import io
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import librosa
 import numpy as np
+import soundfile
 from pathlib import Path
 import speech_recognition as sr
 
+try:
+    from .artifact_cache import content_hash
+    from .segment_features import extract_segmented
+except ImportError:
+    from artifact_cache import content_hash
+    from segment_features import extract_segmented
+
+
+# Formats libsndfile decodes natively (MP3 needs libsndfile >= 1.1, which
+# soundfile 0.12 bundles, and is what librosa.load used for it); everything
+# else, notably browser webm/opus, goes through ffmpeg
+SOUNDFILE_FORMATS = {'wav', 'flac', 'ogg', 'oga', 'opus', 'mp3'}
+
+# Resampler quality for in-process resampling (librosa res_type values)
+RESAMPLE_TYPES = {'soxr_vhq', 'soxr_hq', 'soxr_mq', 'soxr_lq', 'soxr_qq', 'polyphase', 'linear'}
+
+
+def _to_mono_float32(data):
+    """Downmix (frames, channels) audio to a contiguous mono float32 array"""
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+
+def decode_with_soundfile(source, target_sr, res_type='soxr_hq'):
+    """
+    Decode WAV/FLAC/OGG with libsndfile, then resample if needed
+
+    Args:
+        source: File path or file-like object
+        target_sr: Output sample rate
+        res_type: librosa resampler used when the file rate differs
+
+    Returns:
+        np.ndarray: Mono float32 signal at target_sr
+    """
+    data, file_sr = soundfile.read(source, dtype='float32', always_2d=True)
+    y = _to_mono_float32(data)
+    if file_sr != target_sr:
+        y = librosa.resample(y, orig_sr=file_sr, target_sr=target_sr, res_type=res_type)
+    return y
+
+
+def _read_wav_stream(data):
+    """
+    Sample rate and samples of the 16-bit WAV ffmpeg writes to a pipe
+
+    A pipe is not seekable, so ffmpeg cannot go back and fill in the RIFF
+    and data chunk sizes; everything after the data chunk header is taken
+    as samples.
+
+    Returns:
+        tuple: (sample rate, int16 np.ndarray)
+    """
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise RuntimeError('ffmpeg did not produce a WAV stream')
+
+    sample_rate = None
+    position = 12
+    while position + 8 <= len(data):
+        chunk_id = data[position:position + 4]
+        size = int.from_bytes(data[position + 4:position + 8], 'little')
+        body = position + 8
+        if chunk_id == b'fmt ':
+            sample_rate = int.from_bytes(data[body + 4:body + 8], 'little')
+        elif chunk_id == b'data':
+            if sample_rate is None:
+                break
+            samples = memoryview(data)[body:]
+            return sample_rate, np.frombuffer(samples[:len(samples) // 2 * 2], dtype='<i2')
+        position = body + size + (size & 1)
+    raise RuntimeError('ffmpeg WAV stream has no format or data chunk')
+
+
+def decode_with_ffmpeg(source, target_sr, res_type='soxr_hq', ffmpeg_path=None):
+    """
+    Decode any ffmpeg-readable input (webm/opus, mp3, m4a, ...) in one pipe
+
+    ffmpeg decodes and downmixes to mono 16-bit PCM at the native rate, the
+    same sample format librosa.load gets from audioread, so features match
+    the training pipeline; bytes are piped through stdin so no temporary file
+    is written. The PCM comes wrapped in a WAV header, whose format chunk
+    gives the native rate. Resampling is done in-process with librosa's
+    resampler, which keeps the quality configurable.
+
+    Args:
+        source: File path or raw audio bytes
+        target_sr: Output sample rate
+        res_type: librosa resampler used when the native rate differs
+
+    Returns:
+        np.ndarray: Mono float32 signal at target_sr
+    """
+    ffmpeg_path = ffmpeg_path or shutil.which('ffmpeg')
+    if ffmpeg_path is None:
+        raise FileNotFoundError('ffmpeg not found on PATH')
+
+    from_bytes = isinstance(source, (bytes, bytearray, memoryview))
+    # rematrix_maxval=1 makes the mono downmix an average of the channels,
+    # as librosa does; ffmpeg's default for float output is a -3 dB sum,
+    # which would inflate loudness by sqrt(2)
+    command = [
+        ffmpeg_path, '-hide_banner', '-nostats', '-loglevel', 'error',
+        '-i', 'pipe:0' if from_bytes else str(source),
+        '-vn', '-af', 'aresample=rematrix_maxval=1', '-map_metadata', '-1',
+        '-ac', '1', '-c:a', 'pcm_s16le', '-f', 'wav', 'pipe:1',
+    ]
+    if not from_bytes:
+        command.insert(1, '-nostdin')
+
+    result = subprocess.run(
+        command,
+        input=bytes(source) if from_bytes else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False
+    )
+    if result.returncode != 0:
+        log = result.stderr.decode(errors='replace')
+        raise RuntimeError(f"ffmpeg failed: {log.strip()[-500:]}")
+
+    native_sr, samples = _read_wav_stream(result.stdout)
+    y = samples.astype(np.float32) / 32768.0
+    if native_sr != target_sr:
+        y = librosa.resample(y, orig_sr=native_sr, target_sr=target_sr, res_type=res_type)
+    return y
+
+
+# Feature registry
+#
+# Shared intermediate transforms: name -> (dependencies, compute(context)).
+# Defaults match what the librosa feature functions compute internally when
+# given y (n_fft=2048, hop_length=512), so passing them in is exact.
+#
+# The context holds 'signal' (the whole recording), 'y' (the signal spectral
+# features are computed on: the whole recording, or only its voiced segments
+# in voiced_only mode), 'sr' and 'duration' (of the whole recording).
+
+def _stft_magnitude(context):
+    return np.abs(librosa.stft(context['y'], n_fft=2048, hop_length=512))
+
+
+def _log_mel(context):
+    mel = librosa.feature.melspectrogram(S=context['stft'] ** 2, sr=context['sr'])
+    return librosa.power_to_db(mel)
+
+
+def _onset_envelope(context):
+    return librosa.onset.onset_strength(S=context['log_mel'], sr=context['sr'])
+
+
+def _voiced_intervals(context):
+    # Non-silent intervals
+    return librosa.effects.split(context['signal'], top_db=20)
+
+
+INTERMEDIATES = {
+    'stft': ((), _stft_magnitude),
+    'log_mel': (('stft',), _log_mel),
+    'onset_env': (('log_mel',), _onset_envelope),
+    'intervals': ((), _voiced_intervals),
+}
+
+
+def _loudness(context):
+    # Loudness (RMS Energy)
+    rms = librosa.feature.rms(y=context['signal'])[0]
+    return {'loud_mean': float(np.mean(rms)), 'loud_std': float(np.std(rms))}
+
+
+def _pitch(context):
+    # Pitch (Fundamental Frequency): strongest bin per frame, voiced frames only
+    pitches, magnitudes = librosa.piptrack(S=context['stft'], sr=context['sr'])
+    pitch_values = pitches[magnitudes.argmax(axis=0), np.arange(pitches.shape[1])]
+    pitch_values = pitch_values[pitch_values > 0]
+    return {
+        'pitch_mean': float(np.mean(pitch_values)) if pitch_values.size else 0.0,
+        'pitch_std': float(np.std(pitch_values)) if pitch_values.size else 0.0,
+    }
+
+
+def _pauses(context):
+    # Pause Detection (using silence detection)
+    sr, duration = context['sr'], context['duration']
+    non_silent_duration = sum(end - start for start, end in context['intervals']) / sr
+    pause_duration = duration - non_silent_duration
+    return {'pause_ratio': float(pause_duration / duration) if duration > 0 else 0.0}
+
+
+def _speech_rate(context):
+    # Speech Rate (syllables per second - approximation using onset strength)
+    sr, duration = context['sr'], context['duration']
+    onset_frames = librosa.onset.onset_detect(onset_envelope=context['onset_env'], sr=sr)
+    return {'syllables_per_sec': float(len(onset_frames) / duration) if duration > 0 else 0.0}
+
+
+def _spectral_shape(context):
+    S, sr = context['stft'], context['sr']
+    return {
+        'spectral_centroid': float(np.mean(librosa.feature.spectral_centroid(S=S, sr=sr)[0])),
+        'spectral_rolloff': float(np.mean(librosa.feature.spectral_rolloff(S=S, sr=sr)[0])),
+        'spectral_bandwidth': float(np.mean(librosa.feature.spectral_bandwidth(S=S, sr=sr)[0])),
+    }
+
+
+def _zero_crossings(context):
+    return {'zcr_mean': float(np.mean(librosa.feature.zero_crossing_rate(context['signal'])[0]))}
+
+
+def _mfcc(context):
+    # MFCCs (Mel-frequency cepstral coefficients)
+    mfccs = librosa.feature.mfcc(S=context['log_mel'], sr=context['sr'], n_mfcc=13)
+    return {f'mfcc_{i+1}': float(np.mean(mfccs[i])) for i in range(13)}
+
+
+def _chroma(context):
+    chroma = librosa.feature.chroma_stft(S=context['stft'] ** 2, sr=context['sr'])
+    return {'chroma_mean': float(np.mean(chroma))}
+
+
+def _spectral_contrast(context):
+    # Spectral Flux (approximation using spectral contrast)
+    contrast = librosa.feature.spectral_contrast(S=context['stft'], sr=context['sr'])
+    return {'spectral_flux': float(np.mean(contrast))}
+
+
+# Feature groups: name -> (output features, intermediate dependencies, compute(context))
+FEATURE_GROUPS = {
+    'loudness': (('loud_mean', 'loud_std'), (), _loudness),
+    'pitch': (('pitch_mean', 'pitch_std'), ('stft',), _pitch),
+    'pauses': (('pause_ratio',), ('intervals',), _pauses),
+    'speech_rate': (('syllables_per_sec',), ('onset_env',), _speech_rate),
+    'spectral_shape': (
+        ('spectral_centroid', 'spectral_rolloff', 'spectral_bandwidth'), ('stft',), _spectral_shape
+    ),
+    'zero_crossings': (('zcr_mean',), (), _zero_crossings),
+    'mfcc': (tuple(f'mfcc_{i}' for i in range(1, 14)), ('log_mel',), _mfcc),
+    'chroma': (('chroma_mean',), ('stft',), _chroma),
+    'spectral_contrast': (('spectral_flux',), ('stft',), _spectral_contrast),
+}
+
+# Features the predictor derives from another extracted feature
+DERIVED_FEATURE_SOURCES = {'words_per_minute': 'syllables_per_sec'}
+
+FEATURE_TO_GROUP = {
+    feature: group
+    for group, (outputs, _, _) in FEATURE_GROUPS.items()
+    for feature in outputs
+}
+
+
+def resolve_feature_groups(features=None):
+    """
+    Map requested feature names to the feature groups that produce them
+
+    Returns:
+        list: Group names in registry order
+    """
+    if features is None:
+        return list(FEATURE_GROUPS)
+
+    needed = set()
+    for feature in features:
+        feature = DERIVED_FEATURE_SOURCES.get(feature, feature)
+        if feature in FEATURE_TO_GROUP:
+            needed.add(FEATURE_TO_GROUP[feature])
+    return [group for group in FEATURE_GROUPS if group in needed]
+
+
+def resolve_intermediates(groups, available=()):
+    """
+    Smallest set of intermediate transforms the groups need, in dependency order
+
+    Args:
+        groups: Feature group names
+        available: Intermediates already at hand (e.g. cached); they and
+            transforms only needed to compute them are left out
+    """
+    ordered = []
+
+    def visit(name):
+        if name in ordered or name in available:
+            return
+        for dependency in INTERMEDIATES[name][0]:
+            visit(dependency)
+        ordered.append(name)
+
+    for group in groups:
+        for name in FEATURE_GROUPS[group][1]:
+            visit(name)
+    return ordered
+
+
+def voiced_signal(y, intervals):
+    """
+    Join the voiced intervals of y end to end in one copy
+
+    Falls back to y when nothing is voiced (or everything is).
+    """
+    if len(intervals) == 0:
+        return y
+    if len(intervals) == 1 and intervals[0][0] == 0 and intervals[0][1] == len(y):
+        return y
+    return np.concatenate([y[start:end] for start, end in intervals])
+
+
+def frame_feature_series(context):
+    """
+    Per-frame series behind every extracted feature, from one pass over a recording
+
+    Recording-wide decisions (onset peak picking, chroma tuning, the
+    log-mel floor) are made once over the whole recording, so averaging a
+    series over all frames gives the single-pass features, and averaging it
+    over a window gives that window's features. Pauses are not a frame
+    series: windows take them from the same voiced intervals as the
+    single-pass pause_ratio (see voiced_samples).
+
+    Args:
+        context: Extraction context with 'y', 'sr', 'stft', 'log_mel' and 'onset_env'
+
+    Returns:
+        dict: Series name -> (frames,) array ('mfcc' is (13, frames))
+    """
+    y, S, sr = context['y'], context['stft'], context['sr']
+    n_frames = S.shape[1]
+
+    rms = librosa.feature.rms(y=y)[0]
+
+    pitches, magnitudes = librosa.piptrack(S=S, sr=sr)
+    pitch_values = pitches[magnitudes.argmax(axis=0), np.arange(n_frames)]
+
+    onsets = np.zeros(n_frames)
+    onsets[librosa.onset.onset_detect(onset_envelope=context['onset_env'], sr=sr)] = 1.0
+
+    return {
+        'rms': rms,
+        'pitch': pitch_values,
+        'voiced_pitch': (pitch_values > 0).astype(np.float64),
+        'onsets': onsets,
+        'spectral_centroid': librosa.feature.spectral_centroid(S=S, sr=sr)[0],
+        'spectral_rolloff': librosa.feature.spectral_rolloff(S=S, sr=sr)[0],
+        'spectral_bandwidth': librosa.feature.spectral_bandwidth(S=S, sr=sr)[0],
+        'zcr': librosa.feature.zero_crossing_rate(y)[0],
+        'mfcc': librosa.feature.mfcc(S=context['log_mel'], sr=sr, n_mfcc=13),
+        'chroma': np.mean(librosa.feature.chroma_stft(S=S ** 2, sr=sr), axis=0),
+        'contrast': np.mean(librosa.feature.spectral_contrast(S=S, sr=sr), axis=0),
+    }
+
+
+def voiced_samples(intervals, start, end):
+    """
+    Voiced samples between two sample positions
+
+    Args:
+        intervals: (n, 2) voiced [start, end) sample indices
+        start: First sample of the span
+        end: Sample after the span
+
+    Returns:
+        int: Samples of the span inside a voiced interval
+    """
+    intervals = np.asarray(intervals).reshape(-1, 2)
+    return int(np.sum(np.clip(intervals[:, 1], start, end) - np.clip(intervals[:, 0], start, end)))
+
+
+def window_bounds(duration, window_seconds, step_seconds):
+    """
+    Start/end times of sliding windows over a recording
+
+    The last window is aligned to the end of the recording so the tail is
+    always covered; recordings shorter than one window get a single window.
+    """
+    if duration <= window_seconds:
+        return [(0.0, duration)]
+    starts = list(np.arange(0.0, duration - window_seconds, step_seconds))
+    starts.append(duration - window_seconds)
+    return [(float(start), float(start) + window_seconds) for start in starts]
+
+
+def transcription_chunks(intervals, sr, max_chunk_seconds=30.0):
+    """
+    Group voiced intervals into chunks that end at pauses
+
+    Consecutive intervals are merged while the chunk stays within
+    max_chunk_seconds, so every cut falls in a silence; an interval longer
+    than that on its own is cut into max_chunk_seconds pieces.
+
+    Args:
+        intervals: (n, 2) voiced [start, end) sample indices
+        sr: Sample rate
+        max_chunk_seconds: Longest chunk to send to the recognizer
+
+    Returns:
+        list: (start, end) sample indices of each chunk, in order
+    """
+    max_samples = int(max_chunk_seconds * sr)
+    chunks = []
+    for start, end in intervals:
+        start, end = int(start), int(end)
+        if chunks and end - chunks[-1][0] <= max_samples:
+            chunks[-1] = (chunks[-1][0], end)
+            continue
+        while end - start > max_samples:
+            chunks.append((start, start + max_samples))
+            start += max_samples
+        chunks.append((start, end))
+    return chunks
+
+
+def profile_feature_costs(extractor, signals):
+    """
+    Measure the average extraction cost of every intermediate and feature group
+
+    Args:
+        extractor: AudioFeatureExtractor
+        signals: Iterable of decoded signals to time on
+
+    Returns:
+        dict: Step name -> mean seconds per call
+    """
+    totals = {}
+    count = 0
+    for y in signals:
+        extractor.extract_features_from_signal(y)
+        for name, seconds in extractor.timings.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+        count += 1
+    return {name: total / count for name, total in totals.items()} if count else {}
+
 
 class AudioFeatureExtractor:
     """Extract features from audio files for speech analysis"""
 
-    def __init__(self):
+    def __init__(self, res_type='soxr_hq', voiced_only=False, workers=0, segment_seconds=30.0,
+                 transcribe_workers=4, transcribe_chunk_seconds=30.0, cache=None):
+        """
+        Args:
+            res_type: Resampler quality for in-process resampling
+                ('soxr_hq' default; 'soxr_lq'/'soxr_qq' trade accuracy for speed)
+            voiced_only: Compute spectral, pitch, MFCC and onset features
+                over the voiced segments only (see extract_features_from_signal)
+            workers: Processes to split recordings longer than two segments
+                across (0 disables segment-parallel extraction)
+            segment_seconds: Segment length for segment-parallel extraction
+            transcribe_workers: Concurrent recognizer calls for recordings
+                longer than one transcription chunk (0 sends the whole
+                recording in one call)
+            transcribe_chunk_seconds: Longest chunk sent to the recognizer
+            cache: Optional ArtifactCache; extract_features and
+                extract_features_from_bytes then reuse the decoded signal
+                and spectral transforms stored for the same recording
+        """
+        if res_type not in RESAMPLE_TYPES:
+            raise ValueError(f"Unknown resample type: {res_type}")
+        if voiced_only and workers:
+            raise ValueError("Segment-parallel extraction does not support voiced_only mode")
         self.sr = 22050  # Sample rate for librosa
+        self.res_type = res_type
+        self.voiced_only = voiced_only
+        self.workers = workers
+        self.segment_seconds = segment_seconds
         self.recognizer = sr.Recognizer()
+        self.timings = {}
+        self.transcribe_workers = transcribe_workers
+        self.transcribe_chunk_seconds = transcribe_chunk_seconds
+        self.cache = cache
+        self._context = None  # Transforms of the last extraction, reused for windows
+        self.transcript_segments = None  # Per-chunk results of the last chunked transcription
+
+    def decode(self, audio_path_or_bytes, file_extension=None):
+        """
+        Decode audio to a mono float32 signal at self.sr
+
+        WAV/FLAC/OGG/MP3 use libsndfile directly; other formats (webm, m4a)
+        are decoded by a single ffmpeg pipe. If neither works the old
+        librosa.load path is used.
+
+        Args:
+            audio_path_or_bytes: Path to audio file or audio bytes
+            file_extension: Format hint (required for bytes, inferred for paths)
+
+        Returns:
+            np.ndarray: Mono float32 signal
+        """
+        is_bytes = isinstance(audio_path_or_bytes, (bytes, bytearray, memoryview))
+        if file_extension is None and not is_bytes:
+            file_extension = Path(audio_path_or_bytes).suffix
+        extension = (file_extension or '').lower().lstrip('.')
+
+        if extension in SOUNDFILE_FORMATS:
+            source = io.BytesIO(audio_path_or_bytes) if is_bytes else audio_path_or_bytes
+            try:
+                return decode_with_soundfile(source, self.sr, self.res_type)
+            except RuntimeError:
+                # libsndfile errors subclass RuntimeError; let ffmpeg try
+                pass
 
-    def extract_features(self, audio_path):
+        try:
+            return decode_with_ffmpeg(audio_path_or_bytes, self.sr, self.res_type)
+        except (FileNotFoundError, RuntimeError):
+            if not is_bytes:
+                y, _ = librosa.load(audio_path_or_bytes, sr=self.sr, res_type=self.res_type)
+                return y
+
+        # Last resort for bytes: librosa/audioread needs a real file
+        import tempfile
+        import os
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{extension or "wav"}') as temp_file:
+            temp_file.write(audio_path_or_bytes)
+            temp_path = temp_file.name
+        try:
+            y, _ = librosa.load(temp_path, sr=self.sr, res_type=self.res_type)
+            return y
+        finally:
+            os.unlink(temp_path)
+
+    def extract_features(self, audio_path, features=None):
         """
         Extract all required features from an audio file
 
         Args:
             audio_path: Path to audio file
+            features: Optional feature names (see extract_features_from_signal)
 
         Returns:
             dict: Dictionary of extracted features
         """
-        # Load audio file
-        y, sr = librosa.load(audio_path, sr=self.sr)
-
-        # Basic audio metrics
-        duration = librosa.get_duration(y=y, sr=sr)
-
-        # Loudness (RMS Energy)
-        rms = librosa.feature.rms(y=y)[0]
-        loud_mean = float(np.mean(rms))
-        loud_std = float(np.std(rms))
-
-        # Pitch (Fundamental Frequency)
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-        pitch_values = []
-        for t in range(pitches.shape[1]):
-            index = magnitudes[:, t].argmax()
-            pitch = pitches[index, t]
-            if pitch > 0:  # Only use non-zero pitches
-                pitch_values.append(pitch)
-
-        pitch_mean = float(np.mean(pitch_values)) if pitch_values else 0.0
-        pitch_std = float(np.std(pitch_values)) if pitch_values else 0.0
-
-        # Pause Detection (using silence detection)
-        # Non-silent intervals
-        intervals = librosa.effects.split(y, top_db=20)
-        non_silent_duration = sum([interval[1] - interval[0] for interval in intervals]) / sr
-        pause_duration = duration - non_silent_duration
-        pause_ratio = float(pause_duration / duration) if duration > 0 else 0.0
-
-        # Speech Rate (syllables per second - approximation using onset strength)
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        onset_frames = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr)
-        syllables_per_sec = float(len(onset_frames) / duration) if duration > 0 else 0.0
-
-        # Spectral features
-        spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        spectral_centroid = float(np.mean(spectral_centroids))
-
-        spectral_rolloffs = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-        spectral_rolloff = float(np.mean(spectral_rolloffs))
-
-        spectral_bandwidths = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
-        spectral_bandwidth = float(np.mean(spectral_bandwidths))
-
-        # Zero Crossing Rate
-        zcr = librosa.feature.zero_crossing_rate(y)[0]
-        zcr_mean = float(np.mean(zcr))
-
-        # MFCCs (Mel-frequency cepstral coefficients)
-        mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-        mfcc_features = {}
-        for i in range(13):
-            mfcc_features[f'mfcc_{i+1}'] = float(np.mean(mfccs[i]))
-
-        # Chroma features
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-        chroma_mean = float(np.mean(chroma))
-
-        # Spectral Flux (approximation using spectral contrast)
-        spectral_contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
-        spectral_flux = float(np.mean(spectral_contrast))
-
-        # Compile all features
-        features = {
-            'duration': duration,  # Audio duration in seconds
-            'loud_mean': loud_mean,
-            'loud_std': loud_std,
-            'pause_ratio': pause_ratio,
-            'pitch_mean': pitch_mean,
-            'pitch_std': pitch_std,
-            'syllables_per_sec': syllables_per_sec,
-            'spectral_centroid': spectral_centroid,
-            'spectral_rolloff': spectral_rolloff,
-            'zcr_mean': zcr_mean,
-            'spectral_bandwidth': spectral_bandwidth,
-            'spectral_flux': spectral_flux,
-            'chroma_mean': chroma_mean,
-            **mfcc_features,  # Adds mfcc_1 through mfcc_13
+        if self.cache is not None:
+            return self._extract_with_cache(audio_path, features=features)
+        return self.extract_features_from_signal(self.decode(audio_path), features=features)
+
+    def cache_params(self):
+        """Extractor settings the cached artifacts depend on (part of the cache key)"""
+        return {
+            'sr': self.sr,
+            'res_type': self.res_type,
+            'voiced_only': self.voiced_only,
+            'n_fft': 2048,
+            'hop_length': 512,
         }
 
-        return features
+    def _extract_with_cache(self, source, file_extension=None, features=None):
+        """
+        Extract features, reusing and extending the artifacts cached for source
+
+        Args:
+            source: File path or raw audio bytes
+            file_extension: Format hint for bytes
+            features: Optional feature names (see extract_features_from_signal)
+
+        Returns:
+            dict: Dictionary of extracted features
+        """
+        key = self.cache.key(content_hash(source), **self.cache_params())
+        artifacts = self.cache.get(key) or {}
+
+        y = artifacts.pop('signal', None)
+        decoded = y is None
+        if decoded:
+            y = self.decode(source, file_extension)
+        extracted = self.extract_features_from_signal(y, features=features, artifacts=artifacts)
+
+        # Store whatever this extraction added (segment-parallel runs add
+        # only the signal; their transforms never exist whole)
+        context = self._context if self._context is not None and self._context['signal'] is y else {}
+        computed = {
+            name: context[name]
+            for name in INTERMEDIATES
+            if name in context and name not in artifacts
+        }
+        if decoded or computed:
+            self.cache.put(key, {'signal': y, **artifacts, **computed})
+        return extracted
+
+    def extract_features_from_signal(self, y, features=None, artifacts=None):
+        """
+        Extract features from a decoded signal
+
+        Only the computations the requested features depend on are run (see
+        FEATURE_GROUPS / INTERMEDIATES); the STFT, log-mel spectrogram and
+        other shared transforms are computed once and reused. Per-step wall
+        times of the last call are kept in self.timings.
+
+        In voiced_only mode the silence detection runs first and the STFT
+        based features (spectral, chroma, pitch, MFCC, onsets) are computed
+        on the voiced segments joined end to end, skipping the silences.
+        Pause ratio, loudness and zero-crossing rate still describe the
+        whole recording, and syllables per second is still per second of
+        recording. Features shift relative to full-signal extraction, so
+        validate a model with ml_models/validate_voiced.py before serving it.
+
+        With workers set, recordings longer than two segments are split
+        into segments processed in parallel (see segment_features); the
+        merged features match single-pass extraction to float rounding.
+
+        Args:
+            y: Mono float32 signal at self.sr (see decode())
+            features: Optional iterable of feature names (e.g. a model's
+                feature columns); unknown names are ignored. None extracts
+                every feature.
+            artifacts: Optional intermediates already computed for y with
+                this extractor's settings (INTERMEDIATES name -> array, e.g.
+                from an ArtifactCache); they are used instead of recomputed
+
+        Returns:
+            dict: Dictionary of extracted features (always includes 'duration')
+        """
+        artifacts = artifacts or {}
+        groups = resolve_feature_groups(features)
+        duration = librosa.get_duration(y=y, sr=self.sr)
+        context = {'signal': y, 'y': y, 'sr': self.sr, 'duration': duration}
+        self.timings = {}
+        intermediates = resolve_intermediates(groups, available=artifacts)
+
+        if self.workers and duration >= 2 * self.segment_seconds and intermediates:
+            started = time.perf_counter()
+            extracted = extract_segmented(
+                y, self.sr, groups,
+                segment_seconds=self.segment_seconds,
+                workers=self.workers
+            )
+            self.timings['segments'] = time.perf_counter() - started
+            return self._select_features(extracted, features)
+
+        context.update(artifacts)
+        if self.voiced_only and any(name != 'intervals' for name in intermediates):
+            started = time.perf_counter()
+            if 'intervals' not in context:
+                context['intervals'] = _voiced_intervals(context)
+            context['y'] = voiced_signal(y, context['intervals'])
+            self.timings['intervals'] = time.perf_counter() - started
+            intermediates = [name for name in intermediates if name != 'intervals']
+
+        extracted = {'duration': duration}
+        for name in intermediates:
+            started = time.perf_counter()
+            context[name] = INTERMEDIATES[name][1](context)
+            self.timings[name] = time.perf_counter() - started
+
+        for name in groups:
+            started = time.perf_counter()
+            extracted.update(FEATURE_GROUPS[name][2](context))
+            self.timings[name] = time.perf_counter() - started
+
+        self._context = context
+        return self._select_features(extracted, features)
+
+    def extract_window_features(self, y, window_seconds=30.0, step_seconds=15.0):
+        """
+        Extract features for sliding windows over a decoded signal
+
+        The STFT and every frame-level series are computed once for the
+        whole recording (reusing the transforms of the last
+        extract_features_from_signal call on the same signal), and each
+        window's features are differences of running sums over its frames,
+        so the cost barely depends on the number of windows. Silence,
+        onsets and chroma tuning are decided over the whole recording;
+        pause_ratio uses the same voiced intervals as
+        extract_features_from_signal, so a window covering the whole
+        recording reproduces the single-pass value.
+
+        Args:
+            y: Mono float32 signal at self.sr
+            window_seconds: Window length
+            step_seconds: Distance between window starts
+
+        Returns:
+            list: One feature dict per window, with 'start' and 'end' in seconds
+        """
+        context = self._context if self._context is not None and self._context['y'] is y else {}
+        context.update({'signal': y, 'y': y, 'sr': self.sr})
+        for name in ('stft', 'log_mel', 'onset_env', 'intervals'):
+            if name not in context:
+                context[name] = INTERMEDIATES[name][1](context)
+
+        series = frame_feature_series(context)
+        mfcc = series.pop('mfcc')
+        names = list(series) + [f'mfcc_{i+1}' for i in range(13)]
+        stacked = np.vstack([np.stack(list(series.values())), mfcc]).astype(np.float64)
+        rows = {name: i for i, name in enumerate(names)}
+
+        # Running sums of every series (and of the squares for the stds)
+        sums = np.zeros((len(names), stacked.shape[1] + 1))
+        np.cumsum(stacked, axis=1, out=sums[:, 1:])
+        squares = np.zeros((2, stacked.shape[1] + 1))
+        np.cumsum(stacked[[rows['rms'], rows['pitch']]] ** 2, axis=1, out=squares[:, 1:])
+
+        duration = librosa.get_duration(y=y, sr=self.sr)
+        windows = []
+        for start, end in window_bounds(duration, window_seconds, step_seconds):
+            first, last = librosa.time_to_frames([start, end], sr=self.sr)
+            if end >= duration:
+                last = stacked.shape[1]  # The final, partial frame belongs to the last window
+            last = min(max(last, first + 1), stacked.shape[1])
+            n = last - first
+            total = sums[:, last] - sums[:, first]
+            total_sq = squares[:, last] - squares[:, first]
+            length = end - start
+            first_sample, last_sample = int(round(start * self.sr)), int(round(end * self.sr))
+            span = last_sample - first_sample
+
+            voiced = total[rows['voiced_pitch']]
+            pitch_mean = total[rows['pitch']] / voiced if voiced else 0.0
+            loud_mean = total[rows['rms']] / n
+
+            window = {
+                'start': start,
+                'end': end,
+                'duration': length,
+                'loud_mean': float(loud_mean),
+                'loud_std': float(np.sqrt(max(total_sq[0] / n - loud_mean ** 2, 0.0))),
+                'pitch_mean': float(pitch_mean),
+                'pitch_std': float(np.sqrt(max(total_sq[1] / voiced - pitch_mean ** 2, 0.0))) if voiced else 0.0,
+                'pause_ratio': float(1 - voiced_samples(context['intervals'], first_sample, last_sample) / span)
+                if span > 0 else 0.0,
+                'syllables_per_sec': float(total[rows['onsets']] / length) if length > 0 else 0.0,
+                'spectral_centroid': float(total[rows['spectral_centroid']] / n),
+                'spectral_rolloff': float(total[rows['spectral_rolloff']] / n),
+                'spectral_bandwidth': float(total[rows['spectral_bandwidth']] / n),
+                'zcr_mean': float(total[rows['zcr']] / n),
+                'chroma_mean': float(total[rows['chroma']] / n),
+                'spectral_flux': float(total[rows['contrast']] / n),
+            }
+            window.update({f'mfcc_{i+1}': float(total[rows[f'mfcc_{i+1}']] / n) for i in range(13)})
+            windows.append(window)
+        return windows
+
+    @staticmethod
+    def _select_features(extracted, features):
+        """Keep the requested features (and what derived ones need)"""
+        if features is None:
+            return extracted
+        wanted = {DERIVED_FEATURE_SOURCES.get(feature, feature) for feature in features}
+        wanted |= set(features) | {'duration'}
+        return {key: value for key, value in extracted.items() if key in wanted}
 
     def extract_transcript(self, audio_path):
         """
@@ -119,12 +761,90 @@ class AudioFeatureExtractor:
             str: Transcribed text
         """
         try:
-            # Convert audio to WAV format if needed for better compatibility
-            with sr.AudioFile(audio_path) as source:
-                audio_data = self.recognizer.record(source)
-                # Use Google Speech Recognition (free)
-                transcript = self.recognizer.recognize_google(audio_data)
-                return transcript
+            y = self.decode(audio_path)
+        except Exception as e:
+            return f"Error during transcription: {str(e)}"
+        return self.extract_transcript_from_signal(y)
+
+    def _recognize(self, y, recognize=None):
+        """Run the recognizer on a float signal (Google Speech Recognition by default)"""
+        pcm = (np.clip(y, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+        audio_data = sr.AudioData(pcm, self.sr, 2)
+        return (recognize or self.recognizer.recognize_google)(audio_data)
+
+    def transcribe_chunks(self, y, recognize=None):
+        """
+        Transcribe a signal chunk by chunk, cutting at pauses
+
+        Chunks (see transcription_chunks) are recognized concurrently on at
+        most transcribe_workers threads; the voiced intervals of the last
+        feature extraction on the same signal are reused when available.
+        A failing chunk does not fail the others.
+
+        Args:
+            y: Mono float32 signal at self.sr
+            recognize: Optional callable taking sr.AudioData and returning
+                text (e.g. a local or fake recognizer); defaults to
+                recognizer.recognize_google
+
+        Returns:
+            list: {'start', 'end', 'text', 'error'} per chunk, in time order
+                (times in seconds; error is None on success)
+        """
+        context = self._context
+        if context is not None and context['signal'] is y and 'intervals' in context:
+            intervals = context['intervals']
+        else:
+            intervals = _voiced_intervals({'signal': y})
+        chunks = transcription_chunks(intervals, self.sr, self.transcribe_chunk_seconds)
+
+        def transcribe(chunk):
+            start, end = chunk
+            segment = {'start': start / self.sr, 'end': end / self.sr, 'text': '', 'error': None}
+            try:
+                segment['text'] = self._recognize(y[start:end], recognize)
+            except sr.UnknownValueError:
+                segment['error'] = "Could not understand audio"
+            except sr.RequestError as e:
+                segment['error'] = f"Could not request results; {e}"
+            except Exception as e:
+                segment['error'] = f"Error during transcription: {str(e)}"
+            return segment
+
+        if len(chunks) <= 1:
+            return [transcribe(chunk) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.transcribe_workers, len(chunks)))) as pool:
+            # map keeps chunk order regardless of completion order
+            return list(pool.map(transcribe, chunks))
+
+    def extract_transcript_from_signal(self, y, recognize=None):
+        """
+        Extract transcript from an already decoded signal
+
+        Reuses the PCM decoded for feature extraction instead of decoding
+        the upload a second time. Recordings longer than one transcription
+        chunk are transcribed in concurrent chunks (see transcribe_chunks);
+        the per-chunk results are kept in self.transcript_segments.
+
+        Args:
+            y: Mono float32 signal at self.sr
+            recognize: Optional recognizer callable (see transcribe_chunks)
+
+        Returns:
+            str: Transcribed text
+        """
+        self.transcript_segments = None
+        if self.transcribe_workers and len(y) > self.transcribe_chunk_seconds * self.sr:
+            segments = self.transcribe_chunks(y, recognize)
+            self.transcript_segments = segments
+            texts = [segment['text'] for segment in segments if segment['text']]
+            if texts:
+                return ' '.join(texts)
+            errors = [segment['error'] for segment in segments if segment['error']]
+            return errors[0] if errors else "Could not understand audio"
+
+        try:
+            return self._recognize(y, recognize)
         except sr.UnknownValueError:
             return "Could not understand audio"
         except sr.RequestError as e:
@@ -143,31 +863,11 @@ class AudioFeatureExtractor:
         Returns:
             str: Transcribed text
         """
-        import tempfile
-        import os
-        from pydub import AudioSegment
-
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_extension}') as temp_file:
-            temp_file.write(audio_bytes)
-            temp_path = temp_file.name
-
         try:
-            # Convert to WAV if not already
-            if file_extension.lower() != 'wav':
-                audio = AudioSegment.from_file(temp_path, format=file_extension)
-                wav_path = temp_path.replace(f'.{file_extension}', '.wav')
-                audio.export(wav_path, format='wav')
-                transcript = self.extract_transcript(wav_path)
-                os.unlink(wav_path)
-            else:
-                transcript = self.extract_transcript(temp_path)
-
-            return transcript
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+            y = self.decode(audio_bytes, file_extension)
+        except Exception as e:
+            return f"Error during transcription: {str(e)}"
+        return self.extract_transcript_from_signal(y)
 
     def extract_features_from_bytes(self, audio_bytes, file_extension='wav'):
         """
@@ -180,22 +880,9 @@ class AudioFeatureExtractor:
         Returns:
             dict: Dictionary of extracted features
         """
-        import tempfile
-        import os
-
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_extension}') as temp_file:
-            temp_file.write(audio_bytes)
-            temp_path = temp_file.name
-
-        try:
-            # Extract features
-            features = self.extract_features(temp_path)
-            return features
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        if self.cache is not None:
+            return self._extract_with_cache(audio_bytes, file_extension)
+        return self.extract_features_from_signal(self.decode(audio_bytes, file_extension))
 
 
 def extract_audio_features(audio_path_or_bytes, is_bytes=False, file_extension='wav'):
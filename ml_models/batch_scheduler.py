@@ -0,0 +1,149 @@
+"""
+Micro-batching scheduler for SpeechPredictor
+
+Concurrent single-row predictions are collected for a few milliseconds and
+run as one matrix prediction, so the per-call overhead of the forest
+(preprocessing, scaling, 200 trees x 8 targets) is paid once per batch
+instead of once per request.
+"""
+
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future, InvalidStateError, TimeoutError
+
+
+class PredictionBatcher:
+    """
+    Gather predict calls from many threads into batched predict_batch calls
+
+    A caller's row waits at most max_wait_ms for others to join it; a batch
+    is dispatched as soon as it holds max_batch_size rows. Rows are grouped
+    by predictor (tiers, hot-swapped models) and by the set of features
+    they carry, so every row is scored exactly as predictor.predict would.
+    Rows whose caller cancelled before dispatch are skipped, and the
+    batching thread is restarted if it ever dies.
+    """
+
+    def __init__(self, max_batch_size=32, max_wait_ms=2.0, timeout=30.0):
+        """
+        Args:
+            max_batch_size: Most rows scored in one model call
+            max_wait_ms: Longest a row waits for a batch to fill
+            timeout: Default seconds predict() waits for its result
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+
+    def predict(self, predictor, features_dict, timeout=None):
+        """
+        Predict scores for one speech, batched with concurrent callers
+
+        Args:
+            predictor: Trained SpeechPredictor
+            features_dict: Dictionary with feature names and values
+            timeout: Seconds to wait for the result (default self.timeout)
+
+        Returns:
+            dict: Predicted scores for each target (as SpeechPredictor.predict)
+
+        Raises:
+            TimeoutError: No result within the timeout
+        """
+        future = self.submit(predictor, features_dict)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def submit(self, predictor, features_dict):
+        """
+        Queue one speech for the next batch without waiting
+
+        Returns:
+            concurrent.futures.Future: Resolves to the scores dict (can be
+                awaited from async code with asyncio.wrap_future)
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((predictor, dict(features_dict), future))
+        return future
+
+    @property
+    def mean_batch_size(self):
+        return self.rows / self.batches if self.batches else 0.0
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                # Never let one batch stop the thread every caller depends on
+                traceback.print_exc()
+                for _, _, future in batch:
+                    try:
+                        future.set_exception(e)
+                    except InvalidStateError:
+                        pass  # Resolved or cancelled already
+
+    def _dispatch(self, batch):
+        groups = {}
+        for item in batch:
+            predictor, features, future = item
+            # Claims the future, so a caller can no longer cancel it under us
+            if not future.set_running_or_notify_cancel():
+                continue
+            groups.setdefault((id(predictor), frozenset(features)), []).append(item)
+
+        for items in groups.values():
+            predictor = items[0][0]
+            try:
+                scores = predictor.predict_batch([features for _, features, _ in items])
+            except Exception:
+                # One bad row must not fail the others: score them one by one
+                for _, features, future in items:
+                    self._resolve(predictor, features, future)
+                continue
+
+            self.batches += 1
+            self.rows += len(items)
+            for (_, _, future), row in zip(items, scores):
+                future.set_result({
+                    target: int(score)
+                    for target, score in zip(predictor.TARGET_COLUMNS, row)
+                })
+
+    @staticmethod
+    def _resolve(predictor, features, future):
+        try:
+            result = predictor.predict(features)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        future.set_result(result)
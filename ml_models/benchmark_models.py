@@ -0,0 +1,192 @@
+"""
+Script to benchmark every SpeechPredictor model type on accuracy and serving cost
+
+Each model type is cross-validated on the same folds (per-target MAE), then
+fitted on the whole dataset, saved and measured the way the API uses it:
+size on disk, load time, resident memory added by loading it (measured in a
+fresh process) and single-row / batched prediction latency.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.model_selection import KFold
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_models.dataset_loader import load_dataset
+from ml_models.speech_predictor import SpeechPredictor
+
+
+def _rss_bytes():
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # No /proc (macOS): peak RSS is the best available approximation
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _load_footprint(model_dir):
+    """Resident memory added by loading model_dir (run in a fresh process)"""
+    predictor = SpeechPredictor()
+    before = _rss_bytes()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load(model_dir)
+    return _rss_bytes() - before
+
+
+def _latencies(fn, repeats):
+    """Per-call wall times in milliseconds, after one warm-up call"""
+    fn()
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return np.array(times)
+
+
+def benchmark_model(model_type, df, folds, repeats=100, batch_size=256):
+    """
+    Measure one model type
+
+    Args:
+        model_type: One of SpeechPredictor.MODEL_TYPES
+        df: Labeled dataset
+        folds: Shared (train_index, test_index) pairs
+        repeats: Timed calls per latency measurement
+        batch_size: Rows per batched prediction call
+
+    Returns:
+        dict: Accuracy, size, load time, memory and latency figures
+    """
+    predictor = SpeechPredictor(model_type=model_type)
+    with contextlib.redirect_stdout(io.StringIO()):
+        cv = predictor.cross_validate(df, folds)
+
+        started = time.perf_counter()
+        predictor.fit(df)
+        fit_seconds = time.perf_counter() - started
+
+    # Requests carry raw features and the category, never targets
+    inputs = [column for column in SpeechPredictor.FEATURE_COLUMNS if column in df.columns]
+    rows = df[inputs + ['category']].to_dict('records')
+    single_row = rows[0]
+    batch = [rows[i % len(rows)] for i in range(batch_size)]
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            predictor.save(model_dir)
+        size_bytes = sum(path.stat().st_size for path in Path(model_dir).iterdir())
+
+        def load():
+            with contextlib.redirect_stdout(io.StringIO()):
+                SpeechPredictor().load(model_dir)
+        load_ms = _latencies(load, max(repeats // 10, 3))
+
+        # A fresh process, so earlier models and imports don't hide the cost
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            memory_bytes = pool.apply(_load_footprint, (model_dir,))
+
+    single_ms = _latencies(lambda: predictor.predict(single_row), repeats)
+    batch_ms = _latencies(lambda: predictor.predict_batch(batch), max(repeats // 10, 3))
+
+    return {
+        'model_type': model_type,
+        'cv_mae': cv['mae'],
+        'per_target_mae': {
+            target: cv[f'{target}_mae'] for target in SpeechPredictor.TARGET_COLUMNS
+        },
+        'fit_seconds': fit_seconds,
+        'size_bytes': size_bytes,
+        'load_ms': float(np.median(load_ms)),
+        'memory_bytes': memory_bytes,
+        'single_row_ms': {
+            'p50': float(np.percentile(single_ms, 50)),
+            'p95': float(np.percentile(single_ms, 95)),
+        },
+        'batch_ms': float(np.median(batch_ms)),
+        'batch_row_us': float(np.median(batch_ms)) * 1000 / batch_size,
+    }
+
+
+def benchmark_models(df, model_types=None, n_folds=5, repeats=100, batch_size=256, random_state=42):
+    """
+    Benchmark several model types on the same cross-validation folds
+
+    Returns:
+        dict: Run settings and one result per model type
+    """
+    model_types = model_types or SpeechPredictor.MODEL_TYPES
+    folds = list(KFold(n_splits=n_folds, shuffle=True, random_state=random_state).split(df))
+
+    results = []
+    for model_type in model_types:
+        print(f"Benchmarking {model_type}...")
+        results.append(benchmark_model(model_type, df, folds, repeats=repeats, batch_size=batch_size))
+
+    return {
+        'samples': len(df),
+        'folds': n_folds,
+        'repeats': repeats,
+        'batch_size': batch_size,
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    BASE_DIR = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', default=str(BASE_DIR / 'Speeches_Dataset_Clean.csv'))
+    parser.add_argument('--model-types', nargs='+', choices=SpeechPredictor.MODEL_TYPES,
+                        default=SpeechPredictor.MODEL_TYPES)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--repeats', type=int, default=100, help='Timed calls per latency figure')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--output', default=None, help='Optional JSON report path')
+    args = parser.parse_args()
+
+    df = load_dataset(args.dataset)
+    report = benchmark_models(
+        df, model_types=args.model_types, n_folds=args.folds,
+        repeats=args.repeats, batch_size=args.batch_size
+    )
+    results = report['results']
+
+    print("\n" + "=" * 78)
+    print(f"MODEL BENCHMARK ({report['samples']} samples, {report['folds']}-fold CV)")
+    print("=" * 78)
+    print(f"  {'model':18s} {'CV MAE':>7s} {'size':>9s} {'load':>8s} {'memory':>9s}"
+          f" {'1 row p50/p95':>15s} {'batch/row':>10s}")
+    for r in results:
+        print(f"  {r['model_type']:18s} {r['cv_mae']:7.4f}"
+              f" {r['size_bytes'] / 1024:7.0f}KB"
+              f" {r['load_ms']:6.1f}ms"
+              f" {r['memory_bytes'] / 1024 ** 2:7.1f}MB"
+              f" {r['single_row_ms']['p50']:6.2f}/{r['single_row_ms']['p95']:.2f}ms"
+              f" {r['batch_row_us']:8.1f}us")
+
+    print(f"\n  {'target MAE':25s}" + ''.join(f" {r['model_type']:>18s}" for r in results))
+    for target in SpeechPredictor.TARGET_COLUMNS:
+        print(f"  {target:25s}" + ''.join(f" {r['per_target_mae'][target]:18.4f}" for r in results))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.output}")
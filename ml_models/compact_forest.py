@@ -0,0 +1,230 @@
+"""
+Compact forests for serving
+Prunes each target's random forest to the trees that keep validation MAE
+within a tolerance and stores the survivors as flat float32 node arrays,
+evaluated for every tree and row at once with numpy. The same walk also
+yields per-tree predictions and feature contributions for explanations
+"""
+
+import copy
+
+import numpy as np
+
+
+class CompactForest:
+    """
+    Multi-output forest stored as flat node arrays
+
+    Stands in for the MultiOutputRegressor of random forests in a
+    SpeechPredictor: predict(X) returns the mean leaf value of each target's
+    trees. Thresholds are stored as the largest float32 not above the
+    original float64 threshold, so float32 inputs (which sklearn trees also
+    compare in float32) take exactly the same branches.
+    """
+
+    def __init__(self, forests, tree_indices=None, value_dtype=np.float32):
+        """
+        Args:
+            forests: One fitted RandomForestRegressor per target
+            tree_indices: For each forest, the indices of the trees to keep
+                (default all)
+            value_dtype: Leaf value precision; float64 reproduces the
+                forests' predictions exactly
+        """
+        if tree_indices is None:
+            tree_indices = [range(len(forest.estimators_)) for forest in forests]
+        left, right, feature, threshold, value = [], [], [], [], []
+        roots, tree_counts = [], []
+        offset = 0
+        depth = 0
+        for forest, indices in zip(forests, tree_indices):
+            tree_counts.append(len(indices))
+            for index in indices:
+                tree = forest.estimators_[index].tree_
+                nodes = np.arange(tree.node_count)
+                is_leaf = tree.children_left == -1
+                # Leaves point to themselves, so every row can take the same
+                # number of steps whatever depth its leaf is at
+                left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+                right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+                feature.append(np.where(is_leaf, 0, tree.feature))
+                rounded = tree.threshold.astype(np.float32)
+                rounded = np.where(rounded > tree.threshold, np.nextafter(rounded, np.float32(-np.inf)), rounded)
+                threshold.append(np.where(is_leaf, 0, rounded))
+                value.append(tree.value[:, 0, 0])
+                roots.append(offset)
+                offset += tree.node_count
+                depth = max(depth, tree.max_depth)
+
+        self.children_left = np.concatenate(left).astype(np.int32)
+        self.children_right = np.concatenate(right).astype(np.int32)
+        self.feature = np.concatenate(feature).astype(np.int16)
+        self.threshold = np.concatenate(threshold).astype(np.float32)
+        self.value = np.concatenate(value).astype(value_dtype)
+        self.roots = np.array(roots, dtype=np.int32)
+        self.tree_counts = np.array(tree_counts, dtype=np.int32)
+        self.max_depth = depth
+        self.n_features = forests[0].n_features_in_
+
+    @property
+    def n_nodes(self):
+        return len(self.value)
+
+    def predict(self, X):
+        """
+        Predict every target
+
+        Args:
+            X: (n_samples, n_features) scaled feature matrix
+
+        Returns:
+            np.ndarray: (n_samples, n_targets) mean of each target's trees
+        """
+        nodes, _ = self._traverse(X)
+        starts = np.concatenate([[0], np.cumsum(self.tree_counts)[:-1]])
+        leaf_values = self.value[nodes].astype(np.float64)
+        return np.add.reduceat(leaf_values, starts, axis=1) / self.tree_counts
+
+    def explain(self, X):
+        """
+        Per-tree predictions and path-based contributions in one traversal
+
+        Args:
+            X: (n_samples, n_features) scaled feature matrix
+
+        Returns:
+            tuple: (list of (n_samples, n_trees) per-tree predictions, one
+                per target; (n_samples, n_targets, n_features) path-based
+                contributions, where each split credits its feature with the
+                change in node value it caused; (n_targets,) mean root value)
+        """
+        nodes, contributions = self._traverse(X, contributions=True)
+        leaf_values = self.value[nodes].astype(np.float64)
+        bounds = np.cumsum(self.tree_counts)[:-1]
+        tree_predictions = np.split(leaf_values, bounds, axis=1)
+        bias = np.array([
+            roots.mean() for roots in np.split(self.value[self.roots].astype(np.float64), bounds)
+        ])
+        return tree_predictions, contributions / self.tree_counts[:, None], bias
+
+    def _traverse(self, X, contributions=False):
+        """
+        Walk every row down every tree at once
+
+        Returns:
+            tuple: ((n_samples, n_trees) leaf node per tree, summed value
+                change per (row, target, split feature) or None)
+        """
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+
+        totals = None
+        if contributions:
+            n_targets = len(self.tree_counts)
+            tree_targets = np.repeat(np.arange(n_targets), self.tree_counts)
+            cell = (rows * n_targets + tree_targets) * self.n_features
+            totals = np.zeros(len(X) * n_targets * self.n_features)
+
+        for _ in range(self.max_depth):
+            feature = self.feature[nodes]
+            go_left = X[rows, feature] <= self.threshold[nodes]
+            children = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+            if contributions:
+                # Leaves point to themselves, so finished paths add zero
+                change = self.value[children].astype(np.float64) - self.value[nodes]
+                totals += np.bincount((cell + feature).ravel(), weights=change.ravel(), minlength=len(totals))
+            nodes = children
+
+        if contributions:
+            totals = totals.reshape(len(X), len(self.tree_counts), self.n_features)
+        return nodes, totals
+
+
+def select_trees(forest, X, y, tolerance, min_trees=10):
+    """
+    Choose the fewest trees of one forest that stay within an MAE tolerance
+
+    A random forest's trees are exchangeable, so its first k trees are an
+    unbiased k-tree forest. The smallest k from which every longer prefix
+    keeps the rounded 1-5 scores within tolerance of the full forest's MAE
+    is kept. Only k is chosen on the validation rows (no per-tree search),
+    so the reported MAE is not fitted to them.
+
+    Args:
+        forest: Fitted RandomForestRegressor for one target
+        X: Scaled validation features the forest was not trained on
+        y: Validation scores for the target
+        tolerance: Allowed MAE increase over the full forest
+        min_trees: Smallest subset considered
+
+    Returns:
+        tuple: (kept tree indices, full forest MAE, kept subset MAE)
+    """
+    y = np.asarray(y, dtype=float)
+    tree_predictions = np.column_stack([tree.predict(X) for tree in forest.estimators_])
+    n_trees = tree_predictions.shape[1]
+
+    prefix_means = np.cumsum(tree_predictions, axis=1) / np.arange(1, n_trees + 1)
+    prefix_maes = np.abs(np.clip(np.round(prefix_means), 1, 5) - y[:, None]).mean(axis=0)
+    full_mae = float(prefix_maes[-1])
+
+    # Last prefix that breaks the tolerance; everything after it is safe
+    outside = np.flatnonzero(prefix_maes > full_mae + tolerance + 1e-12)
+    size = int(outside[-1]) + 2 if len(outside) else 1
+    size = min(max(size, min_trees), n_trees)
+    return list(range(size)), full_mae, float(prefix_maes[size - 1])
+
+
+def compact_predictor(predictor, validation_df, tolerance=0.05, min_trees=10):
+    """
+    Build a compact copy of a random forest SpeechPredictor
+
+    Args:
+        predictor: Trained random_forest SpeechPredictor
+        validation_df: Labeled rows the predictor was not trained on
+        tolerance: Allowed validation MAE increase for each target
+        min_trees: Fewest trees kept per target
+
+    Returns:
+        tuple: (compact SpeechPredictor with model_type 'compact_forest', report dict)
+    """
+    if not predictor.is_trained or predictor.model_type != 'random_forest':
+        raise ValueError("Compaction needs a trained random_forest model")
+
+    X, y = predictor.preprocess_data(validation_df)
+    if y is None:
+        raise ValueError("Validation data must contain target columns")
+    # sklearn trees compare float32 features, so select on what they see
+    X_scaled = predictor.scaler.transform(X).astype(np.float32)
+
+    forests = predictor.model.estimators_
+    kept, per_target = [], {}
+    for i, (target, forest) in enumerate(zip(predictor.TARGET_COLUMNS, forests)):
+        indices, full_mae, compact_mae = select_trees(
+            forest, X_scaled, y.iloc[:, i], tolerance, min_trees=min_trees
+        )
+        kept.append(indices)
+        per_target[target] = {
+            'trees': len(indices),
+            'full_mae': full_mae,
+            'compact_mae': compact_mae,
+        }
+
+    compact = copy.copy(predictor)
+    compact.model = CompactForest(forests, kept)
+    compact.model_type = 'compact_forest'
+
+    full_eval = predictor.evaluate(validation_df)
+    compact_eval = compact.evaluate(validation_df)
+    report = {
+        'tolerance': tolerance,
+        'validation_rows': len(validation_df),
+        'trees_before': sum(len(forest.estimators_) for forest in forests),
+        'trees_after': int(compact.model.tree_counts.sum()),
+        'nodes_after': compact.model.n_nodes,
+        'validation_mae_before': full_eval['mae'],
+        'validation_mae_after': compact_eval['mae'],
+        'per_target': per_target,
+    }
+    return compact, report
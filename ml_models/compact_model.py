@@ -0,0 +1,124 @@
+"""
+Script to compact a trained random forest model into a smaller serving bundle
+
+Loads the model from --models-dir, picks the fewest trees per target that
+keep MAE on the held-out rows (the same 20% split SpeechPredictor.train
+holds out) within --tolerance, and saves the float32 result to --output as
+a separate bundle. Publish it into ML_MODELS_DIR to serve it.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from sklearn.model_selection import train_test_split
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_models.compact_forest import compact_predictor
+from ml_models.dataset_loader import load_dataset
+from ml_models.model_registry import publish_bundle, resolve_model_dir
+from ml_models.speech_predictor import SpeechPredictor
+
+
+def _bundle_cost(bundle_dir, rows, repeats=50):
+    """Size on disk, load time and single-row latency of a saved bundle"""
+    predictor = SpeechPredictor()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load(bundle_dir)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    predictor.predict(rows[0])
+    started = time.perf_counter()
+    for i in range(repeats):
+        predictor.predict(rows[i % len(rows)])
+    predict_ms = (time.perf_counter() - started) * 1000 / repeats
+
+    return {
+        'size_bytes': sum(path.stat().st_size for path in Path(bundle_dir).glob('*.joblib')),
+        'load_ms': load_ms,
+        'predict_ms': predict_ms,
+    }
+
+
+def compact_model(df, models_dir, output_dir, tolerance=0.05, min_trees=10, publish=False):
+    """
+    Compact the model in models_dir and save it to output_dir
+
+    Args:
+        df: Labeled dataset the model was trained on with SpeechPredictor.train
+        models_dir: Source model directory (versioned or legacy)
+        output_dir: Where the compact bundle is written
+        tolerance: Allowed validation MAE increase per target
+        min_trees: Fewest trees kept per target
+        publish: Publish as a versioned bundle in output_dir instead of saving directly
+
+    Returns:
+        dict: Compaction report
+    """
+    source_dir = resolve_model_dir(models_dir)
+    predictor = SpeechPredictor()
+    predictor.load(source_dir)
+
+    # Same split SpeechPredictor.train uses, so these rows were never trained on
+    _, holdout = train_test_split(df, test_size=0.2, random_state=42)
+    compact, report = compact_predictor(predictor, holdout, tolerance=tolerance, min_trees=min_trees)
+
+    output_dir = Path(output_dir)
+    if publish:
+        version = publish_bundle(compact, output_dir)
+        bundle_dir = output_dir / 'versions' / version
+    else:
+        compact.save(output_dir)
+        bundle_dir = output_dir
+
+    inputs = [column for column in SpeechPredictor.FEATURE_COLUMNS if column in df.columns]
+    rows = holdout[inputs + ['category']].to_dict('records')
+    report['source'] = str(source_dir)
+    report['output'] = str(bundle_dir)
+    report['before'] = _bundle_cost(source_dir, rows)
+    report['after'] = _bundle_cost(bundle_dir, rows)
+
+    with open(bundle_dir / 'compaction_report.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    BASE_DIR = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', default=str(BASE_DIR / 'Speeches_Dataset_Clean.csv'))
+    parser.add_argument('--models-dir', default=str(BASE_DIR / 'ml_models' / 'trained_models'))
+    parser.add_argument('--output', default=str(BASE_DIR / 'ml_models' / 'trained_models_compact'))
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='Allowed held-out MAE increase per target')
+    parser.add_argument('--min-trees', type=int, default=10)
+    parser.add_argument('--publish', action='store_true')
+    args = parser.parse_args()
+
+    df = load_dataset(args.dataset)
+    report = compact_model(
+        df, args.models_dir, args.output,
+        tolerance=args.tolerance, min_trees=args.min_trees, publish=args.publish
+    )
+    before, after = report['before'], report['after']
+
+    print("\n" + "=" * 60)
+    print("COMPACT MODEL")
+    print("=" * 60)
+    print(f"  Trees:           {report['trees_before']} -> {report['trees_after']}")
+    print(f"  Held-out MAE:    {report['validation_mae_before']:.4f} -> {report['validation_mae_after']:.4f}"
+          f"  (tolerance {report['tolerance']:+.4f} per target)")
+    print(f"  Size on disk:    {before['size_bytes'] / 1024:.0f} KB -> {after['size_bytes'] / 1024:.0f} KB")
+    print(f"  Load time:       {before['load_ms']:.1f} ms -> {after['load_ms']:.1f} ms")
+    print(f"  Single-row:      {before['predict_ms']:.2f} ms -> {after['predict_ms']:.2f} ms")
+    print(f"\n  {'target':25s} {'trees':>6s} {'full MAE':>9s} {'compact':>8s}")
+    for target, result in report['per_target'].items():
+        print(f"  {target:25s} {result['trees']:6d} {result['full_mae']:9.4f} {result['compact_mae']:8.4f}")
+    print(f"\n  Saved to: {report['output']}")
@@ -0,0 +1,128 @@
+"""
+Script to compare incremental forest growth against a full retrain
+
+Treats the last --new-rows rows of the dataset as newly labeled data:
+trains a base model on the rest, then grows it with train_incremental (new
+rows plus at most --replay-rows older ones) and, separately, retrains from
+scratch on everything. Both are scored on the
+same held-out rows, which are excluded from every training step.
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+
+from sklearn.model_selection import train_test_split
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_models.dataset_loader import load_dataset
+from ml_models.speech_predictor import SpeechPredictor
+
+
+def compare_incremental(df, new_rows=40, n_new_trees=50, max_trees=200, max_replay_rows=500,
+                        random_state=42):
+    """
+    Compare incremental training with a full retrain
+
+    Args:
+        df: Labeled dataset, oldest rows first
+        new_rows: Number of trailing rows treated as newly labeled
+        n_new_trees: Trees added per target by the incremental step
+        max_trees: Tree cap per target for the incremental model
+        max_replay_rows: Older rows replayed into the incremental step
+
+    Returns:
+        dict: Held-out metrics and wall time for both approaches
+    """
+    # Hold out rows that neither approach ever trains on
+    _, holdout = train_test_split(df, test_size=0.2, random_state=random_state)
+    df = df.drop(index=holdout.index)
+    base_df, new_df = df.iloc[:-new_rows], df.iloc[-new_rows:]
+
+    base = SpeechPredictor(model_type='random_forest')
+    base.train(base_df, random_state=random_state)
+    base_eval = base.evaluate(holdout)
+
+    incremental = copy.deepcopy(base)
+    started = time.perf_counter()
+    incremental_metrics = incremental.train_incremental(
+        new_df, n_new_trees=n_new_trees, max_trees=max_trees,
+        replay_df=base_df, max_replay_rows=max_replay_rows, random_state=random_state
+    )
+    incremental_time = time.perf_counter() - started
+
+    full = SpeechPredictor(model_type='random_forest')
+    started = time.perf_counter()
+    full.train(df, random_state=random_state)
+    full_time = time.perf_counter() - started
+
+    incremental_eval = incremental.evaluate(holdout)
+    full_eval = full.evaluate(holdout)
+
+    return {
+        'samples': len(df) + len(holdout),
+        'new_rows': new_rows,
+        'holdout_rows': len(holdout),
+        'base': {'holdout_mae': base_eval['mae']},
+        'incremental': {
+            'seconds': incremental_time,
+            'holdout_mae': incremental_eval['mae'],
+            'rows_fitted': incremental_metrics['new_rows'] + incremental_metrics['replay_rows'],
+            'trees_per_target': incremental_metrics['trees_per_target'],
+            'trees_retired': incremental_metrics['trees_retired'],
+            'per_target_mae': {
+                target: incremental_eval[f'{target}_mae'] for target in SpeechPredictor.TARGET_COLUMNS
+            },
+        },
+        'full_retrain': {
+            'seconds': full_time,
+            'holdout_mae': full_eval['mae'],
+            'trees_per_target': len(full.model.estimators_[0].estimators_),
+            'per_target_mae': {
+                target: full_eval[f'{target}_mae'] for target in SpeechPredictor.TARGET_COLUMNS
+            },
+        },
+    }
+
+
+if __name__ == '__main__':
+    BASE_DIR = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', default=str(BASE_DIR / 'Speeches_Dataset_Clean.csv'))
+    parser.add_argument('--new-rows', type=int, default=40)
+    parser.add_argument('--new-trees', type=int, default=50)
+    parser.add_argument('--max-trees', type=int, default=200)
+    parser.add_argument('--replay-rows', type=int, default=500,
+                        help='Older rows replayed into the incremental step')
+    parser.add_argument('--output', default=None, help='Optional JSON report path')
+    args = parser.parse_args()
+
+    df = load_dataset(args.dataset)
+    report = compare_incremental(
+        df, new_rows=args.new_rows, n_new_trees=args.new_trees, max_trees=args.max_trees,
+        max_replay_rows=args.replay_rows
+    )
+
+    print("\n" + "=" * 60)
+    print("INCREMENTAL vs FULL RETRAIN")
+    print("=" * 60)
+    print(f"  Samples: {report['samples']} ({report['new_rows']} new)")
+    print(f"  Base model MAE:       {report['base']['holdout_mae']:.4f}")
+    print(f"  Incremental MAE:      {report['incremental']['holdout_mae']:.4f}"
+          f"  ({report['incremental']['seconds']:.2f}s, {report['incremental']['rows_fitted']} rows fitted)")
+    print(f"  Full retrain MAE:     {report['full_retrain']['holdout_mae']:.4f}"
+          f"  ({report['full_retrain']['seconds']:.2f}s)")
+    print(f"\n  {'target':25s} {'incremental':>12s} {'full':>8s}")
+    for target in SpeechPredictor.TARGET_COLUMNS:
+        print(f"  {target:25s} {report['incremental']['per_target_mae'][target]:12.4f}"
+              f" {report['full_retrain']['per_target_mae'][target]:8.4f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.output}")
@@ -0,0 +1,235 @@
+"""
+Validated, cached loading of the labeled speech dataset
+
+The raw CSV is parsed, checked against the SpeechPredictor feature and
+target schema and normalized (pitch__variation -> pitch_variation, File
+Name -> file) once. The result is cached as plain .npy arrays: float32
+features and int8 targets, which later loads copy straight into a
+DataFrame instead of parsing the CSV again. The cache is keyed by the
+CSV's path, size and modification time, so an edited or grown dataset is
+re-validated automatically.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .speech_predictor import SpeechPredictor
+except ImportError:
+    from speech_predictor import SpeechPredictor
+
+
+# Bump when validation or the cached layout changes
+DATASET_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / 'stage_ready_datasets'
+
+# Raw column name -> schema name
+COLUMN_ALIASES = {
+    'pitch__variation': 'pitch_variation',
+    'File Name': 'file',
+}
+
+# Feature columns the CSV must provide (category_encoded is derived from
+# category; words_per_minute is derived from syllables_per_sec if absent)
+REQUIRED_FEATURES = [
+    column for column in SpeechPredictor.FEATURE_COLUMNS
+    if column not in ('category_encoded', 'words_per_minute')
+]
+OPTIONAL_FEATURES = ['words_per_minute']
+
+SCORE_RANGE = (1, 5)
+
+
+class DatasetSchemaError(ValueError):
+    """Raised when a dataset does not match the SpeechPredictor schema"""
+
+
+def normalize_columns(df):
+    """
+    Rename column aliases to the schema names
+
+    Where both spellings are present (the dataset has 'file' and 'File
+    Name'), the schema column is kept and gaps in it are filled from the
+    alias.
+
+    Returns:
+        pd.DataFrame: Frame with schema column names
+    """
+    df = df.copy()
+    for alias, name in COLUMN_ALIASES.items():
+        if alias not in df.columns:
+            continue
+        if name in df.columns:
+            df[name] = df[name].fillna(df[alias])
+            df = df.drop(columns=alias)
+        else:
+            df = df.rename(columns={alias: name})
+    return df
+
+
+def validate_dataset(df, source='dataset'):
+    """
+    Check a normalized frame against the SpeechPredictor schema
+
+    Args:
+        df: Frame after normalize_columns
+        source: Name used in error messages
+
+    Raises:
+        DatasetSchemaError: Listing every problem found
+    """
+    problems = []
+    targets = SpeechPredictor.TARGET_COLUMNS
+
+    missing = [column for column in ['category', *REQUIRED_FEATURES, *targets] if column not in df.columns]
+    if missing:
+        problems.append(f"missing columns {missing}")
+
+    for column in REQUIRED_FEATURES + OPTIONAL_FEATURES + targets:
+        if column in df.columns and not pd.api.types.is_numeric_dtype(df[column]):
+            problems.append(f"column {column!r} is not numeric")
+
+    for column in REQUIRED_FEATURES + OPTIONAL_FEATURES:
+        if column in df.columns and pd.api.types.is_numeric_dtype(df[column]):
+            if np.isinf(df[column].to_numpy(dtype=float)).any():
+                problems.append(f"column {column!r} has infinite values")
+
+    low, high = SCORE_RANGE
+    for column in targets:
+        if column not in df.columns or not pd.api.types.is_numeric_dtype(df[column]):
+            continue
+        values = df[column]
+        if values.isnull().any():
+            problems.append(f"target {column!r} has {int(values.isnull().sum())} missing values")
+        elif ((values < low) | (values > high) | (values != values.round())).any():
+            problems.append(f"target {column!r} has values outside the {low}-{high} integer scale")
+
+    if 'category' in df.columns and df['category'].isnull().any():
+        problems.append(f"'category' has {int(df['category'].isnull().sum())} missing values")
+
+    if problems:
+        raise DatasetSchemaError(f"{source}: " + '; '.join(problems))
+
+
+def _cache_key(csv_path):
+    stat = csv_path.stat()
+    identity = f'{csv_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{DATASET_CACHE_VERSION}'
+    return hashlib.sha256(identity.encode()).hexdigest()[:16]
+
+
+def _write_cache(df, cache_path):
+    """Write the columnar arrays to a fresh directory, then rename into place"""
+    feature_columns = REQUIRED_FEATURES + [column for column in OPTIONAL_FEATURES if column in df.columns]
+    targets = SpeechPredictor.TARGET_COLUMNS
+    categories = sorted(df['category'].astype(str).unique())
+
+    temp_dir = Path(tempfile.mkdtemp(dir=cache_path.parent, prefix='.tmp-'))
+    try:
+        np.save(temp_dir / 'features.npy', df[feature_columns].to_numpy(dtype=np.float32))
+        np.save(temp_dir / 'targets.npy', df[targets].to_numpy(dtype=np.int8))
+        np.save(temp_dir / 'category.npy', pd.Categorical(df['category'].astype(str), categories).codes.astype(np.int8))
+        meta = {
+            'version': DATASET_CACHE_VERSION,
+            'rows': len(df),
+            'feature_columns': feature_columns,
+            'target_columns': targets,
+            'categories': categories,
+            'files': df['file'].astype(str).tolist() if 'file' in df.columns else None,
+        }
+        with open(temp_dir / 'meta.json', 'w') as f:
+            json.dump(meta, f)
+        os.replace(temp_dir, cache_path)
+    except OSError:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        if not cache_path.exists():
+            raise
+
+
+def _read_cache(cache_path):
+    """
+    Build the frame from the cached arrays
+
+    The arrays are memory-mapped only as the read path: building the
+    DataFrame copies every column, so the frame ends up as the single
+    in-memory copy rather than the loaded arrays plus the frame.
+    """
+    with open(cache_path / 'meta.json') as f:
+        meta = json.load(f)
+
+    features = np.load(cache_path / 'features.npy', mmap_mode='r')
+    targets = np.load(cache_path / 'targets.npy', mmap_mode='r')
+    category = np.load(cache_path / 'category.npy', mmap_mode='r')
+
+    columns = {'category': pd.Categorical.from_codes(category, meta['categories'])}
+    columns.update({name: features[:, i] for i, name in enumerate(meta['feature_columns'])})
+    columns.update({name: targets[:, i] for i, name in enumerate(meta['target_columns'])})
+    if meta['files'] is not None:
+        columns['file'] = meta['files']
+    return pd.DataFrame(columns)
+
+
+def read_dataset_csv(csv_path):
+    """
+    Parse, normalize and validate a raw dataset CSV (no cache)
+
+    Returns:
+        pd.DataFrame: Schema-named frame
+
+    Raises:
+        DatasetSchemaError: The CSV does not match the schema
+    """
+    df = normalize_columns(pd.read_csv(csv_path))
+    validate_dataset(df, source=str(csv_path))
+    return df
+
+
+def load_dataset(csv_path, cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+    """
+    Load the labeled dataset, from the columnar cache when it is current
+
+    Args:
+        csv_path: Raw dataset CSV
+        cache_dir: Directory for cached arrays
+        use_cache: False always parses the CSV (and writes nothing)
+
+    Returns:
+        pd.DataFrame: 'category', float32 features, int8 targets and
+            'file' (when the CSV has file names), with schema column names
+
+    Raises:
+        DatasetSchemaError: The CSV does not match the schema
+    """
+    csv_path = Path(csv_path)
+    if not use_cache:
+        return read_dataset_csv(csv_path)
+
+    cache_dir = Path(cache_dir)
+    cache_path = cache_dir / f'{csv_path.stem}-{_cache_key(csv_path)}'
+    if (cache_path / 'meta.json').exists():
+        try:
+            return _read_cache(cache_path)
+        except (OSError, ValueError, KeyError):
+            shutil.rmtree(cache_path, ignore_errors=True)
+
+    df = read_dataset_csv(csv_path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Earlier versions of this CSV are stale now
+        stale_name = re.compile(rf'{re.escape(csv_path.stem)}-[0-9a-f]{{16}}')
+        for stale in cache_dir.iterdir():
+            if stale_name.fullmatch(stale.name):
+                shutil.rmtree(stale, ignore_errors=True)
+        _write_cache(df, cache_path)
+        return _read_cache(cache_path)
+    except OSError as e:
+        print(f"Warning: could not cache dataset in {cache_dir}: {e}")
+        return df
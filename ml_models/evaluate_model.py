@@ -2,7 +2,6 @@
 Script to evaluate the trained model
 """
 
-import pandas as pd
 import numpy as np
 import sys
 from pathlib import Path
@@ -12,6 +11,8 @@ import seaborn as sns
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from ml_models.dataset_loader import load_dataset
+from ml_models.model_registry import resolve_model_dir
 from ml_models.speech_predictor import SpeechPredictor
 
 
@@ -27,7 +28,8 @@ def evaluate_model(model_dir, dataset_path=None):
     print("MODEL EVALUATION")
     print("=" * 60)
 
-    # Load model
+    # Load model (the active version if model_dir holds published bundles)
+    model_dir = resolve_model_dir(model_dir)
     print(f"\nLoading model from: {model_dir}")
     predictor = SpeechPredictor()
     predictor.load(model_dir)
@@ -59,7 +61,7 @@ def evaluate_model(model_dir, dataset_path=None):
     print("=" * 60)
 
     if dataset_path and Path(dataset_path).exists():
-        df = pd.read_csv(dataset_path)
+        df = load_dataset(dataset_path)
         sample = df.iloc[0].to_dict()
 
         print(f"\nTesting with sample: {sample.get('file', 'Unknown')}")
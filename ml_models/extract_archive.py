@@ -0,0 +1,85 @@
+"""
+Script to extract features for an archive of recordings
+
+Writes one row of features per recording to a CSV. With --cache-dir the
+decoded signal, STFT magnitude and log-mel spectrogram of every recording
+are kept in a persistent ArtifactCache, so re-running after adding or
+changing a feature only recomputes the feature itself.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_models.artifact_cache import ArtifactCache
+from ml_models.audio_processor import AudioFeatureExtractor, SOUNDFILE_FORMATS
+
+AUDIO_EXTENSIONS = SOUNDFILE_FORMATS | {'webm', 'm4a', 'aac', 'mp4'}
+
+
+def extract_archive(audio_paths, extractor, features=None):
+    """
+    Extract features for every recording
+
+    Args:
+        audio_paths: Recordings to extract
+        extractor: AudioFeatureExtractor (with an ArtifactCache to reuse transforms)
+        features: Optional feature names to extract (None: all)
+
+    Returns:
+        pd.DataFrame: One row per recording, with a 'file' column
+    """
+    rows = []
+    for index, path in enumerate(audio_paths, 1):
+        path = Path(path)
+        try:
+            row = extractor.extract_features(path, features=features)
+        except Exception as e:
+            print(f"  Skipping {path.name}: {e}")
+            continue
+        row['file'] = path.name
+        rows.append(row)
+        if index % 50 == 0:
+            print(f"  {index}/{len(audio_paths)} recordings")
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--audio-dir', required=True, help='Directory of recordings (searched recursively)')
+    parser.add_argument('--output', required=True, help='CSV file to write')
+    parser.add_argument('--features', nargs='+', default=None, help='Feature names to extract (default: all)')
+    parser.add_argument('--cache-dir', default=None, help='Artifact cache directory')
+    parser.add_argument('--cache-size-mb', type=float, default=2048,
+                        help='Cache size above which least recently used recordings are evicted')
+    parser.add_argument('--voiced-only', action='store_true')
+    args = parser.parse_args()
+
+    audio_paths = sorted(
+        path for path in Path(args.audio_dir).rglob('*')
+        if path.suffix.lower().lstrip('.') in AUDIO_EXTENSIONS
+    )
+    if not audio_paths:
+        raise SystemExit(f"No recordings found in {args.audio_dir}")
+
+    cache = None
+    if args.cache_dir:
+        cache = ArtifactCache(args.cache_dir, max_bytes=int(args.cache_size_mb * 1024 ** 2))
+    extractor = AudioFeatureExtractor(voiced_only=args.voiced_only, cache=cache)
+
+    print(f"Extracting {len(audio_paths)} recordings from {args.audio_dir}")
+    started = time.perf_counter()
+    df = extract_archive(audio_paths, extractor, features=args.features)
+    elapsed = time.perf_counter() - started
+
+    df.to_csv(args.output, index=False)
+    print(f"\nExtracted {len(df)} recordings in {elapsed:.1f}s -> {args.output}")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"  Cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions, {stats['bytes'] / 1024 ** 2:.0f} MB on disk")
@@ -0,0 +1,354 @@
+"""
+Warm extraction worker processes, decoupled from the web workers
+
+Feature extraction (librosa/numba/NumPy) holds the GIL for long stretches,
+so running it inside a web worker stalls that worker's other requests.
+ExtractionPool keeps a fixed number of separate processes with librosa
+already warmed up and SpeechPredictor models loaded. A web worker decodes
+the upload, places the signal in shared memory and waits for the scores;
+only the shared-memory name crosses the pipe, not the audio.
+
+Workers that crash are replaced; workers that exceed the task timeout are
+killed and replaced; every worker is recycled after a fixed number of
+tasks to bound memory growth. Replacements are spawned in the background
+and only receive a task once they report that warm-up has finished.
+
+Each web process owns its own pool; per_process_pool_size() splits a
+machine-wide process budget across the web workers.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+import warnings
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from .audio_processor import AudioFeatureExtractor
+    from .model_registry import ModelRegistry
+except ImportError:
+    from audio_processor import AudioFeatureExtractor
+    from model_registry import ModelRegistry
+
+
+def score_timeline(predictor, audio_extractor, signal, category, window_seconds, step_seconds):
+    """
+    Score sliding windows of a recording in one batched prediction
+
+    Returns:
+        list: {'start', 'end', <target>: score, ...} per window
+    """
+    windows = audio_extractor.extract_window_features(
+        signal,
+        window_seconds=window_seconds,
+        step_seconds=step_seconds
+    )
+    if category:
+        for window in windows:
+            window['category'] = category
+
+    scores = predictor.predict_batch(windows)
+    return [
+        {
+            'start': round(window['start'], 2),
+            'end': round(window['end'], 2),
+            **{target: int(score) for target, score in zip(predictor.TARGET_COLUMNS, row)},
+        }
+        for window, row in zip(windows, scores)
+    ]
+
+
+def per_process_pool_size(box_size, web_workers):
+    """
+    Extraction processes each web worker should start
+
+    Args:
+        box_size: Extraction processes wanted on the whole machine
+        web_workers: Web worker processes on the machine, each with its own pool
+
+    Returns:
+        int: box_size split evenly (rounded down), at least 1 when
+            box_size is positive, 0 otherwise
+    """
+    if box_size <= 0:
+        return 0
+    return max(1, box_size // max(1, web_workers))
+
+
+def _read_shared_signal(name, length):
+    """Copy a float32 signal out of shared memory created by the parent"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray((length,), dtype=np.float32, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+
+
+def _worker_main(conn, extractor_kwargs, reload_interval):
+    """Worker process loop: warm up, then serve tasks until told to stop"""
+    extractor_kwargs = dict(extractor_kwargs, workers=0)
+    # Each worker is one core's worth of work; the forest runs single-threaded
+    # here (daemon processes cannot start joblib workers)
+    warnings.filterwarnings('ignore', message='Loky-backed parallel loops')
+    # Compile numba kernels and fill librosa caches before the first request
+    warmup = np.random.default_rng(0).standard_normal(22050 * 2).astype(np.float32) * 0.1
+    AudioFeatureExtractor(**extractor_kwargs).extract_features_from_signal(warmup)
+    conn.send(('ready', None))
+
+    registries = {}
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        try:
+            signal = _read_shared_signal(task['shm'], task['length'])
+            audio_extractor = AudioFeatureExtractor(**extractor_kwargs)
+
+            predictor, version = None, None
+            if task.get('model_dir'):
+                registry = registries.get(task['model_dir'])
+                if registry is None:
+                    registry = registries[task['model_dir']] = ModelRegistry(
+                        task['model_dir'], reload_interval=reload_interval
+                    )
+                predictor, version = registry.get(), registry.version
+
+            columns = predictor.feature_columns if predictor is not None else task.get('features')
+            features = audio_extractor.extract_features_from_signal(signal, features=columns)
+            if task.get('category'):
+                features['category'] = task['category']
+
+            result = {'features': features, 'model_version': version}
+            if predictor is not None:
+                result['predictions'] = predictor.predict(features)
+                if task.get('timeline'):
+                    result['timeline'] = score_timeline(
+                        predictor, audio_extractor, signal, task.get('category'), *task['timeline']
+                    )
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', f'{type(e).__name__}: {e}'))
+
+
+class _Worker:
+    """One extraction process and the parent's end of its pipe"""
+
+    def __init__(self, context, extractor_kwargs, reload_interval):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, extractor_kwargs, reload_interval),
+            name='extraction-worker',
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        self.ready = False
+
+    def wait_ready(self, timeout):
+        """Wait for the worker to finish warming up; False if it never does"""
+        if self.ready:
+            return True
+        try:
+            if not self.conn.poll(timeout):
+                return False
+            message = self.conn.recv()
+        except (EOFError, OSError):
+            return False
+        self.ready = message == ('ready', None)
+        return self.ready
+
+    def stop(self, timeout=1.0):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Fixed-size pool of warm extraction processes
+
+    Thread-safe: any number of request threads may call analyze(); each
+    task gets a whole worker, and callers queue for an idle one.
+    """
+
+    def __init__(self, size, extractor_kwargs=None, task_timeout=120.0,
+                 max_tasks_per_worker=500, reload_interval=5.0, queue_timeout=None,
+                 startup_timeout=60.0):
+        """
+        Args:
+            size: Number of worker processes in this pool (see
+                per_process_pool_size for a machine-wide budget)
+            extractor_kwargs: AudioFeatureExtractor arguments for the workers
+            task_timeout: Seconds a warmed-up worker may spend on one task
+                before it is killed
+            max_tasks_per_worker: Tasks after which a worker is replaced
+            reload_interval: Seconds between the workers' checks for a new model
+            queue_timeout: Seconds a task may wait for an idle worker
+                (defaults to task_timeout)
+            startup_timeout: Seconds a new worker may take to warm up
+        """
+        self.size = size
+        self.extractor_kwargs = dict(extractor_kwargs or {})
+        self.task_timeout = task_timeout
+        self.queue_timeout = task_timeout if queue_timeout is None else queue_timeout
+        self.startup_timeout = startup_timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.reload_interval = reload_interval
+        # A fresh interpreter per worker: forking a threaded web worker is unsafe
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._started = False
+        self.counters = {
+            'tasks': 0, 'timeouts': 0, 'queue_timeouts': 0, 'crashes': 0, 'recycled': 0
+        }
+
+    def start(self):
+        """Spawn the workers (done on first use if not called explicitly)"""
+        with self._start_lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(self._spawn())
+            self._started = True
+
+    def _spawn(self):
+        return _Worker(self._context, self.extractor_kwargs, self.reload_interval)
+
+    def _replace(self, worker, kill=False):
+        """Stop a worker and add a fresh one to the pool, off the request thread"""
+        def replace():
+            if kill:
+                worker.process.kill()
+            worker.stop()
+            self._idle.put(self._spawn())
+
+        threading.Thread(target=replace, name='extraction-respawn', daemon=True).start()
+
+    def _checkout(self):
+        """
+        Take an idle worker that has finished warming up
+
+        Workers that died (or never finished warming up) are replaced and
+        the next idle one is tried. Warm-up waits do not count against
+        task_timeout.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        while True:
+            try:
+                worker = self._idle.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.counters['queue_timeouts'] += 1
+                raise TimeoutError(
+                    f'No extraction worker became available within {self.queue_timeout:.0f}s'
+                )
+            if worker.process.is_alive() and worker.wait_ready(self.startup_timeout):
+                return worker
+            self.counters['crashes'] += 1
+            self._replace(worker, kill=True)
+
+    def stats(self):
+        return {'size': self.size, 'idle': self._idle.qsize(), **self.counters}
+
+    def analyze(self, signal, model_dir=None, features=None, category='', timeline=None):
+        """
+        Extract features (and scores) for a decoded signal in a worker process
+
+        Args:
+            signal: Mono float32 signal at 22050 Hz
+            model_dir: Models directory whose current model scores the
+                recording (None: features only)
+            features: Feature names to extract when no model_dir is given
+            category: Optional speech category
+            timeline: Optional (window_seconds, step_seconds) for per-window scores
+
+        Returns:
+            dict: 'features', 'model_version' and, with a model,
+                'predictions' (and 'timeline' if requested)
+
+        Raises:
+            TimeoutError: No worker became idle, or the task ran too long
+            RuntimeError: The worker crashed or the extraction failed
+        """
+        self.start()
+        signal = np.ascontiguousarray(signal, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(signal.nbytes, 1))
+        try:
+            np.ndarray(signal.shape, dtype=np.float32, buffer=shm.buf)[:] = signal
+            task = {
+                'shm': shm.name,
+                'length': len(signal),
+                'model_dir': str(model_dir) if model_dir else None,
+                'features': list(features) if features is not None else None,
+                'category': category,
+                'timeline': tuple(timeline) if timeline else None,
+            }
+            return self._run(task)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _run(self, task):
+        while True:
+            worker = self._checkout()
+            try:
+                worker.conn.send(task)
+                break
+            except OSError:
+                self.counters['crashes'] += 1
+                self._replace(worker, kill=True)
+
+        try:
+            worker.tasks += 1
+            self.counters['tasks'] += 1
+            # Only the worker's own time counts; queueing and warm-up were bounded above
+            if not worker.conn.poll(self.task_timeout):
+                # Stuck: kill it, a fresh worker takes its place
+                self.counters['timeouts'] += 1
+                self._replace(worker, kill=True)
+                worker = None
+                raise TimeoutError(f'Extraction exceeded {self.task_timeout:.0f}s')
+
+            try:
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                self.counters['crashes'] += 1
+                self._replace(worker, kill=True)
+                worker = None
+                raise RuntimeError('Extraction worker crashed')
+
+            if worker.tasks >= self.max_tasks_per_worker:
+                self.counters['recycled'] += 1
+                self._replace(worker)
+                worker = None
+
+            if status != 'ok':
+                raise RuntimeError(payload)
+            return payload
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+
+    def shutdown(self):
+        """Stop every idle worker"""
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
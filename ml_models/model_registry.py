@@ -0,0 +1,164 @@
+"""
+Versioned Model Bundles
+Publishes trained models as immutable versioned bundles and lets running
+processes hot-swap to the newest published bundle without a restart
+
+Layout under the models directory:
+    versions/<version>/   model.joblib, scaler.joblib, ... , training_metrics.json
+    CURRENT               name of the active version (replaced atomically)
+
+A models directory without CURRENT is treated as a single legacy bundle.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from .speech_predictor import SpeechPredictor
+except ImportError:
+    from speech_predictor import SpeechPredictor
+
+
+CURRENT_POINTER = 'CURRENT'
+VERSIONS_DIR = 'versions'
+METRICS_FILE = 'training_metrics.json'
+
+
+def current_version(models_dir):
+    """Return the active version name, or None for a legacy/unpublished directory"""
+    pointer = Path(models_dir) / CURRENT_POINTER
+    try:
+        version = pointer.read_text().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def resolve_model_dir(models_dir):
+    """Return the directory holding the active model files"""
+    version = current_version(models_dir)
+    if version is None:
+        return Path(models_dir)
+    return Path(models_dir) / VERSIONS_DIR / version
+
+
+def load_metrics(bundle_dir):
+    """Load a bundle's training metrics, or None if it has none"""
+    metrics_path = Path(bundle_dir) / METRICS_FILE
+    if not metrics_path.exists():
+        return None
+    with open(metrics_path, 'r') as f:
+        return json.load(f)
+
+
+def publish_bundle(predictor, models_dir, metrics=None, keep=5):
+    """
+    Save a trained predictor as a new version and make it current
+
+    The bundle is written to a temporary directory and renamed into place,
+    then the CURRENT pointer is swapped with os.replace, so readers only ever
+    see complete bundles.
+
+    Args:
+        predictor: Trained SpeechPredictor
+        models_dir: Root models directory (settings.ML_MODELS_DIR)
+        metrics: Optional metrics dict stored alongside the model
+        keep: Number of most recent versions to retain
+
+    Returns:
+        str: The published version name
+    """
+    models_dir = Path(models_dir)
+    versions_dir = models_dir / VERSIONS_DIR
+    versions_dir.mkdir(parents=True, exist_ok=True)
+
+    version = datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S-%f')
+    staging_dir = versions_dir / f'.staging-{version}'
+    predictor.save(staging_dir)
+    if metrics is not None:
+        with open(staging_dir / METRICS_FILE, 'w') as f:
+            json.dump(metrics, f, indent=2)
+    staging_dir.rename(versions_dir / version)
+
+    pointer_tmp = models_dir / f'.{CURRENT_POINTER}.{os.getpid()}'
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, models_dir / CURRENT_POINTER)
+
+    prune_versions(models_dir, keep=keep)
+    return version
+
+
+def prune_versions(models_dir, keep=5):
+    """Delete the oldest versions beyond keep, never touching the current one"""
+    versions_dir = Path(models_dir) / VERSIONS_DIR
+    if not versions_dir.exists():
+        return
+
+    active = current_version(models_dir)
+    versions = sorted(
+        path for path in versions_dir.iterdir()
+        if path.is_dir() and not path.name.startswith('.')
+    )
+    for path in versions[:max(len(versions) - keep, 0)]:
+        if path.name != active:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class ModelRegistry:
+    """
+    Process-wide holder of the served SpeechPredictor
+
+    get() returns the loaded predictor and, at most every reload_interval
+    seconds, checks the CURRENT pointer. A new version is fully loaded before
+    the reference is swapped, and requests already holding the old predictor
+    finish with it, so no request is dropped during a switch.
+    """
+
+    def __init__(self, models_dir, reload_interval=5.0):
+        self.models_dir = Path(models_dir)
+        self.reload_interval = reload_interval
+        self.predictor = None
+        self.version = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def _signature(self):
+        """Identify the active bundle (version name, or mtime for legacy dirs)"""
+        version = current_version(self.models_dir)
+        if version is not None:
+            return version
+        metadata_path = self.models_dir / 'metadata.joblib'
+        if metadata_path.exists():
+            return f'legacy-{metadata_path.stat().st_mtime_ns}'
+        return None
+
+    def get(self):
+        """Return the current predictor (None if no model has been trained)"""
+        # Until a model is loaded, callers wait on the loading thread below
+        if self.predictor is not None and time.monotonic() - self._checked_at < self.reload_interval:
+            return self.predictor
+
+        # Only one thread reloads; the others keep serving the old model
+        if not self._lock.acquire(blocking=self.predictor is None):
+            return self.predictor
+        try:
+            if time.monotonic() - self._checked_at >= self.reload_interval:
+                self._refresh()
+        finally:
+            self._lock.release()
+        return self.predictor
+
+    def _refresh(self):
+        signature = self._signature()
+        self._checked_at = time.monotonic()
+        if signature is None or signature == self.version:
+            return
+
+        predictor = SpeechPredictor()
+        predictor.load(resolve_model_dir(self.models_dir))
+        self.predictor, self.version = predictor, signature
@@ -0,0 +1,337 @@
+"""
+Segment-parallel feature extraction for long recordings
+
+The decoded signal is cut into segments of whole STFT frames (each segment
+slice carries the half-frame of audio on either side that its frames
+overlap), and the frame-level work is spread over a process pool. Every
+feature the extractor produces is either a mean/std over frames or a
+global decision made once per recording, so segments return sums, sums of
+squares and counts, plus the few per-frame series that need the whole
+recording (RMS for the silence split, onset strength for peak picking),
+and the merge reproduces the single-pass extractor.
+
+Global quantities feed some frame-level features: the loudest log-mel
+value (the -80 dB floor of the log-mel spectrogram), the loudest spectral
+contrast peak and valley (each converted to dB with its own -80 dB floor)
+and the chroma tuning estimate. Contrast peaks and valleys come back from
+the first pass in unfloored dB and are floored in the merge; the log-mel
+maximum and the tuning are reduced after the first pass, and a second pass
+computes the MFCCs, onset strength and chroma that depend on them.
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import librosa
+import numpy as np
+
+
+N_FFT = 2048
+HOP_LENGTH = 512
+TOP_DB = 80.0  # power_to_db default floor below the loudest bin
+SILENCE_TOP_DB = 20  # librosa.effects.split threshold used for pauses
+
+# Groups computed from the first-pass statistics vs. the second pass
+FIRST_PASS_GROUPS = {'loudness', 'pitch', 'pauses', 'spectral_shape', 'zero_crossings', 'spectral_contrast'}
+SECOND_PASS_GROUPS = {'speech_rate', 'mfcc', 'chroma'}
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(workers):
+    """
+    Process pool shared by every extraction that asks for this many workers
+
+    Pools are created on first use and kept for the life of the process, so
+    a request only pays for sending its segments, not for starting workers.
+    """
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            _executors[workers] = executor
+        return executor
+
+
+def frame_count(n_samples):
+    """Number of centered STFT frames librosa produces for n_samples"""
+    return 1 + n_samples // HOP_LENGTH
+
+
+def segment_bounds(n_frames, segment_frames):
+    """Split frames [0, n_frames) into near-equal [start, stop) ranges"""
+    n_segments = max(1, math.ceil(n_frames / segment_frames))
+    edges = np.linspace(0, n_frames, n_segments + 1).round().astype(int)
+    return [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+
+def frame_slice(y, start, stop):
+    """
+    Samples covering frames [start, stop) of a centered framing of y
+
+    Returns:
+        tuple: (samples, left_pad, right_pad) where the pads are how many
+            samples of centering padding fall outside y at either end
+    """
+    half = N_FFT // 2
+    first = start * HOP_LENGTH - half
+    last = (stop - 1) * HOP_LENGTH + half
+    piece = y[max(first, 0):min(last, len(y))]
+    return piece, max(0, -first), max(0, last - len(y))
+
+
+def _pad(piece, left, right, mode):
+    if not left and not right:
+        return piece
+    return np.pad(piece, (left, right), mode=mode)
+
+
+def contrast_peaks_valleys(S, sr, n_bands=6, fmin=200.0, quantile=0.02):
+    """
+    Peak and valley energy per octave band, before librosa's dB conversion
+
+    Same bands and quantiles as librosa.feature.spectral_contrast (0.10),
+    which returns power_to_db(peak) - power_to_db(valley); that conversion
+    floors each array 80 dB below its own maximum, so a segment cannot
+    apply it without the whole recording's maxima.
+
+    Returns:
+        tuple: (peak, valley), each (n_bands + 1, n_frames)
+    """
+    freq = librosa.fft_frequencies(sr=sr, n_fft=2 * (S.shape[0] - 1))
+    octa = np.zeros(n_bands + 2)
+    octa[1:] = fmin * (2.0 ** np.arange(0, n_bands + 1))
+
+    peak = np.zeros((n_bands + 1, S.shape[1]))
+    valley = np.zeros_like(peak)
+    for k, (f_low, f_high) in enumerate(zip(octa[:-1], octa[1:])):
+        current_band = np.logical_and(freq >= f_low, freq <= f_high)
+        idx = np.flatnonzero(current_band)
+        if k > 0:
+            current_band[idx[0] - 1] = True
+        if k == n_bands:
+            current_band[idx[-1] + 1:] = True
+
+        sub_band = S[current_band]
+        if k < n_bands:
+            sub_band = sub_band[:-1]
+
+        # Always take at least one bin from each side
+        count = max(int(np.rint(quantile * np.sum(current_band))), 1)
+        sorted_band = np.sort(sub_band, axis=0)
+        valley[k] = np.mean(sorted_band[:count], axis=0)
+        peak[k] = np.mean(sorted_band[-count:], axis=0)
+    return peak, valley
+
+
+def _first_pass(piece, left, right, sr, groups):
+    """
+    Frame statistics that need no recording-wide quantity
+
+    Runs in a pool worker. Frames are taken with center=False from the
+    same padding librosa applies with center=True, so every frame is
+    identical to the single-pass one.
+    """
+    groups = set(groups)
+    y = _pad(piece, left, right, 'constant')
+    stats = {'frames': frame_count(len(y) - N_FFT)}
+
+    if groups & {'loudness', 'pauses'}:
+        stats['rms'] = librosa.feature.rms(y=y, center=False)[0]
+
+    if 'zero_crossings' in groups:
+        # zero_crossing_rate pads by repeating the edge samples
+        edged = _pad(piece, left, right, 'edge')
+        stats['zcr_sum'] = float(np.sum(librosa.feature.zero_crossing_rate(edged, center=False)[0]))
+
+    if not groups & {'pitch', 'spectral_shape', 'spectral_contrast', 'mfcc', 'speech_rate', 'chroma'}:
+        return stats
+
+    S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False))
+
+    if 'pitch' in groups:
+        pitches, magnitudes = librosa.piptrack(S=S, sr=sr)
+        pitch_values = pitches[magnitudes.argmax(axis=0), np.arange(pitches.shape[1])]
+        pitch_values = pitch_values[pitch_values > 0].astype(np.float64)
+        stats['pitch'] = (float(pitch_values.sum()), float(np.square(pitch_values).sum()), int(pitch_values.size))
+
+    if 'spectral_shape' in groups:
+        stats['spectral_sums'] = {
+            'spectral_centroid': float(np.sum(librosa.feature.spectral_centroid(S=S, sr=sr)[0])),
+            'spectral_rolloff': float(np.sum(librosa.feature.spectral_rolloff(S=S, sr=sr)[0])),
+            'spectral_bandwidth': float(np.sum(librosa.feature.spectral_bandwidth(S=S, sr=sr)[0])),
+        }
+
+    if 'spectral_contrast' in groups:
+        peak, valley = contrast_peaks_valleys(S, sr)
+        stats['contrast_db'] = (librosa.power_to_db(peak, top_db=None), librosa.power_to_db(valley, top_db=None))
+
+    if groups & {'mfcc', 'speech_rate'}:
+        mel = librosa.feature.melspectrogram(S=S ** 2, sr=sr)
+        stats['mel_db_max'] = float(np.max(librosa.power_to_db(mel, top_db=None)))
+
+    if 'chroma' in groups:
+        # The candidates estimate_tuning would see for these frames
+        pitches, magnitudes = librosa.piptrack(S=S ** 2, sr=sr, n_fft=N_FFT)
+        voiced = pitches > 0
+        stats['tuning'] = (pitches[voiced], magnitudes[voiced])
+
+    return stats
+
+
+def _second_pass(piece, left, right, sr, groups, lead, mel_db_floor, tuning):
+    """
+    Frame statistics that depend on the recording-wide log-mel floor and tuning
+
+    Runs in a pool worker. `lead` extra frames before the segment are
+    included so the onset difference at its first frame can be taken; they
+    are dropped from every sum.
+    """
+    groups = set(groups)
+    y = _pad(piece, left, right, 'constant')
+    S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False))
+    stats = {}
+
+    if groups & {'mfcc', 'speech_rate'}:
+        mel = librosa.feature.melspectrogram(S=S ** 2, sr=sr)
+        log_mel = np.maximum(librosa.power_to_db(mel, top_db=None), mel_db_floor)
+        if 'mfcc' in groups:
+            mfccs = librosa.feature.mfcc(S=log_mel[:, lead:], sr=sr, n_mfcc=13)
+            stats['mfcc_sums'] = mfccs.sum(axis=1, dtype=np.float64)
+        if 'speech_rate' in groups:
+            # onset_strength with lag=1, max_size=1, mean over mel bands
+            stats['onset_diffs'] = np.mean(np.maximum(0.0, log_mel[:, 1:] - log_mel[:, :-1]), axis=0)
+
+    if 'chroma' in groups:
+        chroma = librosa.feature.chroma_stft(S=S ** 2, sr=sr, tuning=tuning)[:, lead:]
+        stats['chroma'] = (float(np.sum(chroma)), int(chroma.size))
+
+    return stats
+
+
+def _nonsilent_duration(rms, n_samples, sr):
+    """Voiced seconds, as librosa.effects.split(top_db=20) would find them"""
+    db = librosa.amplitude_to_db(rms, ref=np.max, top_db=None)
+    non_silent = db > -SILENCE_TOP_DB
+
+    edges = [np.flatnonzero(np.diff(non_silent.astype(int))) + 1]
+    if non_silent[0]:
+        edges.insert(0, np.array([0]))
+    if non_silent[-1]:
+        edges.append(np.array([len(non_silent)]))
+    edges = np.minimum(librosa.frames_to_samples(np.concatenate(edges), hop_length=HOP_LENGTH), n_samples)
+    intervals = edges.reshape((-1, 2))
+    return sum(end - start for start, end in intervals) / sr
+
+
+def _run(executor, function, jobs):
+    if executor is None:
+        return [function(*job) for job in jobs]
+    futures = [executor.submit(function, *job) for job in jobs]
+    return [future.result() for future in futures]
+
+
+def extract_segmented(y, sr, groups, segment_seconds=30.0, workers=None, executor=None):
+    """
+    Extract feature groups from a long signal, segment by segment in parallel
+
+    Args:
+        y: Mono float32 signal
+        sr: Sample rate of y
+        groups: Feature group names to compute (see audio_processor.FEATURE_GROUPS)
+        segment_seconds: Target segment length
+        workers: Pool size (defaults to the CPU count); 1 runs inline
+        executor: Optional concurrent.futures executor to use instead of
+            the shared process pool
+
+    Returns:
+        dict: Extracted features, including 'duration'
+    """
+    groups = list(groups)
+    duration = librosa.get_duration(y=y, sr=sr)
+    n_frames = frame_count(len(y))
+    bounds = segment_bounds(n_frames, max(1, int(segment_seconds * sr) // HOP_LENGTH))
+
+    if executor is None:
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(bounds) > 1:
+            executor = get_executor(workers)
+
+    first = _run(executor, _first_pass, [
+        (*frame_slice(y, start, stop), sr, groups) for start, stop in bounds
+    ])
+
+    features = {'duration': duration}
+
+    if 'loudness' in groups or 'pauses' in groups:
+        rms = np.concatenate([stats['rms'] for stats in first])
+    if 'loudness' in groups:
+        features['loud_mean'] = float(np.mean(rms))
+        features['loud_std'] = float(np.std(rms))
+
+    if 'pitch' in groups:
+        total, total_sq, count = (sum(values) for values in zip(*(stats['pitch'] for stats in first)))
+        mean = total / count if count else 0.0
+        features['pitch_mean'] = float(mean)
+        features['pitch_std'] = float(math.sqrt(max(total_sq / count - mean ** 2, 0.0))) if count else 0.0
+
+    if 'pauses' in groups:
+        non_silent_duration = _nonsilent_duration(rms, len(y), sr)
+        features['pause_ratio'] = float((duration - non_silent_duration) / duration) if duration > 0 else 0.0
+
+    if 'spectral_shape' in groups:
+        for name in ('spectral_centroid', 'spectral_rolloff', 'spectral_bandwidth'):
+            features[name] = sum(stats['spectral_sums'][name] for stats in first) / n_frames
+
+    if 'zero_crossings' in groups:
+        features['zcr_mean'] = sum(stats['zcr_sum'] for stats in first) / n_frames
+
+    if 'spectral_contrast' in groups:
+        peak_db = np.concatenate([stats['contrast_db'][0] for stats in first], axis=1)
+        valley_db = np.concatenate([stats['contrast_db'][1] for stats in first], axis=1)
+        contrast = (
+            np.maximum(peak_db, peak_db.max() - TOP_DB)
+            - np.maximum(valley_db, valley_db.max() - TOP_DB)
+        )
+        features['spectral_flux'] = float(np.mean(contrast))
+
+    second_groups = [group for group in groups if group in SECOND_PASS_GROUPS]
+    if not second_groups:
+        return features
+
+    mel_db_floor = None
+    if 'mfcc' in groups or 'speech_rate' in groups:
+        mel_db_floor = max(stats['mel_db_max'] for stats in first) - TOP_DB
+
+    tuning = None
+    if 'chroma' in groups:
+        candidates = np.concatenate([stats['tuning'][0] for stats in first])
+        magnitudes = np.concatenate([stats['tuning'][1] for stats in first])
+        threshold = np.median(magnitudes) if magnitudes.size else 0.0
+        tuning = librosa.pitch_tuning(candidates[magnitudes >= threshold], bins_per_octave=12)
+
+    jobs = []
+    for start, stop in bounds:
+        lead = 1 if start > 0 else 0
+        jobs.append((*frame_slice(y, start - lead, stop), sr, second_groups, lead, mel_db_floor, tuning))
+    second = _run(executor, _second_pass, jobs)
+
+    if 'mfcc' in groups:
+        mfcc_means = sum(stats['mfcc_sums'] for stats in second) / n_frames
+        features.update({f'mfcc_{i+1}': float(mfcc_means[i]) for i in range(13)})
+
+    if 'speech_rate' in groups:
+        # onset_strength pads lag + n_fft // (2 * hop) zeros and trims to the frame count
+        diffs = np.concatenate([stats['onset_diffs'] for stats in second])
+        onset_env = np.pad(diffs, (1 + N_FFT // (2 * HOP_LENGTH), 0))[:n_frames]
+        onset_frames = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr)
+        features['syllables_per_sec'] = float(len(onset_frames) / duration) if duration > 0 else 0.0
+
+    if 'chroma' in groups:
+        total, count = (sum(values) for values in zip(*(stats['chroma'] for stats in second)))
+        features['chroma_mean'] = total / count
+
+    return features
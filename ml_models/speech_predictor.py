@@ -15,6 +15,11 @@ import joblib
 import os
 from pathlib import Path
 
+try:
+    from .compact_forest import CompactForest
+except ImportError:
+    from compact_forest import CompactForest
+
 
 class SpeechPredictor:
     """
@@ -44,18 +49,30 @@ class SpeechPredictor:
         'overall'
     ]
 
-    def __init__(self, model_type='random_forest'):
+    # Trainable types; compact_forest.py turns a trained random_forest
+    # into a serving-only 'compact_forest'
+    MODEL_TYPES = ['random_forest', 'gradient_boosting', 'ridge']
+
+    def __init__(self, model_type='random_forest', feature_columns=None):
         """
         Initialize the speech predictor
 
         Args:
-            model_type: 'random_forest' or 'gradient_boosting'
+            model_type: One of MODEL_TYPES
+            feature_columns: Optional subset of FEATURE_COLUMNS to train on
+                (e.g. a fast tier that skips expensive spectral features)
         """
         self.model_type = model_type
+        self.feature_columns = list(feature_columns or self.FEATURE_COLUMNS)
+        unknown = [c for c in self.feature_columns if c not in self.FEATURE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown feature columns: {unknown}")
         self.model = None
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
+        self.fill_values = None
         self.is_trained = False
+        self._explainer = None
 
     def _create_model(self):
         """Create the multi-output regression model"""
@@ -89,12 +106,13 @@ class SpeechPredictor:
 
         return MultiOutputRegressor(base_model)
 
-    def preprocess_data(self, df):
+    def preprocess_data(self, df, fit=False):
         """
         Preprocess the dataset
 
         Args:
             df: pandas DataFrame with raw data
+            fit: Fit the category encoder and fill values (training only)
 
         Returns:
             X: Feature matrix
@@ -104,7 +122,12 @@ class SpeechPredictor:
 
         # Encode category (Informative, Motivational, Persuasive)
         if 'category' in df.columns:
-            df['category_encoded'] = self.label_encoder.fit_transform(df['category'])
+            if fit:
+                df['category_encoded'] = self.label_encoder.fit_transform(df['category'])
+            else:
+                df['category_encoded'] = self._encode_category(df['category'])
+        else:
+            df['category_encoded'] = 0
 
         # Handle missing words_per_minute (calculate from syllables_per_sec if needed)
         if 'words_per_minute' not in df.columns and 'syllables_per_sec' in df.columns:
@@ -112,10 +135,16 @@ class SpeechPredictor:
             df['words_per_minute'] = df['syllables_per_sec'] * 60 / 1.5
 
         # Extract features
-        X = df[self.FEATURE_COLUMNS].copy()
+        X = df[self.feature_columns].copy()
 
-        # Fill any missing values with median
-        X = X.fillna(X.median())
+        # Fill any missing values with the training median
+        if fit or self.fill_values is None:
+            fill_values = X.median()
+            if fit:
+                self.fill_values = fill_values
+        else:
+            fill_values = self.fill_values
+        X = X.fillna(fill_values)
 
         # Extract targets if they exist
         y = None
@@ -124,6 +153,25 @@ class SpeechPredictor:
 
         return X, y
 
+    def _encode_category(self, categories):
+        """
+        Encode categories with the fitted encoder
+
+        Matching is case-insensitive (stored analyses use lowercase
+        choices); unknown or missing categories encode as 0.
+        """
+        if not hasattr(self.label_encoder, 'classes_'):
+            return np.zeros(len(categories), dtype=int)
+
+        lookup = {
+            str(label).lower(): index
+            for index, label in enumerate(self.label_encoder.classes_)
+        }
+        return np.array([
+            lookup.get(str(category).lower(), 0) if isinstance(category, str) else 0
+            for category in categories
+        ], dtype=int)
+
     def train(self, df, test_size=0.2, random_state=42):
         """
         Train the model on the dataset
@@ -137,7 +185,7 @@ class SpeechPredictor:
             dict: Training metrics
         """
         print("Preprocessing data...")
-        X, y = self.preprocess_data(df)
+        X, y = self.preprocess_data(df, fit=True)
 
         if y is None:
             raise ValueError("Dataset must contain target columns for training")
@@ -163,6 +211,54 @@ class SpeechPredictor:
 
         # Evaluate
         print("Evaluating model...")
+        return self._split_metrics(X_train_scaled, X_test_scaled, y_train, y_test)
+
+    def fit(self, df):
+        """
+        Fit preprocessors and model on every row of df (no held-out split)
+
+        Args:
+            df: pandas DataFrame with training data
+
+        Returns:
+            self
+        """
+        X, y = self.preprocess_data(df, fit=True)
+        if y is None:
+            raise ValueError("Dataset must contain target columns for training")
+
+        self.scaler = StandardScaler()
+        X_scaled = self.scaler.fit_transform(X)
+        self.model = self._create_model()
+        self.model.fit(X_scaled, y)
+        self.is_trained = True
+        return self
+
+    def cross_validate(self, df, folds):
+        """
+        Cross-validated MAE for this configuration (model type + feature columns)
+
+        Each fold is fitted on a fresh predictor, so self is left untouched.
+
+        Args:
+            df: pandas DataFrame with training data
+            folds: Iterable of (train_index, test_index) positional index pairs,
+                e.g. list(KFold(5, shuffle=True, random_state=42).split(df))
+
+        Returns:
+            dict: Mean 'mae' and per-target '<target>_mae' across folds
+        """
+        fold_metrics = []
+        for train_index, test_index in folds:
+            fold = SpeechPredictor(model_type=self.model_type, feature_columns=self.feature_columns)
+            fold.fit(df.iloc[train_index])
+            fold_metrics.append(fold.evaluate(df.iloc[test_index]))
+
+        keys = ['mae'] + [f'{target}_mae' for target in self.TARGET_COLUMNS]
+        return {key: float(np.mean([m[key] for m in fold_metrics])) for key in keys}
+
+    def _split_metrics(self, X_train_scaled, X_test_scaled, y_train, y_test):
+        """Train/test metrics of the fitted model on an already scaled split"""
         y_pred_train = self.model.predict(X_train_scaled)
         y_pred_test = self.model.predict(X_test_scaled)
 
@@ -186,6 +282,111 @@ class SpeechPredictor:
 
         return metrics
 
+    def train_incremental(self, new_df, n_new_trees=50, max_trees=200, replay_df=None,
+                          max_replay_rows=500, random_state=42):
+        """
+        Grow the trained forests with new trees instead of refitting them
+
+        The existing trees are kept and n_new_trees are fitted per target
+        with warm_start on the newly labeled rows plus a random sample of at
+        most max_replay_rows older rows, so the cost of a growth step scales
+        with the new data rather than the whole dataset, while the replayed
+        rows keep the new trees from fitting only the latest labels. When a
+        forest grows past max_trees its oldest trees are retired, so the
+        ensemble stays bounded and gradually turns over to the newer data.
+        The fitted scaler and category encoder are reused unchanged, since
+        the kept trees split on features scaled with them.
+
+        Args:
+            new_df: pandas DataFrame of rows labeled since the last growth step
+            n_new_trees: Trees added to each target's forest
+            max_trees: Upper bound on trees per forest after retirement
+            replay_df: Optional pandas DataFrame of rows the forests already saw
+            max_replay_rows: Most replay_df rows sampled into the fit
+            random_state: random seed
+
+        Returns:
+            dict: Rows fitted, training MAE on them and tree counts
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before incremental training")
+        if self.model_type != 'random_forest':
+            raise ValueError("Incremental training only available for Random Forest")
+        if n_new_trees < 1 or max_trees < n_new_trees:
+            raise ValueError("Need n_new_trees >= 1 and max_trees >= n_new_trees")
+        if len(new_df) == 0:
+            raise ValueError("No new rows to grow the forests on")
+
+        fit_df = new_df
+        replay_rows = 0
+        if replay_df is not None and len(replay_df) and max_replay_rows > 0:
+            replay = replay_df.sample(n=min(max_replay_rows, len(replay_df)), random_state=random_state)
+            replay_rows = len(replay)
+            fit_df = pd.concat([new_df, replay], ignore_index=True)
+
+        X, y = self.preprocess_data(fit_df)
+        if y is None:
+            raise ValueError("Dataset must contain target columns for training")
+        X_scaled = self.scaler.transform(X)
+
+        print(f"Growing {n_new_trees} trees per target on {len(new_df)} new + {replay_rows} replayed samples...")
+        retired = 0
+        for i, forest in enumerate(self.model.estimators_):
+            # A fresh seed per growth step keeps new bootstraps distinct from old ones
+            forest.set_params(
+                warm_start=True,
+                n_estimators=len(forest.estimators_) + n_new_trees,
+                random_state=random_state + X.shape[0] + len(forest.estimators_)
+            )
+            forest.fit(X_scaled, y.iloc[:, i])
+
+            excess = len(forest.estimators_) - max_trees
+            if excess > 0:
+                forest.estimators_ = forest.estimators_[excess:]
+                retired += excess
+            forest.set_params(warm_start=False, n_estimators=len(forest.estimators_))
+        self._explainer = None
+
+        y_pred = np.clip(np.round(self.model.predict(X_scaled)), 1, 5)
+        return {
+            'new_rows': len(new_df),
+            'replay_rows': replay_rows,
+            'train_mae': mean_absolute_error(y, y_pred),
+            'trees_per_target': len(self.model.estimators_[0].estimators_),
+            'trees_added': n_new_trees * len(self.model.estimators_),
+            'trees_retired': retired,
+        }
+
+    def evaluate(self, df):
+        """
+        Score the trained model against labeled data
+
+        Args:
+            df: pandas DataFrame with feature and target columns
+
+        Returns:
+            dict: MAE, RMSE and R² overall and per target
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before evaluation")
+
+        X, y = self.preprocess_data(df)
+        if y is None:
+            raise ValueError("Dataset must contain target columns for evaluation")
+
+        y_pred = np.clip(np.round(self.model.predict(self.scaler.transform(X))), 1, 5)
+
+        metrics = {
+            'mae': mean_absolute_error(y, y_pred),
+            'rmse': np.sqrt(mean_squared_error(y, y_pred)),
+            'r2': r2_score(y, y_pred),
+        }
+        for i, target in enumerate(self.TARGET_COLUMNS):
+            metrics[f'{target}_mae'] = mean_absolute_error(y.iloc[:, i], y_pred[:, i])
+            metrics[f'{target}_r2'] = r2_score(y.iloc[:, i], y_pred[:, i])
+
+        return metrics
+
     def predict(self, features_dict):
         """
         Predict scores for new speech data
@@ -196,11 +397,119 @@ class SpeechPredictor:
         Returns:
             dict: Predicted scores for each target
         """
+        predictions = self.predict_batch([features_dict])[0]
+
+        # Return as dictionary
+        result = {
+            target: int(pred)
+            for target, pred in zip(self.TARGET_COLUMNS, predictions)
+        }
+
+        return result
+
+    @property
+    def can_explain(self):
+        """Whether explain/explain_batch are available for this model"""
+        return self.is_trained and self.model_type in ('random_forest', 'compact_forest')
+
+    def explain(self, features_dict, top_n=None):
+        """
+        Predict one speech with uncertainty and feature contributions
+
+        Args:
+            features_dict: Dictionary with feature names and values
+            top_n: Keep only the top_n features by absolute contribution
+
+        Returns:
+            dict: 'scores' (as predict), 'uncertainty' per target ('mean'
+                unrounded score, 'std' across trees, 'low'/'high' 10th/90th
+                percentile of the trees) and 'contributions' per target
+                ('bias' plus score change per feature, largest first)
+        """
+        result = self.explain_batch([features_dict])
+
+        uncertainty, contributions = {}, {}
+        for i, target in enumerate(self.TARGET_COLUMNS):
+            uncertainty[target] = {
+                name: round(float(result[name][0, i]), 4) for name in ('mean', 'std', 'low', 'high')
+            }
+            ranked = sorted(
+                zip(self.feature_columns, result['contributions'][0, i]),
+                key=lambda item: -abs(item[1])
+            )
+            contributions[target] = {
+                'bias': round(float(result['bias'][i]), 4),
+                'features': {name: round(float(value), 4) for name, value in ranked[:top_n]},
+            }
+
+        return {
+            'scores': {
+                target: int(score) for target, score in zip(self.TARGET_COLUMNS, result['scores'][0])
+            },
+            'uncertainty': uncertainty,
+            'contributions': contributions,
+        }
+
+    def explain_batch(self, data):
+        """
+        Scores, spread across trees and path-based contributions for many speeches
+
+        Everything comes from one traversal of each forest, so this costs
+        little more than predict_batch and the scores match it.
+
+        Args:
+            data: pandas DataFrame or list of feature dictionaries
+
+        Returns:
+            dict: 'scores' (n_rows, n_targets) integers; 'mean', 'std',
+                'low', 'high' (n_rows, n_targets); 'bias' (n_targets,);
+                'contributions' (n_rows, n_targets, n_features) in
+                feature_columns order, where bias + contributions = mean
+        """
+        if not self.can_explain:
+            raise ValueError("Explanations are only available for trained forest models")
+
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+        X, _ = self.preprocess_data(df)
+        X_scaled = self.scaler.transform(X)
+
+        if self.model_type == 'compact_forest':
+            explainer = self.model
+        else:
+            # Flat float64 copy of the forests: same predictions, one vectorized walk
+            if self._explainer is None or self._explainer[0] is not self.model:
+                self._explainer = (self.model, CompactForest(self.model.estimators_, value_dtype=np.float64))
+            explainer = self._explainer[1]
+        tree_predictions, contributions, bias = explainer.explain(X_scaled)
+
+        mean = np.column_stack([p.mean(axis=1) for p in tree_predictions])
+        low, high = np.stack([np.percentile(p, [10, 90], axis=1) for p in tree_predictions], axis=-1)
+        return {
+            'scores': np.clip(np.round(mean), 1, 5).astype(int),
+            'mean': mean,
+            'std': np.column_stack([p.std(axis=1) for p in tree_predictions]),
+            'low': low,
+            'high': high,
+            'bias': bias,
+            'contributions': contributions,
+        }
+
+    def predict_batch(self, data):
+        """
+        Predict scores for many speeches in one model call
+
+        Args:
+            data: pandas DataFrame or list of feature dictionaries
+
+        Returns:
+            np.ndarray: (n_rows, n_targets) integer scores in TARGET_COLUMNS order
+        """
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
 
-        # Convert to DataFrame
-        df = pd.DataFrame([features_dict])
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+        if df.empty:
+            return np.empty((0, len(self.TARGET_COLUMNS)), dtype=int)
 
         # Preprocess
         X, _ = self.preprocess_data(df)
@@ -209,18 +518,10 @@ class SpeechPredictor:
         X_scaled = self.scaler.transform(X)
 
         # Predict
-        predictions = self.model.predict(X_scaled)[0]
+        predictions = self.model.predict(X_scaled)
 
         # Clip to valid range and round
-        predictions = np.clip(np.round(predictions), 1, 5).astype(int)
-
-        # Return as dictionary
-        result = {
-            target: int(pred)
-            for target, pred in zip(self.TARGET_COLUMNS, predictions)
-        }
-
-        return result
+        return np.clip(np.round(predictions), 1, 5).astype(int)
 
     def save(self, save_dir):
         """Save the trained model and preprocessors"""
@@ -232,7 +533,9 @@ class SpeechPredictor:
         joblib.dump(self.label_encoder, save_dir / 'label_encoder.joblib')
         joblib.dump({
             'model_type': self.model_type,
-            'is_trained': self.is_trained
+            'is_trained': self.is_trained,
+            'fill_values': self.fill_values,
+            'feature_columns': self.feature_columns
         }, save_dir / 'metadata.joblib')
 
         print(f"Model saved to {save_dir}")
@@ -248,6 +551,8 @@ class SpeechPredictor:
         metadata = joblib.load(load_dir / 'metadata.joblib')
         self.model_type = metadata['model_type']
         self.is_trained = metadata['is_trained']
+        self.fill_values = metadata.get('fill_values')
+        self.feature_columns = list(metadata.get('feature_columns', self.FEATURE_COLUMNS))
 
         print(f"Model loaded from {load_dir}")
 
@@ -272,7 +577,7 @@ class SpeechPredictor:
         avg_importance = np.mean(importances, axis=0)
 
         importance_df = pd.DataFrame({
-            'feature': self.FEATURE_COLUMNS,
+            'feature': self.feature_columns,
             'importance': avg_importance
         }).sort_values('importance', ascending=False)
 
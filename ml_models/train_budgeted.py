@@ -0,0 +1,212 @@
+"""
+Script to train a latency-budgeted model
+
+Measures what each feature group costs to extract on sample recordings,
+then drops the groups that buy the least accuracy per millisecond until the
+extraction cost fits the budget. Writes the model, the matching extractor
+config and a report of accuracy lost for time saved.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from sklearn.model_selection import KFold
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_models.audio_processor import (
+    AudioFeatureExtractor,
+    FEATURE_GROUPS,
+    profile_feature_costs,
+    resolve_intermediates,
+)
+from ml_models.dataset_loader import load_dataset
+from ml_models.model_registry import publish_bundle
+from ml_models.speech_predictor import SpeechPredictor
+
+
+def measure_feature_costs(audio_paths, extractor=None):
+    """
+    Extraction cost of every step, in milliseconds per minute of audio
+
+    Args:
+        audio_paths: Sample recordings to time on
+        extractor: Optional AudioFeatureExtractor
+
+    Returns:
+        dict: Intermediate / feature group name -> ms per audio minute
+    """
+    extractor = extractor or AudioFeatureExtractor()
+    signals = [extractor.decode(path) for path in audio_paths]
+    if not signals:
+        raise ValueError("Need at least one sample recording to measure costs")
+
+    # Warm up librosa/numba so first-call compilation isn't billed to a feature
+    extractor.extract_features_from_signal(signals[0][:extractor.sr])
+
+    minutes = sum(len(y) for y in signals) / extractor.sr / 60 / len(signals)
+    costs = profile_feature_costs(extractor, signals)
+    return {name: seconds * 1000 / minutes for name, seconds in costs.items()}
+
+
+def subset_cost(groups, costs):
+    """Estimated cost of extracting the given feature groups (shared steps counted once)"""
+    return sum(costs[group] for group in groups) + sum(
+        costs[name] for name in resolve_intermediates(groups)
+    )
+
+
+def group_columns(groups):
+    """Model feature columns produced by the given feature groups"""
+    produced = {feature for group in groups for feature in FEATURE_GROUPS[group][0]}
+    if 'speech_rate' in groups:
+        produced.add('words_per_minute')  # derived from syllables_per_sec
+    produced.add('category_encoded')  # from the request, costs nothing
+    return [column for column in SpeechPredictor.FEATURE_COLUMNS if column in produced]
+
+
+def search_feature_groups(df, costs, budget, model_type='random_forest', n_splits=5, random_state=42):
+    """
+    Greedy backward elimination of feature groups under a cost budget
+
+    At each step the group whose removal costs the least CV MAE per
+    millisecond saved is dropped, until the estimated cost fits the budget.
+
+    Returns:
+        list: One dict per evaluated configuration, the last being the choice
+    """
+    folds = list(KFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(df))
+
+    def score(groups):
+        predictor = SpeechPredictor(model_type=model_type, feature_columns=group_columns(groups))
+        return predictor.cross_validate(df, folds)['mae']
+
+    groups = list(FEATURE_GROUPS)
+    current = {'groups': groups, 'cost_ms': subset_cost(groups, costs), 'cv_mae': score(groups)}
+    history = [current]
+
+    while current['cost_ms'] > budget:
+        best = None
+        for group in current['groups']:
+            candidate = [g for g in current['groups'] if g != group]
+            if not candidate:
+                continue
+            saving = current['cost_ms'] - subset_cost(candidate, costs)
+            if saving <= 0:
+                continue
+            mae = score(candidate)
+            ratio = (mae - current['cv_mae']) / saving
+            if best is None or ratio < best[0]:
+                best = (ratio, {
+                    'groups': candidate,
+                    'cost_ms': current['cost_ms'] - saving,
+                    'cv_mae': mae,
+                    'dropped': group,
+                })
+        if best is None:
+            break
+        current = best[1]
+        history.append(current)
+        print(f"  dropped {current['dropped']:18s} cost {current['cost_ms']:8.1f} ms/min"
+              f"  CV MAE {current['cv_mae']:.4f}")
+
+    return history
+
+
+def train_budgeted(df, audio_paths, budget, output_dir, model_type='random_forest', publish=False):
+    """
+    Train a model whose features fit an extraction budget
+
+    Args:
+        df: Labeled training data
+        audio_paths: Sample recordings for cost measurement
+        budget: Extraction budget in ms per minute of audio
+        output_dir: Where the model, extractor config and report are written
+        publish: Publish as a versioned bundle in output_dir instead of saving directly
+
+    Returns:
+        dict: Report of cost saved and accuracy lost
+    """
+    print("Measuring feature extraction costs...")
+    costs = measure_feature_costs(audio_paths)
+    for name, ms in sorted(costs.items(), key=lambda item: -item[1]):
+        print(f"  {name:18s} {ms:8.1f} ms/min")
+
+    print(f"\nSearching feature groups under {budget:.1f} ms/min...")
+    history = search_feature_groups(df, costs, budget, model_type=model_type)
+    full, chosen = history[0], history[-1]
+
+    feature_columns = group_columns(chosen['groups'])
+    predictor = SpeechPredictor(model_type=model_type, feature_columns=feature_columns)
+    metrics = predictor.train(df, test_size=0.2, random_state=42)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report = {
+        'budget_ms_per_min': budget,
+        'within_budget': chosen['cost_ms'] <= budget,
+        'feature_costs_ms_per_min': costs,
+        'full': {'cost_ms_per_min': full['cost_ms'], 'cv_mae': full['cv_mae']},
+        'chosen': {
+            'cost_ms_per_min': chosen['cost_ms'],
+            'cv_mae': chosen['cv_mae'],
+            'groups': chosen['groups'],
+            'dropped': [g for g in FEATURE_GROUPS if g not in chosen['groups']],
+        },
+        'time_saved_ms_per_min': full['cost_ms'] - chosen['cost_ms'],
+        'mae_increase': chosen['cv_mae'] - full['cv_mae'],
+        'search': history,
+        'training_metrics': metrics,
+    }
+    extractor_config = {
+        'feature_groups': chosen['groups'],
+        'intermediates': resolve_intermediates(chosen['groups']),
+        'feature_columns': feature_columns,
+        'estimated_cost_ms_per_min': chosen['cost_ms'],
+    }
+
+    if publish:
+        version = publish_bundle(predictor, output_dir, metrics=metrics)
+        bundle_dir = output_dir / 'versions' / version
+    else:
+        predictor.save(output_dir)
+        bundle_dir = output_dir
+
+    with open(bundle_dir / 'extractor_config.json', 'w') as f:
+        json.dump(extractor_config, f, indent=2)
+    with open(bundle_dir / 'budget_report.json', 'w') as f:
+        json.dump(report, f, indent=2)
+
+    return report
+
+
+if __name__ == '__main__':
+    BASE_DIR = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', default=str(BASE_DIR / 'Speeches_Dataset_Clean.csv'))
+    parser.add_argument('--audio', nargs='+', required=True, help='Sample recordings to time extraction on')
+    parser.add_argument('--budget', type=float, required=True, help='Extraction budget in ms per minute of audio')
+    parser.add_argument('--output', default=str(BASE_DIR / 'ml_models' / 'trained_models_fast'))
+    parser.add_argument('--model-type', default='random_forest')
+    parser.add_argument('--publish', action='store_true')
+    args = parser.parse_args()
+
+    df = load_dataset(args.dataset)
+    report = train_budgeted(
+        df, args.audio, args.budget, args.output,
+        model_type=args.model_type, publish=args.publish
+    )
+
+    print("\n" + "=" * 60)
+    print("LATENCY-BUDGETED MODEL")
+    print("=" * 60)
+    print(f"  Full feature set:  {report['full']['cost_ms_per_min']:8.1f} ms/min  CV MAE {report['full']['cv_mae']:.4f}")
+    print(f"  Chosen subset:     {report['chosen']['cost_ms_per_min']:8.1f} ms/min  CV MAE {report['chosen']['cv_mae']:.4f}")
+    print(f"  Dropped groups:    {', '.join(report['chosen']['dropped']) or 'none'}")
+    print(f"  Time saved:        {report['time_saved_ms_per_min']:.1f} ms per audio minute")
+    print(f"  MAE increase:      {report['mae_increase']:+.4f}")
+    if not report['within_budget']:
+        print("  WARNING: no feature subset fits the budget")
@@ -2,7 +2,6 @@
 Script to train the speech analysis model
 """
 
-import pandas as pd
 import sys
 from pathlib import Path
 import json
@@ -10,25 +9,29 @@ import json
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from ml_models.dataset_loader import load_dataset
+from ml_models.model_registry import publish_bundle
 from ml_models.speech_predictor import SpeechPredictor
 
 
-def train_model(dataset_path, model_dir, model_type='random_forest'):
+def train_model(dataset_path, model_dir, model_type='random_forest', publish=False):
     """
     Train the speech analysis model
 
     Args:
-        dataset_path: Path to the CSV dataset
+        dataset_path: Path to the CSV dataset (see dataset_loader.load_dataset)
         model_dir: Directory to save the trained model
         model_type: 'random_forest' or 'gradient_boosting'
+        publish: Publish as a new versioned bundle that running servers
+            switch to, instead of writing the files directly into model_dir
     """
     print("=" * 60)
     print("STAGE READY - Speech Coach Model Training")
     print("=" * 60)
 
-    # Load dataset
+    # Load dataset (validated once, then read from the columnar cache)
     print(f"\nLoading dataset from: {dataset_path}")
-    df = pd.read_csv(dataset_path)
+    df = load_dataset(dataset_path)
     print(f"Dataset shape: {df.shape}")
     print(f"Columns: {list(df.columns)}\n")
 
@@ -78,14 +81,19 @@ def train_model(dataset_path, model_dir, model_type='random_forest'):
         print(importance_df.head(10).to_string(index=False))
 
     # Save model
-    print(f"\n\nSaving model to: {model_dir}")
-    predictor.save(model_dir)
-
-    # Save metrics
-    metrics_path = Path(model_dir) / 'training_metrics.json'
-    with open(metrics_path, 'w') as f:
-        json.dump(metrics, f, indent=2)
-    print(f"Metrics saved to: {metrics_path}")
+    if publish:
+        print(f"\n\nPublishing model to: {model_dir}")
+        version = publish_bundle(predictor, model_dir, metrics=metrics)
+        print(f"Published model version: {version}")
+    else:
+        print(f"\n\nSaving model to: {model_dir}")
+        predictor.save(model_dir)
+
+        # Save metrics
+        metrics_path = Path(model_dir) / 'training_metrics.json'
+        with open(metrics_path, 'w') as f:
+            json.dump(metrics, f, indent=2)
+        print(f"Metrics saved to: {metrics_path}")
 
     print("\n" + "=" * 60)
     print("TRAINING COMPLETE!")
@@ -112,5 +120,6 @@ if __name__ == '__main__':
     train_model(
         dataset_path=str(DATASET_PATH),
         model_dir=str(MODEL_DIR),
-        model_type='random_forest'  # Best performer on this dataset
+        model_type='random_forest',  # Best performer on this dataset
+        publish=True  # Running servers switch over without a restart
     )
@@ -0,0 +1,134 @@
+"""
+Script to validate voiced-only feature extraction against the current model
+
+Extracts every recording twice (whole signal vs. voiced segments only),
+predicts both with the served model and reports extraction time, feature
+drift, agreement between the two sets of scores and, when expert labels
+are available, MAE against the labels for each mode.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_models.audio_processor import AudioFeatureExtractor
+from ml_models.model_registry import resolve_model_dir
+from ml_models.speech_predictor import SpeechPredictor
+
+
+def validate_voiced(predictor, audio_paths, labels=None):
+    """
+    Compare full-signal and voiced-only extraction
+
+    Args:
+        predictor: Trained SpeechPredictor
+        audio_paths: Recordings to evaluate
+        labels: Optional DataFrame indexed by file name with 'category' and
+            the target columns
+
+    Returns:
+        dict: Timing, drift, agreement and (if labeled) MAE report
+    """
+    full_extractor = AudioFeatureExtractor()
+    voiced_extractor = AudioFeatureExtractor(voiced_only=True)
+    columns = predictor.feature_columns
+
+    rows = {'full': [], 'voiced': []}
+    seconds = {'full': 0.0, 'voiced': 0.0}
+    pause_ratios = []
+    for path in audio_paths:
+        path = Path(path)
+        y = full_extractor.decode(path)
+        category = None
+        if labels is not None and path.name in labels.index:
+            category = labels.loc[path.name, 'category']
+
+        for mode, extractor in (('full', full_extractor), ('voiced', voiced_extractor)):
+            started = time.perf_counter()
+            features = extractor.extract_features_from_signal(y, features=columns)
+            seconds[mode] += time.perf_counter() - started
+            features['file'] = path.name
+            if category is not None:
+                features['category'] = category
+            rows[mode].append(features)
+        pause_ratios.append(rows['full'][-1].get('pause_ratio', np.nan))
+
+    full_df = pd.DataFrame(rows['full'])
+    voiced_df = pd.DataFrame(rows['voiced'])
+    full_scores = predictor.predict_batch(full_df)
+    voiced_scores = predictor.predict_batch(voiced_df)
+
+    drift = {}
+    for column in columns:
+        if column in full_df.columns:
+            base = full_df[column].to_numpy(dtype=float)
+            relative = np.abs(voiced_df[column].to_numpy(dtype=float) - base) / (np.abs(base) + 1e-9)
+            drift[column] = float(np.median(relative))
+
+    report = {
+        'recordings': len(full_df),
+        'mean_pause_ratio': float(np.nanmean(pause_ratios)) if pause_ratios else None,
+        'extract_seconds': seconds,
+        'speedup': seconds['full'] / seconds['voiced'] if seconds['voiced'] else None,
+        'score_agreement': float(np.mean(full_scores == voiced_scores)),
+        'mean_score_shift': float(np.mean(np.abs(full_scores - voiced_scores))),
+        'median_feature_drift': drift,
+    }
+
+    if labels is not None:
+        labeled = full_df['file'].isin(labels.index).to_numpy()
+        if labeled.any():
+            truth = labels.loc[full_df['file'][labeled], predictor.TARGET_COLUMNS].to_numpy()
+            report['labeled_recordings'] = int(labeled.sum())
+            report['full_mae'] = float(np.mean(np.abs(full_scores[labeled] - truth)))
+            report['voiced_mae'] = float(np.mean(np.abs(voiced_scores[labeled] - truth)))
+
+    return report
+
+
+if __name__ == '__main__':
+    BASE_DIR = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--audio', nargs='+', required=True, help='Recordings to evaluate')
+    parser.add_argument('--labels', default=None,
+                        help="Optional labeled CSV with a 'file' column matching recording names")
+    parser.add_argument('--model-dir', default=str(BASE_DIR / 'ml_models' / 'trained_models'))
+    parser.add_argument('--output', default=None, help='Optional JSON report path')
+    args = parser.parse_args()
+
+    predictor = SpeechPredictor()
+    predictor.load(resolve_model_dir(args.model_dir))
+
+    labels = None
+    if args.labels:
+        labels = pd.read_csv(args.labels).rename(columns={'pitch__variation': 'pitch_variation'})
+        labels = labels.drop_duplicates('file').set_index('file')
+
+    report = validate_voiced(predictor, args.audio, labels)
+
+    print("\n" + "=" * 60)
+    print("VOICED-ONLY EXTRACTION VALIDATION")
+    print("=" * 60)
+    print(f"  Recordings:        {report['recordings']}")
+    print(f"  Mean pause ratio:  {report['mean_pause_ratio']:.2f}")
+    print(f"  Extraction time:   full {report['extract_seconds']['full']:.2f}s, "
+          f"voiced {report['extract_seconds']['voiced']:.2f}s ({report['speedup']:.2f}x)")
+    print(f"  Score agreement:   {report['score_agreement']:.1%}")
+    if 'full_mae' in report:
+        print(f"  MAE vs labels:     full {report['full_mae']:.4f}, voiced {report['voiced_mae']:.4f}")
+    print("\n  Largest feature drift:")
+    for column, value in sorted(report['median_feature_drift'].items(), key=lambda item: -item[1])[:8]:
+        print(f"    {column:20s} {value:.2%}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.output}")
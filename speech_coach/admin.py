@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SpeechAnalysis, TrainingDataset
+from .models import SpeechAnalysis, TrainingDataset, UserProgressRollup
 
 
 @admin.register(SpeechAnalysis)
@@ -15,3 +15,10 @@ class TrainingDatasetAdmin(admin.ModelAdmin):
     list_display = ['file_name', 'category', 'overall', 'created_at']
     list_filter = ['category', 'overall']
     search_fields = ['file_name']
+
+
+@admin.register(UserProgressRollup)
+class UserProgressRollupAdmin(admin.ModelAdmin):
+    list_display = ['user', 'week_start', 'category', 'metric', 'count', 'total']
+    list_filter = ['metric', 'category', 'week_start']
+    readonly_fields = ['updated_at']
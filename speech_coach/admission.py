@@ -0,0 +1,239 @@
+"""
+Admission control for CPU-heavy endpoints
+Bounds concurrent work per process and per box, queues a bounded number of
+requests and rejects the rest fast so a burst degrades instead of collapsing
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: per-process limits only
+    fcntl = None
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; carries a Retry-After hint"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded wait queue and per-user quotas
+
+    A request first waits (up to queue_timeout, behind at most max_queue
+    others) for one of max_concurrent slots in this process, then for one
+    of box_slots slots shared by every worker on the machine (exclusive
+    file locks in lock_dir). A user may hold at most per_user_limit slots
+    or queue positions at once in this process.
+    """
+
+    def __init__(self, name, max_concurrent, max_queue=0, queue_timeout=10.0,
+                 per_user_limit=None, box_slots=None, lock_dir=None):
+        """
+        Args:
+            name: Lane name (used for the box slot files and in stats)
+            max_concurrent: Requests running at once in this process
+            max_queue: Requests allowed to wait for a slot; more are rejected
+            queue_timeout: Longest a queued request waits before rejection
+            per_user_limit: Requests one user may have running or queued
+            box_slots: Requests running at once across all workers on the box
+            lock_dir: Directory for the box slot lock files (required for box_slots)
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.per_user_limit = per_user_limit
+        self.box_slots = box_slots if box_slots and lock_dir and fcntl is not None else None
+        self.lock_dir = Path(lock_dir) if self.box_slots else None
+        if self.lock_dir is not None:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+        self._condition = threading.Condition()
+        self._running = 0
+        self._waiting = 0
+        self._per_user = {}
+        self._mean_seconds = 1.0  # Moving average of admitted request time
+        self.counters = {
+            'admitted': 0,
+            'rejected_queue_full': 0,
+            'rejected_timeout': 0,
+            'rejected_user_quota': 0,
+        }
+        self.peak_waiting = 0
+
+    def stats(self):
+        """Current queue depth, running count and rejection counters"""
+        with self._condition:
+            return {
+                'lane': self.name,
+                'running': self._running,
+                'waiting': self._waiting,
+                'peak_waiting': self.peak_waiting,
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'box_slots': self.box_slots,
+                'mean_seconds': round(self._mean_seconds, 3),
+                **self.counters,
+            }
+
+    def _retry_after(self):
+        # Time for the work ahead of a new request to drain, at least 1 s
+        backlog = (self._running + self._waiting + 1) / max(1, self.max_concurrent)
+        return max(1, math.ceil(backlog * self._mean_seconds))
+
+    def _reject(self, counter, reason):
+        self.counters[counter] += 1
+        raise AdmissionRejected(reason, self._retry_after())
+
+    @contextmanager
+    def admit(self, user_key=None):
+        """
+        Hold a slot for the duration of the with block
+
+        Raises:
+            AdmissionRejected: queue full, wait timed out or user quota hit
+        """
+        ticket = self.acquire(user_key)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    def acquire(self, user_key=None):
+        """
+        Wait for a slot (see admit); pair every call with release()
+
+        Returns:
+            tuple: Ticket to pass to release()
+
+        Raises:
+            AdmissionRejected: queue full, wait timed out or user quota hit
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        self._enter_process(user_key, deadline)
+        try:
+            box_slot = self._acquire_box_slot(deadline)
+        except BaseException:
+            self._leave_process(user_key)
+            raise
+        with self._condition:
+            self.counters['admitted'] += 1
+        return user_key, box_slot, time.monotonic()
+
+    def release(self, ticket):
+        """Give back the slot held by an acquire() ticket"""
+        user_key, box_slot, started = ticket
+        if box_slot is not None:
+            fcntl.flock(box_slot, fcntl.LOCK_UN)
+            box_slot.close()
+        with self._condition:
+            self._mean_seconds = 0.8 * self._mean_seconds + 0.2 * (time.monotonic() - started)
+        self._leave_process(user_key)
+
+    def _enter_process(self, user_key, deadline):
+        with self._condition:
+            if self.per_user_limit and user_key is not None:
+                if self._per_user.get(user_key, 0) >= self.per_user_limit:
+                    self._reject('rejected_user_quota', 'Too many concurrent requests for this user')
+
+            if self._running >= self.max_concurrent:
+                if self._waiting >= self.max_queue:
+                    self._reject('rejected_queue_full', 'Server busy, queue full')
+
+                self._waiting += 1
+                self.peak_waiting = max(self.peak_waiting, self._waiting)
+                self._track_user(user_key, 1)
+                try:
+                    while self._running >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._track_user(user_key, -1)
+                            self._reject('rejected_timeout', 'Server busy, timed out waiting in queue')
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            else:
+                self._track_user(user_key, 1)
+
+            self._running += 1
+
+    def _leave_process(self, user_key):
+        with self._condition:
+            self._running -= 1
+            self._track_user(user_key, -1)
+            self._condition.notify()
+
+    def _track_user(self, user_key, delta):
+        if not self.per_user_limit or user_key is None:
+            return
+        count = self._per_user.get(user_key, 0) + delta
+        if count > 0:
+            self._per_user[user_key] = count
+        else:
+            self._per_user.pop(user_key, None)
+
+    def _acquire_box_slot(self, deadline):
+        """Lock one of the box-wide slot files, polling until the deadline"""
+        if self.box_slots is None:
+            return None
+
+        while True:
+            for index in range(self.box_slots):
+                slot = open(self.lock_dir / f'{self.name}.{index}.lock', 'a')
+                try:
+                    fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return slot
+                except OSError:
+                    slot.close()
+            if time.monotonic() >= deadline:
+                with self._condition:
+                    self._reject('rejected_timeout', 'Server busy, no free slot on this machine')
+            time.sleep(0.05)
+
+
+def client_address(request, trusted_proxies=None):
+    """
+    Address of the client that sent a request
+
+    X-Forwarded-For is client-controlled except for the hops appended by our
+    own reverse proxies, so only the entry added by the outermost of
+    trusted_proxies is used; with no trusted proxies it is ignored.
+
+    Args:
+        request: Django request
+        trusted_proxies: Reverse proxies in front of the app that append to
+            X-Forwarded-For (default settings.TRUSTED_PROXY_COUNT)
+    """
+    if trusted_proxies is None:
+        trusted_proxies = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+    if trusted_proxies > 0:
+        hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+        if len(hops) >= trusted_proxies:
+            return hops[-trusted_proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def client_key(request, user=None):
+    """
+    Quota key for a request: the user id, or the client address when anonymous
+
+    Args:
+        request: Django request
+        user: The request's user when already resolved (async views load it
+            with request.auser(), since request.user needs the ORM)
+    """
+    user = request.user if user is None else user
+    if user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'addr:{client_address(request)}'
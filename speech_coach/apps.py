@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SpeechCoachConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'speech_coach'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,228 @@
+"""
+Async analyze and predict endpoints for the ASGI stack
+
+Same request/response contract as SpeechAnalysisViewSet.analyze/predict,
+served as native Django async views. Under ASGI the upload body is
+received by the event loop, so a slow client holds no thread while it
+uploads; once the request is complete, the analysis itself (decoding,
+extraction or the extraction pool, transcription, scoring) is the sync
+endpoint's pipeline run on a small bounded executor, and blocking waits
+(coalescing and admission queues, model loading) run on a separate
+bounded I/O executor, so a single worker can keep hundreds of uploads
+open without exhausting threads.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .admission import AdmissionRejected, client_key
+from .coalescing import request_key
+from .serializers import (
+    AudioFileAnalysisSerializer,
+    SpeechPredictionInputSerializer,
+    SpeechPredictionOutputSerializer
+)
+from .views import (
+    SpeechAnalysisViewSet,
+    analyze_admission,
+    analyze_flight,
+    predict_admission,
+    prediction_batcher
+)
+
+
+# Admitted analyses and unbatched scoring
+cpu_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_CPU_WORKERS', 2),
+    thread_name_prefix='async-cpu'
+)
+
+# Blocking waits: coalescing and admission queues, model (re)loading
+io_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_IO_WORKERS', 32),
+    thread_name_prefix='async-io'
+)
+
+
+async def _run(executor, function, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+
+async def _client_key(request):
+    """admission.client_key with the user loaded asynchronously"""
+    return client_key(request, user=await request.auser())
+
+
+def _overloaded(rejection):
+    response = JsonResponse(
+        {'error': 'Server busy', 'details': rejection.reason, 'retry_after': rejection.retry_after},
+        status=429
+    )
+    response['Retry-After'] = str(rejection.retry_after)
+    return response
+
+
+def _output(response_data):
+    output_serializer = SpeechPredictionOutputSerializer(data=response_data)
+    if output_serializer.is_valid():
+        return JsonResponse(output_serializer.data)
+    return JsonResponse(response_data)
+
+
+async def _predict(predictor, features):
+    """
+    Score one speech without holding a thread while it waits for its batch
+
+    The batch future is shielded: a disconnecting client cancels only its
+    own wait, never the future the batcher will resolve.
+    """
+    if prediction_batcher is None:
+        return await _run(cpu_executor, predictor.predict, features)
+    return await asyncio.shield(asyncio.wrap_future(prediction_batcher.submit(predictor, features)))
+
+
+def _parse_upload(request):
+    """Parse the multipart form and read the upload (blocking file I/O)"""
+    data = request.POST.dict()
+    data.update(request.FILES.dict())
+    input_serializer = AudioFileAnalysisSerializer(data=data)
+    if not input_serializer.is_valid():
+        return input_serializer, None
+    return input_serializer, input_serializer.validated_data['audio_file'].read()
+
+
+def _analyze_admitted(view, user_key, predictor, audio_bytes, file_extension, options, model_dir):
+    """
+    Blocking: wait for an analyze slot on this I/O thread, then run the
+    sync pipeline (extraction pool included) on the CPU executor
+    """
+    with analyze_admission.admit(user_key):
+        return cpu_executor.submit(
+            view._run_analysis, predictor, audio_bytes, file_extension, options, model_dir
+        ).result()
+
+
+@asynccontextmanager
+async def _admitted(admission, user_key):
+    """
+    Hold an admission slot without blocking the event loop
+
+    The wait runs on the I/O executor. If the request is cancelled while it
+    waits (client disconnect), the executor thread still gets the slot
+    later, so it is released as soon as the thread hands it over.
+    """
+    acquiring = asyncio.get_running_loop().run_in_executor(io_executor, admission.acquire, user_key)
+    try:
+        ticket = await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        def release_orphaned(future):
+            if not future.cancelled() and future.exception() is None:
+                admission.release(future.result())
+        acquiring.add_done_callback(release_orphaned)
+        raise
+    try:
+        yield
+    finally:
+        admission.release(ticket)
+
+
+@csrf_exempt
+@require_POST
+async def analyze(request):
+    """
+    Analyze audio file and predict speech quality scores (async)
+
+    POST /api/speech-analysis/async/analyze/
+    Body: FormData with audio_file and category (optional: tier, explain, timeline,
+          window_seconds, window_step_seconds)
+    Returns: Same response as /api/speech-analysis/analyze/
+    """
+    input_serializer, audio_bytes = await _run(io_executor, _parse_upload, request)
+    if audio_bytes is None:
+        return JsonResponse({'error': 'Invalid input', 'details': input_serializer.errors}, status=400)
+
+    view = await _run(io_executor, SpeechAnalysisViewSet)
+    options = {
+        name: value
+        for name, value in input_serializer.validated_data.items()
+        if name != 'audio_file'
+    }
+
+    predictor, model_version, model_dir = await _run(io_executor, view._select_predictor, options.get('tier'))
+    if predictor is None or not predictor.is_trained:
+        return JsonResponse({'error': 'ML model not loaded. Please train the model first.'}, status=503)
+
+    file_name = input_serializer.validated_data['audio_file'].name
+    file_extension = file_name.split('.')[-1] if '.' in file_name else 'webm'
+    user_key = await _client_key(request)
+    key = request_key(audio_bytes, file_extension=file_extension, model_version=model_version, **options)
+
+    # Same coalescing (in-process and across workers) as the sync endpoint.
+    # The shared computation runs on an executor thread that no request
+    # owns, so a cancelled request neither stops it nor strands duplicates.
+    try:
+        response_data, shared = await _run(
+            io_executor, analyze_flight.do, key,
+            lambda: _analyze_admitted(view, user_key, predictor, audio_bytes, file_extension, options, model_dir)
+        )
+    except AdmissionRejected as e:
+        return _overloaded(e)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return JsonResponse({'error': 'Analysis failed', 'details': str(e)}, status=500)
+
+    if shared:
+        print(f"Coalesced duplicate analyze request {key[:12]}")
+    return _output(response_data)
+
+
+@csrf_exempt
+@require_POST
+async def predict(request):
+    """
+    Predict speech quality scores from audio features (async)
+
+    POST /api/speech-analysis/async/predict/
+    Body: Audio features (JSON)
+    Returns: Same response as /api/speech-analysis/predict/
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid input', 'details': 'Body must be JSON'}, status=400)
+
+    input_serializer = SpeechPredictionInputSerializer(data=data)
+    if not input_serializer.is_valid():
+        return JsonResponse({'error': 'Invalid input', 'details': input_serializer.errors}, status=400)
+
+    view = await _run(io_executor, SpeechAnalysisViewSet)
+    if view.predictor is None or not view.predictor.is_trained:
+        return JsonResponse({'error': 'ML model not loaded. Please train the model first.'}, status=503)
+
+    features = dict(input_serializer.validated_data)
+    explain = features.pop('explain') and view.predictor.can_explain
+    explanation = {}
+    try:
+        async with _admitted(predict_admission, await _client_key(request)):
+            if explain:
+                predictions, explanation = await _run(cpu_executor, view._explain, view.predictor, features)
+            else:
+                predictions = await _predict(view.predictor, features)
+    except AdmissionRejected as e:
+        return _overloaded(e)
+    except Exception as e:
+        return JsonResponse({'error': 'Prediction failed', 'details': str(e)}, status=500)
+
+    return _output({
+        **predictions,
+        **explanation,
+        'feedback': view._generate_feedback(predictions, features),
+        'recommendations': view._generate_recommendations(predictions)
+    })
@@ -0,0 +1,236 @@
+"""
+Content-addressed storage for uploaded recordings
+Identical uploads are stored once, optionally transcoded to low-bitrate
+Opus for archival, and served back with HTTP range support
+"""
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.http import HttpResponse, StreamingHttpResponse
+
+
+AUDIO_CONTENT_TYPES = {
+    'wav': 'audio/wav',
+    'mp3': 'audio/mpeg',
+    'ogg': 'audio/ogg',
+    'oga': 'audio/ogg',
+    'opus': 'audio/ogg',
+    'webm': 'audio/webm',
+    'm4a': 'audio/mp4',
+    'aac': 'audio/aac',
+    'flac': 'audio/flac',
+}
+
+# Stored names look like speeches/ab/<sha256>.<ext>
+CONTENT_ADDRESSED_NAME = re.compile(r'^(?:.*/)?[0-9a-f]{2}/([0-9a-f]{64})\.\w+$')
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def transcode_to_opus(source_path, bitrate='24k', ffmpeg_path=None):
+    """
+    Transcode a recording to mono Ogg/Opus tuned for speech
+
+    Args:
+        source_path: Input file (any ffmpeg-readable format)
+        bitrate: Opus bitrate (24k keeps speech clear at ~180 KB/minute)
+
+    Returns:
+        str: Path of a temporary .ogg file (the caller deletes it)
+
+    Raises:
+        FileNotFoundError: ffmpeg is not installed
+        RuntimeError: ffmpeg could not transcode the input
+    """
+    ffmpeg_path = ffmpeg_path or shutil.which('ffmpeg')
+    if ffmpeg_path is None:
+        raise FileNotFoundError('ffmpeg not found on PATH')
+
+    fd, output_path = tempfile.mkstemp(suffix='.ogg')
+    os.close(fd)
+    result = subprocess.run(
+        [
+            ffmpeg_path, '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+            '-i', str(source_path), '-vn', '-ac', '1',
+            '-c:a', 'libopus', '-b:a', bitrate, '-application', 'voip',
+            output_path,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False
+    )
+    if result.returncode != 0:
+        os.unlink(output_path)
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()[-500:]}")
+    return output_path
+
+
+class DeduplicatingAudioStorage(FileSystemStorage):
+    """
+    FileSystemStorage that stores each distinct recording once
+
+    A saved file is named after the SHA-256 of its content, inside the
+    upload_to directory (speeches/ab/abcd....ext); saving content that is
+    already stored writes nothing and returns the existing name. With
+    transcode='opus' new recordings are converted to low-bitrate Opus
+    first; the name still uses the hash of the original upload, so a
+    repeated upload is recognised before any transcoding. Stored files
+    can be shared by several rows, so they are never deleted with a row.
+    """
+
+    def __init__(self, transcode=None, bitrate='24k', **kwargs):
+        """
+        Args:
+            transcode: None to keep uploads as received, or 'opus'
+            bitrate: Opus bitrate when transcoding
+            **kwargs: FileSystemStorage arguments (location, base_url, ...)
+        """
+        super().__init__(**kwargs)
+        self.transcode = transcode
+        self.bitrate = bitrate
+
+    def _save(self, name, content):
+        directory, file_name = os.path.split(name)
+        extension = os.path.splitext(file_name)[1].lower() or '.webm'
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        stored_extension = '.ogg' if self.transcode == 'opus' else extension
+        target = os.path.join(directory, content_hash[:2], content_hash + stored_extension)
+        if self.exists(target):
+            return target
+
+        if self.transcode != 'opus':
+            content.seek(0)
+            return self._save_as(target, content)
+
+        source_path = None
+        temporary_source = not hasattr(content, 'temporary_file_path')
+        if temporary_source:
+            fd, source_path = tempfile.mkstemp(suffix=extension)
+            content.seek(0)
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    f.write(chunk)
+        else:
+            source_path = content.temporary_file_path()
+
+        try:
+            transcoded_path = transcode_to_opus(source_path, self.bitrate)
+        except (FileNotFoundError, RuntimeError) as e:
+            # Keep the upload as received rather than lose it
+            print(f"Audio transcoding failed, storing original: {e}")
+            content.seek(0)
+            return self._save_as(os.path.join(directory, content_hash[:2], content_hash + extension), content)
+        finally:
+            if temporary_source:
+                os.unlink(source_path)
+
+        try:
+            with open(transcoded_path, 'rb') as f:
+                return self._save_as(target, File(f))
+        finally:
+            os.unlink(transcoded_path)
+
+    def _save_as(self, target, content):
+        # Two workers storing the same new recording: the loser's copy is
+        # identical, so keeping the first one is correct
+        saved = super()._save(target, content)
+        if saved != target:
+            self.delete(saved)
+        return target
+
+
+def get_audio_storage():
+    """Storage for SpeechAnalysis.audio_file, configured from settings"""
+    return DeduplicatingAudioStorage(
+        transcode=getattr(settings, 'AUDIO_STORAGE_TRANSCODE', None),
+        bitrate=getattr(settings, 'AUDIO_STORAGE_BITRATE', '24k'),
+    )
+
+
+def content_type_for(name):
+    extension = Path(name).suffix.lower().lstrip('.')
+    return AUDIO_CONTENT_TYPES.get(extension, 'application/octet-stream')
+
+
+def _read_range(file, start, length, block_size=64 * 1024):
+    try:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(block_size, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+    finally:
+        file.close()
+
+
+def ranged_audio_response(request, field_file):
+    """
+    Stream a stored recording, honouring a single-range Range header
+
+    Content-addressed files never change, so they get a strong ETag and a
+    long cache lifetime; clients that already have the file get a 304.
+
+    Args:
+        request: The incoming request
+        field_file: FieldFile of the stored recording
+
+    Returns:
+        HttpResponse: 200 (whole file), 206 (range), 304 or 416
+    """
+    name = field_file.name
+    size = field_file.size
+    match = CONTENT_ADDRESSED_NAME.match(name)
+    etag = f'"{match.group(1)}"' if match else None
+
+    if etag and request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        return response
+
+    start, end = 0, size - 1
+    status = 200
+    range_header = request.META.get('HTTP_RANGE', '').strip()
+    range_match = _RANGE.match(range_header)
+    if range_header and range_match and size > 0:
+        first, last = range_match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        elif last:
+            # Suffix range: the final N bytes
+            start = max(size - int(last), 0)
+        if not (first or last) or start > end or start >= size:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        status = 206
+
+    length = end - start + 1 if size else 0
+    response = StreamingHttpResponse(
+        _read_range(field_file.storage.open(name, 'rb'), start, length),
+        status=status,
+        content_type=content_type_for(name)
+    )
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if etag:
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
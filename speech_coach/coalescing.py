@@ -0,0 +1,222 @@
+"""
+Single-flight coalescing of identical analyze requests
+Concurrent requests for the same audio share one computation
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within the process only
+    fcntl = None
+
+
+def request_key(audio, **params):
+    """
+    Content hash identifying an analyze request
+
+    Args:
+        audio: Uploaded audio bytes, or the path of an assembled upload
+            (hashed in blocks; the key matches that of the same bytes)
+        **params: Everything else the result depends on (category, tier,
+            model version, ...)
+
+    Returns:
+        str: Hex digest
+    """
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        digest = hashlib.sha256(audio)
+    else:
+        digest = hashlib.sha256()
+        with open(audio, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class _Call:
+    """One in-flight computation that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run a computation once per key while identical requests are in flight
+
+    Within a process, the first caller for a key computes and concurrent
+    callers with the same key wait for its result. Across worker processes
+    on the same machine, the computing caller holds an exclusive file lock
+    for the key in lock_dir and leaves its result there for result_ttl
+    seconds; a worker that was waiting on the lock reads that result
+    instead of recomputing. A worker that waits longer than wait_timeout
+    computes the result itself rather than queueing behind a stuck one.
+    """
+
+    def __init__(self, lock_dir=None, result_ttl=30.0, wait_timeout=120.0):
+        """
+        Args:
+            lock_dir: Directory for the per-key lock and result files
+                (None coalesces within this process only)
+            result_ttl: Seconds a finished result is served to other workers
+            wait_timeout: Longest wait for another worker's lock on a key
+        """
+        self.lock_dir = Path(lock_dir) if lock_dir and fcntl is not None else None
+        self.result_ttl = result_ttl
+        self.wait_timeout = wait_timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        if self.lock_dir is not None:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+    def do(self, key, compute):
+        """
+        Return compute()'s result for key, sharing it with concurrent callers
+
+        Args:
+            key: Request key (see request_key)
+            compute: Zero-argument callable returning a JSON-serializable result
+
+        Returns:
+            tuple: (result, shared) where shared is True if another request
+                computed the result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result, shared = self._do_across_workers(key, compute)
+            return call.result, shared
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _do_across_workers(self, key, compute):
+        if self.lock_dir is None:
+            return compute(), False
+
+        result_path = self.lock_dir / f'{key}.json'
+        lock_file = self._acquire(self.lock_dir / f'{key}.lock')
+        if lock_file is None:
+            print(f"Coalescing: gave up waiting for {key[:12]} after {self.wait_timeout}s, computing it here")
+            return compute(), False
+
+        try:
+            # Another worker finished this key while we waited for the lock
+            cached = self._read_result(result_path)
+            if cached is not None:
+                return cached, True
+
+            result = compute()
+            self._write_result(result_path, result)
+            return result, False
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _acquire(self, lock_path):
+        """
+        Lock a key's lock file, waiting at most wait_timeout seconds
+
+        _prune deletes idle lock files, so a caller can end up locking a file
+        that was unlinked while it waited; the lock only counts if the path
+        still names the file that was locked, otherwise it is retried.
+
+        Returns:
+            The locked open file, or None on timeout
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            lock_file = open(lock_path, 'a')
+            if not self._flock_until(lock_file, deadline):
+                lock_file.close()
+                return None
+            try:
+                if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                    return lock_file
+            except FileNotFoundError:
+                pass
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _flock_until(self, lock_file, deadline):
+        """Exclusive flock with a deadline (flock itself cannot time out)"""
+        delay = 0.005
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.1)
+
+    def _read_result(self, path):
+        try:
+            if time.time() - path.stat().st_mtime > self.result_ttl:
+                path.unlink(missing_ok=True)
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, path, result):
+        # Write then rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.lock_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f, default=float)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError):
+            Path(temp_path).unlink(missing_ok=True)
+        self._prune()
+
+    def _prune(self):
+        """
+        Remove results past their TTL, and their lock files if idle
+
+        A lock file is only unlinked while holding its lock, and _acquire
+        rechecks the path after locking, so a caller blocked on the old file
+        retries on a fresh one instead of computing alongside its creator.
+        """
+        cutoff = time.time() - self.result_ttl
+        for path in self.lock_dir.glob('*.json'):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                path.unlink(missing_ok=True)
+                lock_path = path.with_suffix('.lock')
+                with open(lock_path, 'a') as lock_file:
+                    try:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue  # in use; pruned after its next result expires
+                    lock_path.unlink(missing_ok=True)
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            except OSError:
+                continue
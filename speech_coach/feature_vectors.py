@@ -0,0 +1,113 @@
+"""
+Packed feature-vector storage
+Stores the 26 extracted features of an analysis as one little-endian float32
+blob tagged with a schema id, and reads them back in bulk as a NumPy matrix
+"""
+import numpy as np
+
+
+# Feature order per schema id. Never edit a published schema; add a new id.
+FEATURE_SCHEMAS = {
+    1: (
+        'loud_mean', 'loud_std', 'pause_ratio', 'pitch_mean', 'pitch_std',
+        'syllables_per_sec', 'spectral_centroid', 'spectral_rolloff',
+        'words_per_minute', 'zcr_mean',
+        'mfcc_1', 'mfcc_2', 'mfcc_3', 'mfcc_4', 'mfcc_5', 'mfcc_6',
+        'mfcc_7', 'mfcc_8', 'mfcc_9', 'mfcc_10', 'mfcc_11', 'mfcc_12', 'mfcc_13',
+        'spectral_bandwidth', 'spectral_flux', 'chroma_mean',
+    ),
+}
+
+CURRENT_FEATURE_SCHEMA = 1
+
+VECTOR_DTYPE = np.dtype('<f4')
+
+
+def schema_columns(schema=CURRENT_FEATURE_SCHEMA):
+    """Return the ordered feature names of a schema"""
+    try:
+        return FEATURE_SCHEMAS[schema]
+    except KeyError:
+        raise ValueError(f"Unknown feature schema: {schema}")
+
+
+def pack_features(source, schema=CURRENT_FEATURE_SCHEMA):
+    """
+    Pack features into a float32 blob
+
+    Args:
+        source: dict of features or any object with feature attributes
+            (e.g. a SpeechAnalysis instance); missing values become NaN
+        schema: Feature schema id
+
+    Returns:
+        bytes: len(schema) * 4 bytes
+    """
+    columns = schema_columns(schema)
+    if isinstance(source, dict):
+        values = [source.get(column) for column in columns]
+    else:
+        values = [getattr(source, column, None) for column in columns]
+
+    vector = np.array(
+        [np.nan if value is None else value for value in values],
+        dtype=VECTOR_DTYPE
+    )
+    return vector.tobytes()
+
+
+def unpack_features(blob, schema=CURRENT_FEATURE_SCHEMA):
+    """
+    Unpack a float32 blob into a feature dictionary
+
+    Returns:
+        dict: Feature name -> float (None where the value was missing)
+    """
+    columns = schema_columns(schema)
+    vector = np.frombuffer(bytes(blob), dtype=VECTOR_DTYPE)
+    if vector.size != len(columns):
+        raise ValueError(
+            f"Feature vector has {vector.size} values, schema {schema} expects {len(columns)}"
+        )
+
+    return {
+        column: None if np.isnan(value) else float(value)
+        for column, value in zip(columns, vector)
+    }
+
+
+def load_feature_matrix(queryset, schema=CURRENT_FEATURE_SCHEMA, with_ids=False, chunk_size=2000):
+    """
+    Read the packed vectors of a queryset into one (n_rows, n_features) matrix
+
+    Only the blob column is fetched and no model instances are built; the
+    blobs are concatenated and reinterpreted in a single np.frombuffer call.
+
+    Args:
+        queryset: SpeechAnalysis queryset (rows of other schemas are skipped)
+        schema: Feature schema id to read
+        with_ids: Also return the primary keys in matrix row order
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        np.ndarray, or (ids, matrix) if with_ids
+    """
+    n_features = len(schema_columns(schema))
+    rows = queryset.filter(feature_schema=schema, feature_vector__isnull=False)
+
+    if with_ids:
+        ids = []
+        blobs = []
+        for pk, blob in rows.values_list('pk', 'feature_vector').iterator(chunk_size=chunk_size):
+            ids.append(pk)
+            blobs.append(blob)
+        buffer = b''.join(blobs)
+    else:
+        buffer = b''.join(
+            rows.values_list('feature_vector', flat=True).iterator(chunk_size=chunk_size)
+        )
+
+    matrix = np.frombuffer(buffer, dtype=VECTOR_DTYPE).reshape(-1, n_features)
+    if with_ids:
+        return np.asarray(ids, dtype=np.int64), matrix
+    return matrix
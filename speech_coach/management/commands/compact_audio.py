@@ -0,0 +1,86 @@
+"""
+Deduplicate (and optionally transcode) stored speech recordings
+
+Moves every SpeechAnalysis recording that is not yet content-addressed
+into the deduplicating audio storage (speeches/ab/<sha256>.<ext>), so
+identical uploads share one file. With --transcode recordings are also
+converted to low-bitrate Opus. Rows are pointed at the stored copy and
+originals no longer referenced are deleted.
+
+Usage:
+    python manage.py compact_audio [--transcode] [--keep-originals] [--dry-run]
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from speech_coach.audio_storage import CONTENT_ADDRESSED_NAME, DeduplicatingAudioStorage
+from speech_coach.models import SpeechAnalysis
+
+
+class Command(BaseCommand):
+    help = 'Deduplicate stored recordings by content hash and optionally transcode them to Opus'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--transcode', action='store_true',
+            help='Also transcode recordings to Opus (requires ffmpeg)'
+        )
+        parser.add_argument(
+            '--bitrate', default=getattr(settings, 'AUDIO_STORAGE_BITRATE', '24k'),
+            help='Opus bitrate when transcoding'
+        )
+        parser.add_argument(
+            '--keep-originals', action='store_true',
+            help='Leave the original files in place'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report what would be compacted'
+        )
+
+    def handle(self, *args, **options):
+        field = SpeechAnalysis._meta.get_field('audio_file')
+        storage = DeduplicatingAudioStorage(
+            transcode='opus' if options['transcode'] else None,
+            bitrate=options['bitrate']
+        )
+
+        names = (
+            SpeechAnalysis.objects.exclude(audio_file='').exclude(audio_file__isnull=True)
+            .values_list('audio_file', flat=True).distinct().order_by('audio_file')
+        )
+        pending = [
+            name for name in names.iterator()
+            if not CONTENT_ADDRESSED_NAME.match(name)
+            or (options['transcode'] and not name.endswith('.ogg'))
+        ]
+        self.stdout.write(f"{len(pending)} stored recordings to compact")
+        if options['dry_run']:
+            return
+
+        before = 0
+        compacted = missing = 0
+        stored = set()
+        for name in pending:
+            if not storage.exists(name):
+                missing += 1
+                self.stdout.write(self.style.WARNING(f"  Missing file: {name}"))
+                continue
+
+            before += storage.size(name)
+            with storage.open(name, 'rb') as original:
+                new_name = storage.save(f"{field.upload_to}{Path(name).name}", original)
+            stored.add(new_name)
+
+            SpeechAnalysis.objects.filter(audio_file=name).update(audio_file=new_name)
+            if new_name != name and not options['keep_originals']:
+                storage.delete(name)
+            compacted += 1
+
+        after = sum(storage.size(name) for name in stored)
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {compacted} recordings into {len(stored)} files ({missing} missing): "
+            f"{before / 1024 ** 2:.1f} MB -> {after / 1024 ** 2:.1f} MB"
+        ))
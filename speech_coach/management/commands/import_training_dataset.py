@@ -0,0 +1,90 @@
+"""
+Import the expert-labeled dataset CSV into TrainingDataset
+
+Rows are matched on file name: new recordings are added, existing ones
+are left alone unless --update is given. Running servers pick up new and
+updated rows (by updated_at) in the similar-speech index on its next
+refresh.
+
+Usage:
+    python manage.py import_training_dataset --dataset Speeches_Dataset_Clean.csv [--update]
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from speech_coach.feature_vectors import CURRENT_FEATURE_SCHEMA, schema_columns
+from speech_coach.models import TrainingDataset
+from speech_coach.rollups import SCORE_FIELDS
+
+sys.path.append(str(Path(settings.BASE_DIR) / 'ml_models'))
+from dataset_loader import DatasetSchemaError, read_dataset_csv
+
+
+class Command(BaseCommand):
+    help = 'Load expert-labeled speeches (features, scores and coach notes) from a CSV into TrainingDataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', required=True, help='Dataset CSV (same schema as training)')
+        parser.add_argument(
+            '--update', action='store_true',
+            help='Overwrite rows whose file name is already imported'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            df = read_dataset_csv(options['dataset'])
+        except (DatasetSchemaError, OSError) as e:
+            raise CommandError(str(e))
+        if 'file' not in df.columns:
+            raise CommandError(f"{options['dataset']} has no file name column")
+
+        fields = ['category', *schema_columns(CURRENT_FEATURE_SCHEMA), *SCORE_FIELDS]
+        notes = [column for column in ('strengths', 'areas_for_improvement') if column in df.columns]
+        df = df.dropna(subset=['file']).drop_duplicates(subset='file', keep='last')
+
+        # Every feature but words_per_minute is NOT NULL in TrainingDataset
+        required = [field for field in fields if field != 'words_per_minute']
+        incomplete = int(df[required].isnull().any(axis=1).sum())
+        df = df.dropna(subset=required)
+
+        records = []
+        for row in df.to_dict('records'):
+            values = {field: None if pd.isna(row.get(field)) else row.get(field) for field in fields}
+            values.update({field: int(values[field]) for field in SCORE_FIELDS})
+            values.update({column: row[column] if isinstance(row[column], str) else '' for column in notes})
+            records.append(TrainingDataset(file_name=str(row['file']), **values))
+
+        existing = set(
+            TrainingDataset.objects.filter(file_name__in=[r.file_name for r in records])
+            .values_list('file_name', flat=True)
+        )
+        new = [record for record in records if record.file_name not in existing]
+        TrainingDataset.objects.bulk_create(new, batch_size=500)
+
+        updated = 0
+        if options['update'] and existing:
+            update_fields = fields + notes
+            stored = TrainingDataset.objects.in_bulk(existing, field_name='file_name')
+            changed = []
+            now = timezone.now()
+            for record in records:
+                if record.file_name in stored:
+                    row = stored[record.file_name]
+                    for field in update_fields:
+                        setattr(row, field, getattr(record, field))
+                    # bulk_update skips auto_now; the similar-speech index relies on it
+                    row.updated_at = now
+                    changed.append(row)
+            updated = TrainingDataset.objects.bulk_update(
+                changed, [*update_fields, 'updated_at'], batch_size=500
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {len(new)} new rows, updated {updated}, skipped {len(existing) - updated}"
+            f" ({incomplete} rows with missing features ignored)"
+        ))
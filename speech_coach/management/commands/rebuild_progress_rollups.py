@@ -0,0 +1,23 @@
+"""
+Rebuild the per-user progress rollups from stored speech analyses
+
+Usage:
+    python manage.py rebuild_progress_rollups [--user ID ...]
+"""
+from django.core.management.base import BaseCommand
+
+from speech_coach.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute UserProgressRollup rows from SpeechAnalysis'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help='Only rebuild rollups for this user id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(user_ids=options['users'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} rollup rows'))
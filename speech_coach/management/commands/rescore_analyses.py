@@ -0,0 +1,155 @@
+"""
+Re-score stored speech analyses with the currently trained model
+
+Streams analyses in primary-key order, rebuilds each chunk's feature matrix
+from the packed feature vectors (no audio is touched), predicts the whole
+chunk in one SpeechPredictor call and writes the scores back with
+bulk_update. Progress (last primary key, model bundle and the users whose
+rollups need rebuilding) is checkpointed after every chunk so an
+interrupted run can continue with --resume against the same model.
+Expert-labeled analyses keep their scores.
+
+Usage:
+    python manage.py rescore_analyses [--chunk-size 2000] [--resume]
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from speech_coach.feature_vectors import CURRENT_FEATURE_SCHEMA, VECTOR_DTYPE, schema_columns
+from speech_coach.models import SpeechAnalysis
+from speech_coach.rollups import rebuild_rollups
+
+sys.path.append(str(Path(settings.BASE_DIR) / 'ml_models'))
+from model_registry import resolve_model_dir
+from speech_predictor import SpeechPredictor
+
+
+class Command(BaseCommand):
+    help = 'Re-score stored SpeechAnalysis rows in bulk after a model update'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model-dir', default=str(settings.ML_MODELS_DIR),
+            help='Directory of the trained model to score with'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Analyses predicted and written per batch'
+        )
+        parser.add_argument(
+            '--checkpoint', default=None,
+            help='Checkpoint file (default: <model-dir>/rescore_checkpoint.json)'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Continue after the last primary key recorded in the checkpoint'
+        )
+        parser.add_argument(
+            '--start-after', type=int, default=0,
+            help='Only re-score analyses with a primary key greater than this'
+        )
+
+    def handle(self, *args, **options):
+        model_dir = Path(options['model_dir'])
+        if not model_dir.exists():
+            raise CommandError(f"Model directory not found at {model_dir}")
+
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        checkpoint_path = Path(options['checkpoint'] or model_dir / 'rescore_checkpoint.json')
+        bundle_dir = resolve_model_dir(model_dir)
+        last_pk = options['start_after']
+        user_ids = set()
+        if options['resume'] and checkpoint_path.exists():
+            with open(checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+            # Mixing two models' scores in one pass would leave no way to tell them apart
+            if checkpoint.get('model_dir') != str(bundle_dir):
+                raise CommandError(
+                    f"Checkpoint was written with model {checkpoint.get('model_dir')}, not {bundle_dir}; "
+                    "rerun without --resume to re-score everything with the current model"
+                )
+            last_pk = checkpoint['last_pk']
+            user_ids.update(checkpoint.get('user_ids', []))
+            self.stdout.write(f"Resuming after pk {last_pk}")
+
+        predictor = SpeechPredictor()
+        predictor.load(bundle_dir)
+
+        columns = list(schema_columns(CURRENT_FEATURE_SCHEMA))
+        targets = predictor.TARGET_COLUMNS
+        pending = SpeechAnalysis.objects.filter(
+            pk__gt=last_pk,
+            expert_labeled=False,
+            feature_schema=CURRENT_FEATURE_SCHEMA,
+            feature_vector__isnull=False
+        ).order_by('pk')
+        total = pending.count()
+        self.stdout.write(f"Re-scoring {total} analyses in chunks of {chunk_size}")
+
+        done = 0
+        started = time.monotonic()
+        while True:
+            rows = list(
+                pending.filter(pk__gt=last_pk)
+                .values_list('pk', 'user_id', 'category', 'feature_vector')[:chunk_size]
+            )
+            if not rows:
+                break
+
+            pks, users, categories, blobs = zip(*rows)
+            matrix = np.frombuffer(b''.join(blobs), dtype=VECTOR_DTYPE).reshape(-1, len(columns))
+            features = pd.DataFrame(matrix.astype(np.float64), columns=columns)
+            features['category'] = list(categories)
+
+            scores = predictor.predict_batch(features)
+
+            now = timezone.now()
+            updates = [
+                SpeechAnalysis(pk=pk, updated_at=now, **dict(zip(targets, row.tolist())))
+                for pk, row in zip(pks, scores)
+            ]
+            with transaction.atomic():
+                SpeechAnalysis.objects.bulk_update(updates, [*targets, 'updated_at'])
+
+            last_pk = pks[-1]
+            done += len(pks)
+            user_ids.update(user for user in users if user is not None)
+            self._write_checkpoint(checkpoint_path, last_pk, bundle_dir, user_ids)
+
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed > 0 else 0.0
+            self.stdout.write(f"  {done}/{total} re-scored ({rate:.0f} rows/s, last pk {last_pk})")
+
+        # bulk_update skips model signals, so refresh the affected rollups
+        # (including users re-scored by an interrupted earlier run)
+        if user_ids:
+            rebuild_rollups(user_ids=user_ids)
+
+        if checkpoint_path.exists():
+            checkpoint_path.unlink()
+
+        self.stdout.write(self.style.SUCCESS(f"Re-scored {done} analyses"))
+
+    def _write_checkpoint(self, checkpoint_path, last_pk, bundle_dir, user_ids):
+        """Record progress atomically so a crash never leaves a torn file"""
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = checkpoint_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'last_pk': last_pk,
+                'model_dir': str(bundle_dir),
+                'user_ids': sorted(user_ids),
+            }, f)
+        temp_path.replace(checkpoint_path)
@@ -0,0 +1,270 @@
+"""
+Retrain the speech model in the background and publish it if it holds up
+
+Trains on TrainingDataset plus expert-labeled analyses (and optionally CSV
+files), validates the candidate against the served model on a fixed
+holdout that neither model trains on, and publishes it as a new versioned
+bundle under ML_MODELS_DIR. Running web workers pick it up through ModelRegistry without
+a restart. Run it from cron or a worker box, not from a request.
+
+Usage:
+    python manage.py retrain_model [--dataset data.csv] [--tolerance 0.05]
+    python manage.py retrain_model --incremental [--new-trees 50 --max-trees 200 --replay-rows 500]
+"""
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from speech_coach.feature_vectors import CURRENT_FEATURE_SCHEMA, schema_columns
+from speech_coach.models import SpeechAnalysis, TrainingDataset
+
+sys.path.append(str(Path(settings.BASE_DIR) / 'ml_models'))
+from dataset_loader import DatasetSchemaError, load_dataset
+from model_registry import load_metrics, publish_bundle, resolve_model_dir
+from speech_predictor import SpeechPredictor
+
+
+LOCK_FILE = '.retrain.lock'
+
+# One row in HOLDOUT_MODULUS is held out, chosen by a hash of its values, so
+# a row stays on the same side in every run and no published model sees it
+HOLDOUT_MODULUS = 5
+HOLDOUT_SCHEME = f'row-hash-1-in-{HOLDOUT_MODULUS}'
+
+
+def holdout_mask(df):
+    """
+    Rows of the fixed holdout
+
+    Args:
+        df: Training frame with category, feature and target columns
+
+    Returns:
+        np.ndarray: Boolean mask, True for held-out rows
+    """
+    columns = list(schema_columns(CURRENT_FEATURE_SCHEMA)) + SpeechPredictor.TARGET_COLUMNS
+    # float32 so a row hashes the same from the database, a CSV or the dataset cache
+    key = df[columns].astype('float32')
+    key.insert(0, 'category', df['category'].astype(str).str.lower())
+    return (pd.util.hash_pandas_object(key, index=False) % HOLDOUT_MODULUS == 0).to_numpy()
+
+
+class Command(BaseCommand):
+    help = 'Retrain the model from labeled data and hot-publish it if it validates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--models-dir', default=str(settings.ML_MODELS_DIR),
+            help='Root directory of the versioned model bundles'
+        )
+        parser.add_argument(
+            '--dataset', action='append', default=[],
+            help='Extra labeled CSV file to train on (repeatable)'
+        )
+        parser.add_argument(
+            '--model-type', default='random_forest',
+            choices=['random_forest', 'gradient_boosting', 'ridge']
+        )
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Grow the served forest with new trees instead of training from scratch'
+        )
+        parser.add_argument(
+            '--new-trees', type=int, default=50,
+            help='Trees added per target in incremental mode'
+        )
+        parser.add_argument(
+            '--max-trees', type=int, default=200,
+            help='Tree cap per target in incremental mode; oldest trees are retired first'
+        )
+        parser.add_argument(
+            '--replay-rows', type=int, default=500,
+            help='Older rows sampled into the new trees alongside the new rows in incremental mode'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.05,
+            help='Largest held-out MAE increase over the served model that is still accepted'
+        )
+        parser.add_argument(
+            '--min-samples', type=int, default=50,
+            help='Refuse to train on fewer labeled rows than this'
+        )
+        parser.add_argument(
+            '--keep', type=int, default=5,
+            help='Number of published versions to retain'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Publish even if the candidate validates worse'
+        )
+        parser.add_argument(
+            '--nice', type=int, default=10,
+            help='CPU niceness increment so serving processes keep priority'
+        )
+
+    def handle(self, *args, **options):
+        models_dir = Path(options['models_dir'])
+        models_dir.mkdir(parents=True, exist_ok=True)
+
+        if options['nice'] and hasattr(os, 'nice'):
+            os.nice(options['nice'])
+
+        lock_path = models_dir / LOCK_FILE
+        try:
+            lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            raise CommandError(
+                f"Another retrain is running (remove {lock_path} if it is stale)"
+            )
+
+        try:
+            os.write(lock_fd, str(os.getpid()).encode())
+            self._retrain(models_dir, options)
+        finally:
+            os.close(lock_fd)
+            lock_path.unlink(missing_ok=True)
+
+    def _retrain(self, models_dir, options):
+        df = self._load_training_frame(options['dataset'])
+        self.stdout.write(f"Training rows: {len(df)}")
+        if len(df) < options['min_samples']:
+            raise CommandError(
+                f"Only {len(df)} labeled rows; need at least {options['min_samples']}"
+            )
+
+        held_out = holdout_mask(df)
+        train_df, holdout = df[~held_out], df[held_out]
+        self.stdout.write(f"Held-out rows: {len(holdout)}")
+
+        served = self._load_served(models_dir)
+        served_metrics = {}
+        if served is not None:
+            served_metrics = load_metrics(resolve_model_dir(models_dir)) or {}
+        # Models published before the fixed holdout may have trained on it
+        served_clean = served_metrics.get('holdout_scheme') == HOLDOUT_SCHEME
+
+        if options['incremental']:
+            candidate = self._load_served(models_dir)
+            if candidate is None or candidate.model_type != 'random_forest':
+                raise CommandError('Incremental mode needs a served random_forest model')
+            is_new = self._labeled_since(train_df, served_metrics.get('trained_through'))
+            self.stdout.write(f"New rows since the served model: {int(is_new.sum())}")
+            if not is_new.any():
+                raise CommandError('No rows labeled since the served model; nothing to grow on')
+            metrics = candidate.train_incremental(
+                train_df[is_new], n_new_trees=options['new_trees'], max_trees=options['max_trees'],
+                replay_df=train_df[~is_new], max_replay_rows=options['replay_rows'], random_state=42
+            )
+            candidate_clean = served_clean
+        else:
+            candidate = SpeechPredictor(model_type=options['model_type'])
+            candidate.fit(train_df)
+            metrics = {}
+            candidate_clean = True
+
+        candidate_eval = candidate.evaluate(holdout)
+        # Per-target metrics; the overall ones are stored under test_*
+        metrics.update({key: value for key, value in candidate_eval.items() if key not in ('mae', 'rmse', 'r2')})
+        metrics.update({
+            'n_samples': len(df),
+            'trained_through': self._trained_through(df),
+            'holdout_rows': len(holdout),
+            'test_mae': candidate_eval['mae'],
+            'test_rmse': candidate_eval['rmse'],
+            'test_r2': candidate_eval['r2'],
+            'holdout_mae': candidate_eval['mae'],
+        })
+        if candidate_clean:
+            metrics['holdout_scheme'] = HOLDOUT_SCHEME
+        self.stdout.write(f"Candidate held-out MAE: {candidate_eval['mae']:.4f}")
+
+        if served is not None:
+            served_eval = served.evaluate(holdout)
+            metrics['baseline_holdout_mae'] = served_eval['mae']
+            self.stdout.write(f"Served model held-out MAE: {served_eval['mae']:.4f}")
+
+            if not served_clean and not options['incremental']:
+                # Its MAE on rows it trained on is optimistic, which would bias
+                # the comparison against every candidate
+                self.stdout.write(self.style.WARNING(
+                    "Served model was not trained with the fixed holdout excluded; "
+                    "skipping the comparison"
+                ))
+            elif candidate_eval['mae'] > served_eval['mae'] + options['tolerance'] and not options['force']:
+                raise CommandError(
+                    "Candidate rejected: held-out MAE "
+                    f"{candidate_eval['mae']:.4f} vs served {served_eval['mae']:.4f}"
+                )
+
+        version = publish_bundle(candidate, models_dir, metrics=metrics, keep=options['keep'])
+        self.stdout.write(self.style.SUCCESS(f"Published model version {version}"))
+
+    def _load_served(self, models_dir):
+        """Load the currently served model, or None if there is none"""
+        bundle_dir = resolve_model_dir(models_dir)
+        if not (bundle_dir / 'metadata.joblib').exists():
+            return None
+        predictor = SpeechPredictor()
+        predictor.load(bundle_dir)
+        return predictor
+
+    def _labeled_since(self, df, trained_through):
+        """
+        Mask of rows labeled after the served model was trained
+
+        Without a recorded watermark every database row counts as new. CSV
+        rows have no labeling time and only feed the replay sample.
+        """
+        if trained_through is None:
+            return df['labeled_at'].notna().to_numpy()
+        return (df['labeled_at'] > pd.Timestamp(trained_through)).to_numpy()
+
+    def _trained_through(self, df):
+        """Latest labeling time in the training frame, as recorded in metrics"""
+        latest = df['labeled_at'].max()
+        return None if pd.isna(latest) else latest.isoformat()
+
+    def _load_training_frame(self, csv_paths):
+        """
+        Combine TrainingDataset, expert-labeled analyses and extra CSVs
+
+        Adds 'labeled_at' (when a database row was imported or last edited,
+        missing for CSV rows) so incremental runs can find new and relabeled
+        rows.
+        """
+        feature_columns = list(schema_columns(CURRENT_FEATURE_SCHEMA))
+        columns = ['category', *feature_columns, *SpeechPredictor.TARGET_COLUMNS]
+
+        training = pd.DataFrame.from_records(
+            TrainingDataset.objects.values(*columns, 'updated_at'), columns=[*columns, 'updated_at']
+        )
+        frames = [training.rename(columns={'updated_at': 'labeled_at'})]
+
+        labeled = SpeechAnalysis.objects.filter(expert_labeled=True)
+        for target in SpeechPredictor.TARGET_COLUMNS:
+            labeled = labeled.filter(**{f'{target}__isnull': False})
+        analyses = pd.DataFrame.from_records(
+            labeled.values(*columns, 'updated_at'), columns=[*columns, 'updated_at']
+        )
+        frames.append(analyses.rename(columns={'updated_at': 'labeled_at'}))
+
+        for csv_path in csv_paths:
+            try:
+                csv_df = load_dataset(csv_path)
+            except DatasetSchemaError as e:
+                raise CommandError(str(e))
+            missing = [column for column in columns if column not in csv_df.columns]
+            if missing:
+                raise CommandError(f"{csv_path} is missing columns: {missing}")
+            frames.append(csv_df[columns])
+
+        frames = [frame for frame in frames if not frame.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[*columns, 'labeled_at'])
+        df['labeled_at'] = pd.to_datetime(df['labeled_at'], utc=True)
+
+        # Stored analyses use lowercase category choices; the dataset is title case
+        df['category'] = df['category'].fillna('').astype(str).str.capitalize()
+        return df
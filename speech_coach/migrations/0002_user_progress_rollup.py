@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('speech_coach', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserProgressRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, default='', max_length=20)),
+                ('week_start', models.DateField()),
+                ('metric', models.CharField(choices=[('speech_pace', 'Speech Pace'), ('pausing_fluency', 'Pausing Fluency'), ('loudness_control', 'Loudness Control'), ('pitch_variation', 'Pitch Variation'), ('articulation_clarity', 'Articulation Clarity'), ('expressive_emphasis', 'Expressive Emphasis'), ('filler_words', 'Filler Words'), ('overall', 'Overall')], max_length=30)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0.0)),
+                ('total_sq', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Progress Rollup',
+                'verbose_name_plural': 'User Progress Rollups',
+                'ordering': ['week_start', 'category', 'metric'],
+                'unique_together': {('user', 'category', 'week_start', 'metric')},
+            },
+        ),
+    ]
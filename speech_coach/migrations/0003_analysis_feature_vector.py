@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:24
+
+from django.db import migrations, models
+
+from speech_coach.feature_vectors import CURRENT_FEATURE_SCHEMA, pack_features
+
+
+def pack_existing_features(apps, schema_editor):
+    SpeechAnalysis = apps.get_model('speech_coach', 'SpeechAnalysis')
+    batch = []
+    for analysis in SpeechAnalysis.objects.filter(feature_vector__isnull=True).iterator(chunk_size=1000):
+        analysis.feature_vector = pack_features(analysis)
+        analysis.feature_schema = CURRENT_FEATURE_SCHEMA
+        batch.append(analysis)
+        if len(batch) >= 1000:
+            SpeechAnalysis.objects.bulk_update(batch, ['feature_vector', 'feature_schema'])
+            batch = []
+    if batch:
+        SpeechAnalysis.objects.bulk_update(batch, ['feature_vector', 'feature_schema'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('speech_coach', '0002_user_progress_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='speechanalysis',
+            name='feature_schema',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='speechanalysis',
+            name='feature_vector',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_existing_features, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('speech_coach', '0003_analysis_feature_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='speechanalysis',
+            name='expert_labeled',
+            field=models.BooleanField(default=False),
+        ),
+    ]
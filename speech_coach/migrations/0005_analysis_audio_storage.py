@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:00
+
+import speech_coach.audio_storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('speech_coach', '0004_analysis_expert_labeled'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='speechanalysis',
+            name='audio_file',
+            field=models.FileField(blank=True, null=True, storage=speech_coach.audio_storage.get_audio_storage, upload_to='speeches/'),
+        ),
+    ]
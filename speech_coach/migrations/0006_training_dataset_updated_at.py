@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('speech_coach', '0005_analysis_audio_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingdataset',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    # 0006 stamped every existing row with the migration time, which would
+    # make all of them look newly labeled to incremental retraining
+    TrainingDataset = apps.get_model('speech_coach', 'TrainingDataset')
+    TrainingDataset.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('speech_coach', '0006_training_dataset_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from .audio_storage import get_audio_storage
+from .feature_vectors import CURRENT_FEATURE_SCHEMA, pack_features
+
 
 class SpeechAnalysis(models.Model):
     """
@@ -16,7 +19,7 @@ class SpeechAnalysis(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     file_name = models.CharField(max_length=255)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, blank=True, null=True)
-    audio_file = models.FileField(upload_to='speeches/', null=True, blank=True)
+    audio_file = models.FileField(upload_to='speeches/', storage=get_audio_storage, null=True, blank=True)
 
     # Audio features (extracted from audio)
     duration_s = models.FloatField(null=True, blank=True)
@@ -51,6 +54,10 @@ class SpeechAnalysis(models.Model):
     spectral_flux = models.FloatField(null=True, blank=True)
     chroma_mean = models.FloatField(null=True, blank=True)
 
+    # Packed float32 copy of the features above for bulk ML reads
+    feature_vector = models.BinaryField(null=True, blank=True, editable=False)
+    feature_schema = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+
     # Predicted scores (1-5 scale) - ML model outputs
     speech_pace = models.IntegerField(null=True, blank=True)
     pausing_fluency = models.IntegerField(null=True, blank=True)
@@ -65,6 +72,9 @@ class SpeechAnalysis(models.Model):
     strengths = models.TextField(blank=True, null=True)
     areas_for_improvement = models.TextField(blank=True, null=True)
 
+    # Set when a coach has reviewed the scores; labeled rows feed retraining
+    expert_labeled = models.BooleanField(default=False)
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -77,6 +87,15 @@ class SpeechAnalysis(models.Model):
     def __str__(self):
         return f"{self.file_name} - Overall: {self.overall}/5"
 
+    def save(self, *args, **kwargs):
+        # Keep the packed vector in step with the feature columns
+        self.feature_vector = pack_features(self)
+        self.feature_schema = CURRENT_FEATURE_SCHEMA
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'feature_vector', 'feature_schema'}
+        super().save(*args, **kwargs)
+
 
 class TrainingDataset(models.Model):
     """
@@ -130,6 +149,47 @@ class TrainingDataset(models.Model):
     areas_for_improvement = models.TextField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.file_name
+
+
+class UserProgressRollup(models.Model):
+    """
+    Incrementally maintained per-user score aggregates.
+
+    One row per (user, category, week, metric) holding the count, sum and sum
+    of squares of that metric's scores, so means and spreads can be served
+    without scanning SpeechAnalysis. Kept up to date by speech_coach.signals.
+    """
+    METRIC_CHOICES = [
+        ('speech_pace', 'Speech Pace'),
+        ('pausing_fluency', 'Pausing Fluency'),
+        ('loudness_control', 'Loudness Control'),
+        ('pitch_variation', 'Pitch Variation'),
+        ('articulation_clarity', 'Articulation Clarity'),
+        ('expressive_emphasis', 'Expressive Emphasis'),
+        ('filler_words', 'Filler Words'),
+        ('overall', 'Overall'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_rollups')
+    category = models.CharField(max_length=20, blank=True, default='')
+    week_start = models.DateField()
+    metric = models.CharField(max_length=30, choices=METRIC_CHOICES)
+
+    count = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0.0)
+    total_sq = models.FloatField(default=0.0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['week_start', 'category', 'metric']
+        unique_together = [('user', 'category', 'week_start', 'metric')]
+        verbose_name = 'User Progress Rollup'
+        verbose_name_plural = 'User Progress Rollups'
+
+    def __str__(self):
+        return f"{self.user_id} {self.week_start} {self.category or 'all'} {self.metric}"
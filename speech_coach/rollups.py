@@ -0,0 +1,212 @@
+"""
+Per-user progress rollups
+Maintains UserProgressRollup incrementally and serves score trends from it
+"""
+import math
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import SpeechAnalysis, UserProgressRollup
+
+
+SCORE_FIELDS = [metric for metric, _ in UserProgressRollup.METRIC_CHOICES]
+
+
+def week_start_for(timestamp):
+    """Return the Monday of the week containing timestamp"""
+    if timezone.is_aware(timestamp):
+        timestamp = timezone.localtime(timestamp)
+    day = timestamp.date()
+    return day - timedelta(days=day.weekday())
+
+
+def rollup_snapshot(analysis):
+    """
+    Capture the part of an analysis that contributes to the rollups
+
+    Returns:
+        dict or None: bucket key and scores, or None if the analysis
+        has no user or has not been saved yet
+    """
+    if analysis is None or analysis.user_id is None or analysis.created_at is None:
+        return None
+
+    return {
+        'user_id': analysis.user_id,
+        'category': analysis.category or '',
+        'week_start': week_start_for(analysis.created_at),
+        'scores': {
+            metric: getattr(analysis, metric)
+            for metric in SCORE_FIELDS
+            if getattr(analysis, metric) is not None
+        },
+    }
+
+
+def apply_snapshot(snapshot, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one analysis from its buckets
+
+    Uses F() increments so concurrent saves for the same bucket don't lose
+    updates. Removal never creates rows and drops buckets that become empty.
+    """
+    if snapshot is None:
+        return
+
+    bucket = {
+        'user_id': snapshot['user_id'],
+        'category': snapshot['category'],
+        'week_start': snapshot['week_start'],
+    }
+
+    for metric, value in snapshot['scores'].items():
+        rows = UserProgressRollup.objects.filter(metric=metric, **bucket)
+        if sign > 0:
+            UserProgressRollup.objects.get_or_create(metric=metric, **bucket)
+        rows.update(
+            count=F('count') + sign,
+            total=F('total') + sign * value,
+            total_sq=F('total_sq') + sign * value * value,
+        )
+        if sign < 0:
+            rows.filter(count__lte=0).delete()
+
+
+def update_rollups(previous, current):
+    """Move an analysis' contribution from its previous to its current snapshot"""
+    if previous == current:
+        return
+
+    with transaction.atomic():
+        apply_snapshot(previous, -1)
+        apply_snapshot(current, 1)
+
+
+def rebuild_rollups(user_ids=None):
+    """
+    Recompute rollups from SpeechAnalysis in the database
+
+    Needed after writes that bypass model signals (queryset.update(),
+    bulk_update()). Aggregation runs in SQL, one query per rebuild.
+
+    Args:
+        user_ids: Optional iterable of user ids to limit the rebuild to
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    analyses = SpeechAnalysis.objects.filter(user__isnull=False)
+    rollups = UserProgressRollup.objects.all()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        analyses = analyses.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    aggregates = {}
+    for metric in SCORE_FIELDS:
+        aggregates[f'{metric}__count'] = Count(metric)
+        aggregates[f'{metric}__total'] = Sum(metric)
+        aggregates[f'{metric}__total_sq'] = Sum(F(metric) * F(metric))
+
+    groups = (
+        analyses
+        .annotate(week=TruncWeek('created_at'))
+        .values('user_id', 'category', 'week')
+        .annotate(**aggregates)
+        .order_by()
+    )
+
+    merged = {}
+    for group in groups:
+        week = group['week']
+        week = week.date() if hasattr(week, 'date') else week
+        for metric in SCORE_FIELDS:
+            count = group[f'{metric}__count']
+            if not count:
+                continue
+            key = (group['user_id'], group['category'] or '', week, metric)
+            row = merged.setdefault(key, [0, 0.0, 0.0])
+            row[0] += count
+            row[1] += float(group[f'{metric}__total'])
+            row[2] += float(group[f'{metric}__total_sq'])
+
+    new_rows = [
+        UserProgressRollup(
+            user_id=user_id, category=category, week_start=week, metric=metric,
+            count=count, total=total, total_sq=total_sq,
+        )
+        for (user_id, category, week, metric), (count, total, total_sq) in merged.items()
+    ]
+
+    with transaction.atomic():
+        rollups.delete()
+        UserProgressRollup.objects.bulk_create(new_rows, batch_size=500)
+
+    return len(new_rows)
+
+
+def _summarize(count, total, total_sq):
+    """Mean and population standard deviation from running sums"""
+    mean = total / count
+    variance = max(total_sq / count - mean * mean, 0.0)
+    return {
+        'count': count,
+        'mean': round(mean, 4),
+        'std': round(math.sqrt(variance), 4),
+    }
+
+
+def progress_trends(user_id, category=None, metrics=None):
+    """
+    Weekly score trends for one user, read from the rollup table only
+
+    Args:
+        user_id: User to report on
+        category: Optional category filter; categories are merged otherwise
+        metrics: Optional list of metric names (defaults to all 8 scores)
+
+    Returns:
+        dict: Weekly buckets plus an all-time summary per metric
+    """
+    metrics = metrics or SCORE_FIELDS
+
+    rows = UserProgressRollup.objects.filter(user_id=user_id, metric__in=metrics)
+    if category:
+        rows = rows.filter(category=category)
+
+    weeks = {}
+    totals = {}
+    categories = set()
+    for week, row_category, metric, count, total, total_sq in rows.values_list(
+        'week_start', 'category', 'metric', 'count', 'total', 'total_sq'
+    ):
+        categories.add(row_category)
+        for bucket in (weeks.setdefault(week, {}), totals):
+            sums = bucket.setdefault(metric, [0, 0.0, 0.0])
+            sums[0] += count
+            sums[1] += total
+            sums[2] += total_sq
+
+    return {
+        'user': user_id,
+        'category': category or None,
+        'categories': sorted(c for c in categories if c),
+        'weeks': [
+            {
+                'week_start': week.isoformat(),
+                'metrics': {
+                    metric: _summarize(*sums)
+                    for metric, sums in weeks[week].items()
+                },
+            }
+            for week in sorted(weeks)
+        ],
+        'summary': {
+            metric: _summarize(*sums)
+            for metric, sums in totals.items()
+        },
+    }
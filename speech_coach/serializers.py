@@ -8,8 +8,8 @@ class SpeechAnalysisSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = SpeechAnalysis
-        fields = '__all__'
-        read_only_fields = ['created_at', 'updated_at']
+        exclude = ['feature_vector']
+        read_only_fields = ['feature_schema', 'created_at', 'updated_at']
 
 
 class SpeechPredictionInputSerializer(serializers.Serializer):
@@ -55,6 +55,7 @@ class SpeechPredictionInputSerializer(serializers.Serializer):
     # Optional
     words_per_minute = serializers.FloatField(required=False, allow_null=True)
     file_name = serializers.CharField(required=False, allow_blank=True)
+    explain = serializers.BooleanField(required=False, default=False)  # Add uncertainty and feature contributions
 
 
 class SpeechPredictionOutputSerializer(serializers.Serializer):
@@ -72,14 +73,42 @@ class SpeechPredictionOutputSerializer(serializers.Serializer):
 
     # Additional info
     transcript = serializers.CharField(required=False, allow_blank=True)
+    transcript_segments = serializers.ListField(child=serializers.DictField(), required=False)  # Per-chunk transcription
     duration = serializers.FloatField(required=False)  # Audio duration in seconds
     feedback = serializers.DictField(required=False)
     recommendations = serializers.ListField(required=False)
+    timeline = serializers.ListField(child=serializers.DictField(), required=False)  # Per-window scores
+    uncertainty = serializers.DictField(required=False)  # Spread across trees per target (explain)
+    contributions = serializers.DictField(required=False)  # Top feature contributions per target (explain)
 
 
-class AudioFileAnalysisSerializer(serializers.Serializer):
+class AnalysisOptionsSerializer(serializers.Serializer):
+    """
+    Options shared by every way of submitting a recording for analysis
+    """
+    category = serializers.CharField(required=False, allow_blank=True)
+    tier = serializers.ChoiceField(choices=['full', 'fast'], required=False, default='full')
+
+    # Optional per-window scores
+    timeline = serializers.BooleanField(required=False, default=False)
+    window_seconds = serializers.FloatField(required=False, default=30.0, min_value=5.0)
+    window_step_seconds = serializers.FloatField(required=False, default=15.0, min_value=1.0)
+
+    # Optional uncertainty and feature contributions (forest models only)
+    explain = serializers.BooleanField(required=False, default=False)
+
+
+class AudioFileAnalysisSerializer(AnalysisOptionsSerializer):
     """
     Serializer for audio file upload and analysis
     """
     audio_file = serializers.FileField(required=True)
-    category = serializers.CharField(required=False, allow_blank=True)
+
+
+class UploadSessionSerializer(AnalysisOptionsSerializer):
+    """
+    Serializer for opening a resumable chunked upload
+    """
+    file_name = serializers.CharField(max_length=255)
+    total_size = serializers.IntegerField(min_value=1)
+    chunk_size = serializers.IntegerField(required=False, min_value=1)
@@ -0,0 +1,40 @@
+"""
+Model signal handlers
+Keep the per-user progress rollups in step with SpeechAnalysis writes
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import SpeechAnalysis
+from .rollups import SCORE_FIELDS, rollup_snapshot, update_rollups
+
+
+@receiver(pre_save, sender=SpeechAnalysis)
+def capture_previous_scores(sender, instance, raw=False, **kwargs):
+    """Remember what the row contributed to the rollups before this save"""
+    instance._rollup_previous = None
+    if raw or instance.pk is None:
+        return
+
+    previous = (
+        SpeechAnalysis.objects
+        .filter(pk=instance.pk)
+        .only('user', 'category', 'created_at', *SCORE_FIELDS)
+        .first()
+    )
+    instance._rollup_previous = rollup_snapshot(previous)
+
+
+@receiver(post_save, sender=SpeechAnalysis)
+def update_progress_rollups(sender, instance, raw=False, **kwargs):
+    """Apply the score delta of a created or updated analysis"""
+    if raw:
+        return
+    update_rollups(getattr(instance, '_rollup_previous', None), rollup_snapshot(instance))
+    instance._rollup_previous = None
+
+
+@receiver(post_delete, sender=SpeechAnalysis)
+def remove_from_progress_rollups(sender, instance, **kwargs):
+    """Take a deleted analysis out of its buckets"""
+    update_rollups(rollup_snapshot(instance), None)
@@ -0,0 +1,319 @@
+"""
+Similar-speech retrieval
+Keeps the expert-labeled speeches (and optionally coach-reviewed analyses)
+as scaled feature vectors in memory and returns the nearest ones to a
+speech, so coaches can show students labeled examples that sounded alike
+"""
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .feature_vectors import CURRENT_FEATURE_SCHEMA, load_feature_matrix, schema_columns
+from .models import SpeechAnalysis, TrainingDataset
+from .rollups import SCORE_FIELDS
+
+
+TRAINING = 'training'
+ANALYSIS = 'analysis'
+
+
+class SimilarSpeechIndex:
+    """
+    Exact nearest-neighbour index over scaled speech features
+
+    Vectors are the predictor's features after SpeechPredictor.scaler (the
+    category is left out, so it is a filter rather than a distance), held in
+    one float32 matrix with cached squared norms; a query is a single
+    matrix-vector product. The index catches up with added and edited rows
+    at most every refresh_interval seconds (by updated_at, so rows saved by
+    any worker are picked up without rebuilding), and drops rows deleted
+    from the database every reconcile_interval seconds.
+    """
+
+    def __init__(self, predictor, model_version=None, include_analyses=False, refresh_interval=5.0,
+                 reconcile_interval=60.0):
+        """
+        Args:
+            predictor: Trained SpeechPredictor whose scaler defines the space
+            model_version: Version of that predictor (index is rebuilt on change)
+            include_analyses: Also index expert-labeled SpeechAnalysis rows
+            refresh_interval: Seconds between checks for new or edited rows
+            reconcile_interval: Seconds between checks for deleted rows
+        """
+        self.predictor = predictor
+        self.model_version = model_version
+        self.include_analyses = include_analyses
+        self.refresh_interval = refresh_interval
+        self.reconcile_interval = reconcile_interval
+
+        self.columns = [c for c in predictor.feature_columns if c != 'category_encoded']
+        self._scaled_columns = [predictor.feature_columns.index(c) for c in self.columns]
+
+        self._vectors = np.empty((0, len(self.columns)), dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._live = np.empty(0, dtype=bool)
+        self._size = 0
+        self._keys = []
+        self._categories = []
+        self._positions = {}
+
+        self._training_since = None
+        self._analyses_since = None
+        self._refreshed_at = float('-inf')
+        self._reconciled_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return int(self._live[:self._size].sum())
+
+    def embed(self, df):
+        """
+        Scale feature rows into the index space
+
+        Args:
+            df: DataFrame with feature columns and 'category' (missing
+                values get the predictor's training medians)
+
+        Returns:
+            np.ndarray: (n_rows, n_columns) float32 vectors
+        """
+        X, _ = self.predictor.preprocess_data(df)
+        scaled = self.predictor.scaler.transform(X)
+        return np.ascontiguousarray(scaled[:, self._scaled_columns], dtype=np.float32)
+
+    def upsert(self, keys, categories, vectors):
+        """Add rows, replacing any already indexed under the same key"""
+        with self._lock:
+            for key, category, vector in zip(keys, categories, vectors):
+                position = self._positions.get(key)
+                if position is None:
+                    position = self._append_slot()
+                    self._positions[key] = position
+                    self._keys.append(key)
+                    self._categories.append(category)
+                else:
+                    self._categories[position] = category
+                self._vectors[position] = vector
+                self._norms[position] = vector @ vector
+                self._live[position] = True
+
+    def remove(self, keys):
+        """Drop rows from the results (their slots are not reused)"""
+        with self._lock:
+            for key in keys:
+                position = self._positions.get(key)
+                if position is not None:
+                    self._live[position] = False
+
+    def _append_slot(self):
+        if self._size == len(self._vectors):
+            capacity = max(2 * len(self._vectors), 256)
+            vectors = np.zeros((capacity, len(self.columns)), dtype=np.float32)
+            vectors[:self._size] = self._vectors[:self._size]
+            norms = np.zeros(capacity, dtype=np.float32)
+            norms[:self._size] = self._norms[:self._size]
+            live = np.zeros(capacity, dtype=bool)
+            live[:self._size] = self._live[:self._size]
+            self._vectors, self._norms, self._live = vectors, norms, live
+        self._size += 1
+        return self._size - 1
+
+    def refresh(self, force=False):
+        """
+        Index rows added or changed since the last refresh, and drop deleted
+        rows when the reconcile interval has passed
+        """
+        now = time.monotonic()
+        if not force and now - self._refreshed_at < self.refresh_interval:
+            return
+        self._refreshed_at = now
+
+        self._refresh_training()
+        if self.include_analyses:
+            self._refresh_analyses()
+
+        if force or now - self._reconciled_at >= self.reconcile_interval:
+            self._reconciled_at = now
+            self.reconcile()
+
+    def _refresh_training(self):
+        columns = ['pk', 'category', *schema_columns(CURRENT_FEATURE_SCHEMA), 'updated_at']
+        changed = TrainingDataset.objects.all()
+        if self._training_since is not None:
+            changed = changed.filter(updated_at__gte=self._training_since)
+        df = pd.DataFrame.from_records(changed.values(*columns), columns=columns)
+        if df.empty:
+            return
+        self.upsert(
+            [(TRAINING, pk) for pk in df['pk']],
+            df['category'].fillna('').str.lower().tolist(),
+            self.embed(df.drop(columns='updated_at'))
+        )
+        # Rows saved in the same instant as the newest one are re-read next time
+        self._training_since = df['updated_at'].max().to_pydatetime()
+
+    def reconcile(self):
+        """Drop indexed rows that no longer exist (or are no longer labeled)"""
+        present = {
+            TRAINING: set(TrainingDataset.objects.values_list('pk', flat=True)),
+            ANALYSIS: set(
+                SpeechAnalysis.objects.filter(expert_labeled=True).values_list('pk', flat=True)
+            ) if self.include_analyses else set(),
+        }
+        with self._lock:
+            gone = [
+                (source, pk) for (source, pk), position in self._positions.items()
+                if self._live[position] and pk not in present[source]
+            ]
+        self.remove(gone)
+
+    def _refresh_analyses(self):
+        changed = SpeechAnalysis.objects.all()
+        if self._analyses_since is not None:
+            changed = changed.filter(updated_at__gte=self._analyses_since)
+        rows = list(changed.values_list('pk', 'category', 'expert_labeled', 'updated_at'))
+        if not rows:
+            return
+
+        labeled = {pk: category for pk, category, expert_labeled, _ in rows if expert_labeled}
+        self.remove([(ANALYSIS, pk) for pk, _, expert_labeled, _ in rows if not expert_labeled])
+        if labeled:
+            ids, matrix = load_feature_matrix(changed.filter(expert_labeled=True), with_ids=True)
+            df = pd.DataFrame(matrix, columns=schema_columns(CURRENT_FEATURE_SCHEMA))
+            df['category'] = [labeled[pk] or '' for pk in ids]
+            self.upsert(
+                [(ANALYSIS, int(pk)) for pk in ids],
+                [category.lower() for category in df['category']],
+                self.embed(df)
+            )
+        self._analyses_since = max(updated_at for *_, updated_at in rows)
+
+    def query(self, features, k=5, category=None, exclude=()):
+        """
+        Nearest indexed speeches to one speech
+
+        Args:
+            features: Feature dict (as extracted or stored for an analysis)
+            k: Number of neighbours
+            category: Only return speeches of this category
+            exclude: Keys to leave out (e.g. the analysis itself)
+
+        Returns:
+            list: (key, distance) pairs, nearest first
+        """
+        self.refresh()
+        query = self.embed(pd.DataFrame([features]))[0]
+
+        with self._lock:
+            size = self._size
+            # ||v - q||^2 = ||v||^2 - 2 v.q + ||q||^2
+            distances = self._norms[:size] - 2 * (self._vectors[:size] @ query) + query @ query
+            allowed = self._live[:size].copy()
+            if category:
+                allowed &= np.array(self._categories[:size]) == category.lower()
+            for key in exclude:
+                position = self._positions.get(key)
+                if position is not None:
+                    allowed[position] = False
+            keys = self._keys[:size]
+
+        candidates = np.flatnonzero(allowed)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(distances[candidates], k)[:k]]
+        candidates = candidates[np.argsort(distances[candidates])]
+        return [(keys[i], float(np.sqrt(max(distances[i], 0.0)))) for i in candidates]
+
+
+def similar_speeches(index, features, k=5, category=None, exclude=(), max_attempts=3):
+    """
+    The k nearest indexed speeches that still exist, with their labels
+
+    Twice as many neighbours as asked for are fetched, so rows deleted since
+    the last reconcile do not leave the answer short; any that turn up are
+    removed from the index and the search is repeated.
+
+    Args:
+        index: SimilarSpeechIndex
+        features: Feature dict of the speech to match
+        k: Number of neighbours
+        category: Only return speeches of this category
+        exclude: Keys to leave out (e.g. the analysis itself)
+        max_attempts: Searches before settling for fewer than k
+
+    Returns:
+        list: describe_neighbours() rows, nearest first
+    """
+    results = []
+    for _ in range(max_attempts):
+        neighbours = index.query(features, k=2 * k, category=category, exclude=exclude)
+        results = describe_neighbours(neighbours)
+        if len(results) >= k:
+            return results[:k]
+        found = {(row['source'], row['id']) for row in results}
+        missing = [key for key, _ in neighbours if key not in found]
+        if not missing:
+            break  # Fewer than k indexed speeches match
+        index.remove(missing)
+    return results
+
+
+def describe_neighbours(neighbours):
+    """
+    Load the labels and coach notes of query results
+
+    Rows deleted since they were indexed are dropped.
+
+    Returns:
+        list: One dict per neighbour with source, id, file_name, category,
+            distance, the eight scores, strengths and areas_for_improvement
+    """
+    fields = ['pk', 'file_name', 'category', *SCORE_FIELDS, 'strengths', 'areas_for_improvement']
+    sources = {TRAINING: TrainingDataset, ANALYSIS: SpeechAnalysis}
+    rows = {}
+    for source, model in sources.items():
+        pks = [pk for (key_source, pk), _ in neighbours if key_source == source]
+        if pks:
+            rows[source] = {row['pk']: row for row in model.objects.filter(pk__in=pks).values(*fields)}
+
+    results = []
+    for (source, pk), distance in neighbours:
+        row = rows.get(source, {}).get(pk)
+        if row is None:
+            continue
+        row = dict(row)
+        results.append({'source': source, 'id': row.pop('pk'), 'distance': round(distance, 4), **row})
+    return results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_similar_index(predictor, model_version, include_analyses=False, refresh_interval=5.0,
+                      reconcile_interval=60.0):
+    """
+    Process-wide index for the served model, rebuilt when the model changes
+
+    A new model may scale features differently, so its index is built from
+    scratch; otherwise the existing index is returned and catches up lazily.
+    """
+    global _index
+    with _index_lock:
+        if (
+            _index is None
+            or _index.predictor is not predictor
+            or _index.model_version != model_version
+            or _index.include_analyses != include_analyses
+        ):
+            index = SimilarSpeechIndex(
+                predictor,
+                model_version=model_version,
+                include_analyses=include_analyses,
+                refresh_interval=refresh_interval,
+                reconcile_interval=reconcile_interval
+            )
+            index.refresh(force=True)
+            _index = index
+        return _index
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from ml_models.speech_predictor import SpeechPredictor
+
+CATEGORIES = ['Informative', 'Motivational', 'Persuasive']
+
+
+def feature_rows(n, seed=0):
+    """n random feature dicts with a category, as the predict endpoint takes them"""
+    rng = np.random.default_rng(seed)
+    columns = [c for c in SpeechPredictor.FEATURE_COLUMNS if c != 'category_encoded']
+    rows = []
+    for i in range(n):
+        row = {column: float(rng.normal()) for column in columns}
+        row['category'] = CATEGORIES[i % len(CATEGORIES)]
+        rows.append(row)
+    return rows
+
+
+def trained_predictor(n_rows=60, seed=0):
+    """Small random forest fitted on synthetic rows whose scores follow two features"""
+    df = pd.DataFrame(feature_rows(n_rows, seed))
+    signal = df['loud_mean'] + 0.5 * df['pitch_std']
+    for offset, target in enumerate(SpeechPredictor.TARGET_COLUMNS):
+        df[target] = np.clip(np.round(3 + signal + 0.1 * offset), 1, 5).astype(int)
+    return SpeechPredictor().fit(df)
@@ -0,0 +1,155 @@
+import asyncio
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from speech_coach import async_views
+from speech_coach.admission import AdmissionController, AdmissionRejected, client_address
+
+from .fixtures import feature_rows, trained_predictor
+
+
+class AdmissionControllerTests(SimpleTestCase):
+    """Bounded slots, bounded queue and per-user quotas"""
+
+    def test_queued_request_runs_after_release(self):
+        admission = AdmissionController('test', max_concurrent=1, max_queue=1, queue_timeout=5)
+        first = admission.acquire('a')
+        admitted = threading.Event()
+
+        def wait_for_slot():
+            with admission.admit('b'):
+                admitted.set()
+
+        waiter = threading.Thread(target=wait_for_slot)
+        waiter.start()
+        time.sleep(0.1)
+        self.assertEqual(admission.stats()['waiting'], 1)
+        self.assertFalse(admitted.is_set())
+
+        admission.release(first)
+        waiter.join(5)
+        self.assertTrue(admitted.is_set())
+        stats = admission.stats()
+        self.assertEqual((stats['running'], stats['waiting'], stats['admitted']), (0, 0, 2))
+
+    def test_full_queue_rejects_immediately(self):
+        admission = AdmissionController('test', max_concurrent=1, max_queue=0, queue_timeout=5)
+        ticket = admission.acquire()
+        started = time.monotonic()
+        with self.assertRaises(AdmissionRejected) as rejected:
+            admission.acquire()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertGreaterEqual(rejected.exception.retry_after, 1)
+        self.assertEqual(admission.counters['rejected_queue_full'], 1)
+        admission.release(ticket)
+
+    def test_queue_wait_times_out(self):
+        admission = AdmissionController('test', max_concurrent=1, max_queue=1, queue_timeout=0.2)
+        ticket = admission.acquire()
+        with self.assertRaises(AdmissionRejected):
+            admission.acquire('b')
+        self.assertEqual(admission.counters['rejected_timeout'], 1)
+        # The timed-out waiter holds nothing afterwards
+        self.assertEqual(admission.stats()['waiting'], 0)
+        admission.release(ticket)
+        admission.release(admission.acquire('b'))
+
+    def test_per_user_quota(self):
+        admission = AdmissionController('test', max_concurrent=4, per_user_limit=2)
+        tickets = [admission.acquire('alice'), admission.acquire('alice')]
+        with self.assertRaises(AdmissionRejected):
+            admission.acquire('alice')
+        self.assertEqual(admission.counters['rejected_user_quota'], 1)
+        tickets.append(admission.acquire('bob'))
+        for ticket in tickets:
+            admission.release(ticket)
+        admission.release(admission.acquire('alice'))
+
+    def test_box_slots_shared_across_controllers(self):
+        with tempfile.TemporaryDirectory() as lock_dir:
+            # Two controllers stand in for two worker processes on one box
+            first = AdmissionController('box', max_concurrent=2, queue_timeout=0.2, box_slots=1, lock_dir=lock_dir)
+            second = AdmissionController('box', max_concurrent=2, queue_timeout=0.2, box_slots=1, lock_dir=lock_dir)
+            ticket = first.acquire()
+            with self.assertRaises(AdmissionRejected):
+                second.acquire()
+            first.release(ticket)
+            second.release(second.acquire())
+
+    def test_cancelled_async_waiter_gives_its_slot_back(self):
+        admission = AdmissionController('test', max_concurrent=1, max_queue=1, queue_timeout=5)
+
+        async def scenario():
+            ticket = admission.acquire()
+
+            async def waiter():
+                async with async_views._admitted(admission, 'client'):
+                    pass
+
+            task = asyncio.ensure_future(waiter())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The executor thread is still queued; it gets the slot once freed
+            admission.release(ticket)
+            for _ in range(50):
+                if admission.stats()['running'] == 0 and admission.stats()['waiting'] == 0:
+                    break
+                await asyncio.sleep(0.02)
+
+        asyncio.run(scenario())
+        stats = admission.stats()
+        self.assertEqual((stats['running'], stats['waiting'], stats['admitted']), (0, 0, 2))
+
+
+class ClientAddressTests(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get(
+            '/', REMOTE_ADDR='10.0.0.2', HTTP_X_FORWARDED_FOR='1.2.3.4, 203.0.113.9'
+        )
+
+    def test_forwarded_for_ignored_without_trusted_proxies(self):
+        self.assertEqual(client_address(self.request, trusted_proxies=0), '10.0.0.2')
+
+    def test_trusted_proxy_hop_used(self):
+        self.assertEqual(client_address(self.request, trusted_proxies=1), '203.0.113.9')
+        self.assertEqual(client_address(self.request, trusted_proxies=2), '1.2.3.4')
+
+
+@override_settings(TRUSTED_PROXY_COUNT=0)
+class OverloadResponseTests(TestCase):
+    """A request that is not admitted gets a fast 429 with Retry-After"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.predictor = trained_predictor()
+
+    def test_predict_returns_429_when_saturated(self):
+        admission = AdmissionController('predict', max_concurrent=1, max_queue=0, queue_timeout=1)
+        ticket = admission.acquire()
+        try:
+            with mock.patch('speech_coach.views.predict_admission', admission), \
+                    mock.patch('speech_coach.views.model_registry.get', return_value=self.predictor):
+                response = APIClient().post('/api/speech-analysis/predict/', feature_rows(1)[0], format='json')
+        finally:
+            admission.release(ticket)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['error'], 'Server busy')
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_predict_admitted_when_free(self):
+        admission = AdmissionController('predict', max_concurrent=1, max_queue=0, queue_timeout=1)
+        with mock.patch('speech_coach.views.predict_admission', admission), \
+                mock.patch('speech_coach.views.model_registry.get', return_value=self.predictor):
+            response = APIClient().post('/api/speech-analysis/predict/', feature_rows(1)[0], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(admission.stats()['running'], 0)
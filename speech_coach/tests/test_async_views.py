@@ -0,0 +1,47 @@
+import asyncio
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ml_models.batch_scheduler import PredictionBatcher
+from speech_coach import async_views
+
+
+class SlowPredictor:
+    """Batch call that takes long enough for a client to give up on it"""
+
+    TARGET_COLUMNS = ['overall']
+
+    def predict_batch(self, rows):
+        time.sleep(0.2)
+        return [[row['id']] for row in rows]
+
+
+class AsyncPredictTests(SimpleTestCase):
+    """A cancelled async predict must not affect other predictions"""
+
+    def test_cancelled_predict_leaves_the_batcher_working(self):
+        # A long window keeps the row queued when its client goes away
+        batcher = PredictionBatcher(max_batch_size=8, max_wait_ms=100)
+        predictor = SlowPredictor()
+        submitted = []
+
+        def submit(*args):
+            submitted.append(PredictionBatcher.submit(batcher, *args))
+            return submitted[-1]
+
+        async def scenario():
+            task = asyncio.ensure_future(async_views._predict(predictor, {'id': 1}))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return await asyncio.wait_for(async_views._predict(predictor, {'id': 2}), timeout=5)
+
+        with mock.patch.object(async_views, 'prediction_batcher', batcher), \
+                mock.patch.object(batcher, 'submit', submit):
+            self.assertEqual(asyncio.run(scenario()), {'overall': 2})
+        # The shared future was never cancelled, only the client's wait on it
+        self.assertEqual(submitted[0].result(timeout=5), {'overall': 1})
+        self.assertTrue(batcher._thread.is_alive())
@@ -0,0 +1,73 @@
+import hashlib
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase
+
+from speech_coach.audio_storage import ranged_audio_response
+
+
+class RangedAudioResponseTests(SimpleTestCase):
+    """Single-range requests, conditional requests and invalid ranges"""
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        storage = FileSystemStorage(location=root)
+        self.data = bytes(range(256)) * 4
+        digest = hashlib.sha256(self.data).hexdigest()
+        name = storage.save(f'speeches/{digest[:2]}/{digest}.ogg', ContentFile(self.data))
+        self.field_file = SimpleNamespace(name=name, size=len(self.data), storage=storage)
+        self.etag = f'"{digest}"'
+        self.factory = RequestFactory()
+
+    def _get(self, **headers):
+        response = ranged_audio_response(self.factory.get('/audio/', **headers), self.field_file)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_whole_file(self):
+        response, body = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+        self.assertEqual(response['Content-Length'], str(len(self.data)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'audio/ogg')
+        self.assertEqual(response['ETag'], self.etag)
+
+    def test_bounded_range(self):
+        response, body = self._get(HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.data)}')
+        self.assertEqual(response['Content-Length'], '100')
+
+    def test_open_ended_and_clamped_ranges(self):
+        response, body = self._get(HTTP_RANGE='bytes=1000-')
+        self.assertEqual((response.status_code, body), (206, self.data[1000:]))
+        response, body = self._get(HTTP_RANGE='bytes=1000-99999')
+        self.assertEqual(response['Content-Range'], f'bytes 1000-{len(self.data) - 1}/{len(self.data)}')
+        self.assertEqual(body, self.data[1000:])
+
+    def test_suffix_range(self):
+        response, body = self._get(HTTP_RANGE='bytes=-10')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[-10:])
+
+    def test_unsatisfiable_range(self):
+        for header in (f'bytes={len(self.data)}-', 'bytes=500-100', 'bytes=-'):
+            with self.subTest(range=header):
+                response, _ = self._get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    def test_unparseable_range_serves_whole_file(self):
+        response, body = self._get(HTTP_RANGE='bytes=0-10,20-30')
+        self.assertEqual((response.status_code, body), (200, self.data))
+
+    def test_matching_etag_is_not_modified(self):
+        response, body = self._get(HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual((response.status_code, body), (304, b''))
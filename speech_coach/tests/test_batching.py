@@ -0,0 +1,106 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from ml_models.batch_scheduler import PredictionBatcher
+
+
+class FakePredictor:
+    """Scores a row as its 'id' feature plus the predictor's offset"""
+
+    TARGET_COLUMNS = ['overall', 'speech_pace']
+
+    def __init__(self, offset, fail_batches=False):
+        self.offset = offset
+        self.fail_batches = fail_batches
+        self.batch_sizes = []
+
+    def _score(self, features):
+        if features.get('bad'):
+            raise ValueError(f"bad row {features['id']}")
+        return [features['id'] + self.offset, -(features['id'] + self.offset)]
+
+    def predict_batch(self, rows):
+        self.batch_sizes.append(len(rows))
+        if self.fail_batches and any(row.get('bad') for row in rows):
+            raise ValueError('batch contains a bad row')
+        return [self._score(row) for row in rows]
+
+    def predict(self, features):
+        return dict(zip(self.TARGET_COLUMNS, self._score(features)))
+
+
+class PredictionBatcherTests(SimpleTestCase):
+    """Every caller must get its own row's scores back, whatever batch it joined"""
+
+    def _submit_concurrently(self, batcher, calls):
+        results = [None] * len(calls)
+        barrier = threading.Barrier(len(calls))
+
+        def call(i, predictor, features):
+            barrier.wait()
+            try:
+                results[i] = batcher.predict(predictor, features, timeout=5)
+            except Exception as e:
+                results[i] = e
+
+        threads = [
+            threading.Thread(target=call, args=(i, predictor, features))
+            for i, (predictor, features) in enumerate(calls)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_results_routed_to_their_callers(self):
+        batcher = PredictionBatcher(max_batch_size=8, max_wait_ms=50)
+        predictor = FakePredictor(offset=0)
+        results = self._submit_concurrently(batcher, [(predictor, {'id': i}) for i in range(20)])
+
+        self.assertEqual(results, [{'overall': i, 'speech_pace': -i} for i in range(20)])
+        self.assertLess(batcher.batches, 20)
+        self.assertTrue(all(size <= 8 for size in predictor.batch_sizes))
+
+    def test_rows_grouped_by_predictor_and_feature_set(self):
+        batcher = PredictionBatcher(max_batch_size=32, max_wait_ms=50)
+        first, second = FakePredictor(offset=0), FakePredictor(offset=100)
+        calls = []
+        for i in range(12):
+            predictor = first if i % 2 else second
+            features = {'id': i, 'extra': 1.0} if i % 3 == 0 else {'id': i}
+            calls.append((predictor, features))
+        results = self._submit_concurrently(batcher, calls)
+
+        for (predictor, features), result in zip(calls, results):
+            self.assertEqual(result['overall'], features['id'] + predictor.offset)
+
+    def test_failing_row_does_not_fail_its_batch(self):
+        batcher = PredictionBatcher(max_batch_size=16, max_wait_ms=50)
+        predictor = FakePredictor(offset=0, fail_batches=True)
+        calls = [(predictor, {'id': i, 'bad': i == 3}) for i in range(6)]
+        results = self._submit_concurrently(batcher, calls)
+
+        self.assertIsInstance(results[3], ValueError)
+        for i in (0, 1, 2, 4, 5):
+            self.assertEqual(results[i], {'overall': i, 'speech_pace': -i})
+
+    def test_cancelled_submit_does_not_stop_the_batcher(self):
+        batcher = PredictionBatcher(max_batch_size=8, max_wait_ms=50)
+        predictor = FakePredictor(offset=0)
+        cancelled = batcher.submit(predictor, {'id': 1})
+        self.assertTrue(cancelled.cancel())
+
+        # Dispatched after the cancelled row; must still resolve
+        self.assertEqual(batcher.predict(predictor, {'id': 2}, timeout=2), {'overall': 2, 'speech_pace': -2})
+        self.assertTrue(batcher._thread.is_alive())
+
+    def test_dead_thread_is_restarted(self):
+        batcher = PredictionBatcher(max_batch_size=8, max_wait_ms=1)
+        predictor = FakePredictor(offset=0)
+        batcher.predict(predictor, {'id': 1}, timeout=2)
+        batcher._thread = threading.Thread(target=lambda: None)
+        batcher._thread.start()
+        batcher._thread.join()
+        self.assertEqual(batcher.predict(predictor, {'id': 3}, timeout=2)['overall'], 3)
@@ -0,0 +1,39 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from .fixtures import feature_rows, trained_predictor
+
+
+class ExplainTests(SimpleTestCase):
+    """Path contributions must add up to the forest's prediction"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.predictor = trained_predictor()
+        cls.rows = feature_rows(12, seed=1)
+
+    def test_bias_plus_contributions_equals_mean(self):
+        result = self.predictor.explain_batch(self.rows)
+        reconstructed = result['bias'][None, :] + result['contributions'].sum(axis=2)
+        np.testing.assert_allclose(reconstructed, result['mean'], atol=1e-9)
+
+    def test_scores_match_predict_batch(self):
+        result = self.predictor.explain_batch(self.rows)
+        np.testing.assert_array_equal(result['scores'], self.predictor.predict_batch(self.rows))
+
+    def test_explain_single_row_is_additive_after_rounding(self):
+        explanation = self.predictor.explain(self.rows[0])
+        for target, contribution in explanation['contributions'].items():
+            with self.subTest(target=target):
+                total = contribution['bias'] + sum(contribution['features'].values())
+                # Every term is rounded to 4 decimals
+                tolerance = 1e-4 * (len(contribution['features']) + 2)
+                self.assertAlmostEqual(total, explanation['uncertainty'][target]['mean'], delta=tolerance)
+
+    def test_top_n_keeps_largest_contributions(self):
+        full = self.predictor.explain(self.rows[0])
+        top = self.predictor.explain(self.rows[0], top_n=3)
+        for target in top['contributions']:
+            kept = list(top['contributions'][target]['features'])
+            self.assertEqual(kept, list(full['contributions'][target]['features'])[:3])
@@ -0,0 +1,37 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from ml_models.extraction_pool import ExtractionPool, per_process_pool_size
+
+
+class PoolSizeTests(SimpleTestCase):
+    def test_machine_budget_split_across_web_workers(self):
+        self.assertEqual(per_process_pool_size(8, 4), 2)
+        self.assertEqual(per_process_pool_size(5, 2), 2)
+        self.assertEqual(per_process_pool_size(2, 4), 1)
+        self.assertEqual(per_process_pool_size(0, 4), 0)
+        self.assertEqual(per_process_pool_size(3, 0), 3)
+
+
+class ExtractionPoolTests(SimpleTestCase):
+    """Warm-up and respawns must not count against the task timeout"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Warm-up (numba compilation, a 2 s extraction) takes longer than this timeout
+        cls.pool = ExtractionPool(1, task_timeout=1.0, queue_timeout=60.0, max_tasks_per_worker=1)
+        cls.signal = (np.random.default_rng(0).standard_normal(22050) * 0.1).astype(np.float32)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def test_fresh_and_recycled_workers_complete_tasks(self):
+        for _ in range(2):  # The second task lands on a just-respawned worker
+            result = self.pool.analyze(self.signal, features=['loud_mean'])
+            self.assertIn('loud_mean', result['features'])
+        stats = self.pool.stats()
+        self.assertEqual(stats['timeouts'], 0)
+        self.assertGreaterEqual(stats['recycled'], 1)
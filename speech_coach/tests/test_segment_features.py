@@ -0,0 +1,42 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from ml_models.audio_processor import AudioFeatureExtractor
+
+
+class SegmentedExtractionTests(SimpleTestCase):
+    """Segment-parallel extraction must reproduce the single-pass features"""
+
+    sr = 22050
+
+    def _signal_with_silence(self):
+        rng = np.random.default_rng(0)
+        t = np.arange(30 * self.sr) / self.sr
+        y = 0.3 * np.sin(2 * np.pi * (180 + 40 * np.sin(2 * np.pi * 0.5 * t)) * t)
+        y += 0.05 * rng.standard_normal(t.size)
+        # A quiet stretch spanning a whole segment and a run of digital
+        # silence, so per-segment dB floors would differ from the recording's
+        y[int(8 * self.sr):int(17 * self.sr)] *= 1e-4
+        y[int(20 * self.sr):int(23 * self.sr)] = 0.0
+        return y.astype(np.float32)
+
+    def test_segmented_matches_single_pass(self):
+        y = self._signal_with_silence()
+        single = AudioFeatureExtractor().extract_features_from_signal(y)
+        # workers=1 runs the segments inline, exercising the same merge
+        segmented_extractor = AudioFeatureExtractor(workers=1, segment_seconds=8.0)
+        segmented = segmented_extractor.extract_features_from_signal(y)
+
+        self.assertIn('segments', segmented_extractor.timings)
+        self.assertEqual(set(single), set(segmented))
+        for name, value in single.items():
+            with self.subTest(feature=name):
+                self.assertAlmostEqual(segmented[name], value, delta=1e-5 * max(abs(value), 1.0))
+
+    def test_spectral_contrast_uses_recording_wide_floor(self):
+        y = self._signal_with_silence()
+        single = AudioFeatureExtractor().extract_features_from_signal(y, features=['spectral_flux'])
+        segmented = AudioFeatureExtractor(workers=1, segment_seconds=8.0).extract_features_from_signal(
+            y, features=['spectral_flux']
+        )
+        self.assertAlmostEqual(segmented['spectral_flux'], single['spectral_flux'], places=9)
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import numpy as np
+import speech_recognition as sr
+from django.test import SimpleTestCase
+
+from ml_models.audio_processor import AudioFeatureExtractor
+
+
+class FakeRecognizer:
+    """
+    Names each chunk by the burst it holds (bursts differ in amplitude) and
+    answers the earliest chunks last, so completion order is reversed
+    """
+
+    def __init__(self, n_bursts, fail=()):
+        self.n_bursts = n_bursts
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, audio_data):
+        pcm = np.frombuffer(audio_data.get_raw_data(), dtype='<i2')
+        burst = int(round(np.abs(pcm).max() / 32767 / 0.1)) - 1
+        with self._lock:
+            self.calls.append(burst)
+        time.sleep(0.02 * (self.n_bursts - burst))
+        if burst in self.fail:
+            raise sr.RequestError('recognizer unavailable')
+        return f'burst {burst}'
+
+
+class ChunkedTranscriptionTests(SimpleTestCase):
+    """Chunked transcription must keep time order and survive a failing chunk"""
+
+    n_bursts = 5
+
+    def _bursts(self, extractor):
+        # 3 s tones 2 s apart; burst i peaks at 0.1 * (i + 1)
+        t = np.arange(int(3 * extractor.sr)) / extractor.sr
+        tone = np.sin(2 * np.pi * 220 * t)
+        gap = np.zeros(int(2 * extractor.sr))
+        parts = []
+        for i in range(self.n_bursts):
+            parts += [gap, 0.1 * (i + 1) * tone]
+        return np.concatenate(parts + [gap]).astype(np.float32)
+
+    def _extractor(self):
+        return AudioFeatureExtractor(transcribe_workers=4, transcribe_chunk_seconds=4.0)
+
+    def test_chunks_returned_in_time_order(self):
+        extractor = self._extractor()
+        recognizer = FakeRecognizer(self.n_bursts)
+        segments = extractor.transcribe_chunks(self._bursts(extractor), recognize=recognizer)
+
+        self.assertEqual([s['text'] for s in segments], [f'burst {i}' for i in range(self.n_bursts)])
+        self.assertEqual(sorted(recognizer.calls), list(range(self.n_bursts)))
+        starts = [s['start'] for s in segments]
+        self.assertEqual(starts, sorted(starts))
+        for segment in segments:
+            self.assertLessEqual(segment['end'] - segment['start'], 4.0)
+            self.assertIsNone(segment['error'])
+
+    def test_failing_chunk_keeps_the_others(self):
+        extractor = self._extractor()
+        recognizer = FakeRecognizer(self.n_bursts, fail={2})
+        y = self._bursts(extractor)
+        segments = extractor.transcribe_chunks(y, recognize=recognizer)
+
+        self.assertEqual(segments[2]['text'], '')
+        self.assertIn('Could not request results', segments[2]['error'])
+        self.assertEqual(
+            [s['text'] for i, s in enumerate(segments) if i != 2],
+            [f'burst {i}' for i in range(self.n_bursts) if i != 2]
+        )
+
+        transcript = extractor.extract_transcript_from_signal(y, recognize=recognizer)
+        self.assertEqual(transcript, 'burst 0 burst 1 burst 3 burst 4')
+        self.assertEqual(len(extractor.transcript_segments), self.n_bursts)
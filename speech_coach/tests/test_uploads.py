@@ -0,0 +1,203 @@
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from speech_coach.uploads import UploadError, UploadLimitExceeded, UploadNotFound, UploadStore
+
+
+class UploadStoreTests(SimpleTestCase):
+    """Chunk writes, resume, assembly and the session limits"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.store = UploadStore(self.root, max_sessions_per_client=2, max_total_bytes=1000)
+        self.data = bytes(range(256)) * 2 + b'tail'  # 516 bytes: 5 chunks of 100, last of 16
+
+    def _chunk(self, index, size=100):
+        return self.data[index * size:(index + 1) * size]
+
+    def test_chunks_in_any_order_assemble_to_the_original(self):
+        session = self.store.create('talk.webm', len(self.data), 100)
+        self.assertEqual(session['total_chunks'], 6)
+        for index in (5, 2, 0, 2, 4, 1, 3):  # Out of order, with a repeat
+            session = self.store.write_chunk(session['upload_id'], index, io.BytesIO(self._chunk(index)))
+
+        self.assertEqual(session['missing'], [])
+        session, audio_path = self.store.assemble(session['upload_id'])
+        self.assertTrue(session['complete'])
+        self.assertEqual(audio_path.read_bytes(), self.data)
+        # Assembling again is a no-op
+        self.assertEqual(self.store.assemble(session['upload_id'])[1], audio_path)
+
+    def test_status_lists_missing_chunks_for_resume(self):
+        upload_id = self.store.create('talk.webm', len(self.data), 100)['upload_id']
+        for index in (0, 1, 3):
+            self.store.write_chunk(upload_id, index, io.BytesIO(self._chunk(index)))
+
+        session = self.store.get(upload_id)
+        self.assertEqual(session['received'], [0, 1, 3])
+        self.assertEqual(session['missing'], [2, 4, 5])
+        with self.assertRaises(UploadError):
+            self.store.assemble(upload_id)
+
+    def test_rejects_bad_chunks(self):
+        upload_id = self.store.create('talk.webm', len(self.data), 100)['upload_id']
+        with self.assertRaises(UploadError):
+            self.store.write_chunk(upload_id, 0, io.BytesIO(self._chunk(0)[:50]))
+        with self.assertRaises(UploadError):
+            self.store.write_chunk(upload_id, 6, io.BytesIO(b''))
+        with self.assertRaises(UploadError):
+            self.store.write_chunk(upload_id, 0, io.BytesIO(self._chunk(0)), sha256='0' * 64)
+
+        digest = hashlib.sha256(self._chunk(0)).hexdigest()
+        session = self.store.write_chunk(upload_id, 0, io.BytesIO(self._chunk(0)), sha256=digest)
+        self.assertEqual(session['received'], [0])
+
+    def test_sessions_are_private_to_their_owner(self):
+        upload_id = self.store.create('talk.webm', len(self.data), 100, owner=1)['upload_id']
+        with self.assertRaises(UploadNotFound):
+            self.store.get(upload_id, owner=2)
+        with self.assertRaises(UploadNotFound):
+            self.store.get(upload_id)
+        self.assertEqual(self.store.get(upload_id, owner=1)['upload_id'], upload_id)
+
+    def test_per_client_session_cap(self):
+        first = self.store.create('a.webm', 10, 10, client='addr:1.2.3.4')
+        self.store.create('b.webm', 10, 10, client='addr:1.2.3.4')
+        with self.assertRaises(UploadLimitExceeded):
+            self.store.create('c.webm', 10, 10, client='addr:1.2.3.4')
+        self.store.create('c.webm', 10, 10, client='addr:5.6.7.8')
+
+        # Finishing a session frees its place
+        self.store.write_chunk(first['upload_id'], 0, io.BytesIO(b'x' * 10))
+        self.store.assemble(first['upload_id'])
+        self.store.create('c.webm', 10, 10, client='addr:1.2.3.4')
+
+    def test_total_bytes_cap(self):
+        self.store.create('a.webm', 600, 100)
+        with self.assertRaises(UploadLimitExceeded):
+            self.store.create('b.webm', 600, 100)
+
+    def test_result_replaces_the_assembled_recording(self):
+        upload_id = self.store.create('a.webm', 10, 10)['upload_id']
+        self.store.write_chunk(upload_id, 0, io.BytesIO(b'x' * 10))
+        _, audio_path = self.store.assemble(upload_id)
+
+        self.store.store_result(upload_id, {'overall': 4})
+        self.assertFalse(audio_path.exists())
+        self.assertEqual(self.store.result(upload_id), {'overall': 4})
+        self.assertTrue(self.store.get(upload_id)['analyzed'])
+        with self.assertRaises(UploadError):
+            self.store.assemble(upload_id)
+
+    def test_completed_sessions_expire_sooner(self):
+        store = UploadStore(self.root, ttl=3600, completed_ttl=0)
+        done = store.create('a.webm', 10, 10)['upload_id']
+        store.write_chunk(done, 0, io.BytesIO(b'x' * 10))
+        store.assemble(done)
+        open_id = store.create('b.webm', 10, 10)['upload_id']
+
+        store.prune()
+        with self.assertRaises(UploadNotFound):
+            store.get(done)
+        self.assertEqual(store.get(open_id)['upload_id'], open_id)
+
+
+class UploadEndpointTests(TestCase):
+    """Create, chunk, resume and finalize through the API"""
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.store = UploadStore(root, max_sessions_per_client=1)
+        patcher = mock.patch('speech_coach.views.upload_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def _create(self, total_size=250, chunk_size=100):
+        return self.client.post(
+            '/api/speech-analysis/uploads/',
+            {'file_name': 'talk.webm', 'total_size': total_size, 'chunk_size': chunk_size},
+            format='json'
+        )
+
+    def _put(self, upload_id, index, body):
+        return self.client.put(
+            f'/api/speech-analysis/uploads/{upload_id}/chunks/{index}/', body,
+            content_type='application/octet-stream'
+        )
+
+    def test_resume_then_finalize(self):
+        response = self._create()
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.json()['upload_id']
+
+        self.assertEqual(self._put(upload_id, 0, b'a' * 100).status_code, 200)
+        self.assertEqual(self._put(upload_id, 2, b'c' * 50).status_code, 200)
+        self.assertEqual(self._put(upload_id, 1, b'b' * 99).status_code, 400)
+
+        status = self.client.get(f'/api/speech-analysis/uploads/{upload_id}/').json()
+        self.assertEqual((status['received'], status['missing']), ([0, 2], [1]))
+
+        finalize = self.client.post(f'/api/speech-analysis/uploads/{upload_id}/finalize/')
+        self.assertEqual(finalize.status_code, 409)
+        self.assertEqual(finalize.json()['missing'], [1])
+
+        self._put(upload_id, 1, b'b' * 100)
+        self.store.assemble(upload_id)
+        self.store.store_result(upload_id, {'overall': 3})
+        # A client that lost the response finalizes again and gets it back
+        finalize = self.client.post(f'/api/speech-analysis/uploads/{upload_id}/finalize/')
+        self.assertEqual(finalize.status_code, 200)
+        self.assertEqual(finalize.json(), {'overall': 3})
+
+    def test_concurrent_finalize_analyzes_once(self):
+        upload_id = self._create(total_size=100).json()['upload_id']
+        self._put(upload_id, 0, b'a' * 100)
+        calls = []
+
+        def slow_analysis(view, request, predictor, model_version, model_dir, audio_path, *args):
+            calls.append(upload_id)
+            time.sleep(0.2)
+            audio_path.read_bytes()  # Fails if another finalize removed it
+            return Response({'overall': 4}, status=status.HTTP_200_OK)
+
+        predictor = mock.Mock(is_trained=True)
+        responses = []
+
+        def finalize():
+            responses.append(APIClient().post(f'/api/speech-analysis/uploads/{upload_id}/finalize/'))
+
+        with mock.patch('speech_coach.views.SpeechAnalysisViewSet._analyze_audio', slow_analysis), \
+                mock.patch('speech_coach.views.SpeechAnalysisViewSet._select_predictor',
+                           return_value=(predictor, 'v1', None)):
+            threads = [threading.Thread(target=finalize) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([(r.status_code, r.json()) for r in responses], [(200, {'overall': 4})] * 2)
+
+    def test_session_cap_returns_429(self):
+        self.assertEqual(self._create().status_code, 201)
+        response = self._create()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['error'], 'Too many uploads')
+
+    def test_unknown_upload(self):
+        response = self.client.get(f"/api/speech-analysis/uploads/{'0' * 32}/")
+        self.assertEqual(response.status_code, 404)
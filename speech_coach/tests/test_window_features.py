@@ -0,0 +1,43 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from ml_models.audio_processor import AudioFeatureExtractor
+
+
+class WindowFeatureTests(SimpleTestCase):
+    """A window spanning the whole recording must reproduce the single-pass features"""
+
+    sr = 22050
+
+    def _signal(self):
+        rng = np.random.default_rng(0)
+        t = np.arange(12 * self.sr) / self.sr
+        y = 0.3 * np.sin(2 * np.pi * (180 + 40 * np.sin(2 * np.pi * 0.5 * t)) * t)
+        y += 0.05 * rng.standard_normal(t.size)
+        # Digital silence and a quiet stretch, so pauses are not trivial
+        y[3 * self.sr:5 * self.sr] = 0.0
+        y[8 * self.sr:9 * self.sr] *= 1e-3
+        return y.astype(np.float32)
+
+    def test_whole_recording_window_matches_single_pass(self):
+        y = self._signal()
+        single = AudioFeatureExtractor().extract_features_from_signal(y)
+        windows = AudioFeatureExtractor().extract_window_features(y, window_seconds=20.0, step_seconds=10.0)
+
+        self.assertEqual(len(windows), 1)
+        window = windows[0]
+        self.assertGreater(single['pause_ratio'], 0.1)
+        self.assertAlmostEqual(window['pause_ratio'], single['pause_ratio'], places=12)
+        for name, value in single.items():
+            if name not in window:
+                continue
+            with self.subTest(feature=name):
+                # Window sums run in float64 over float32 frame series
+                self.assertAlmostEqual(window[name], value, delta=1e-5 * max(abs(value), 1.0))
+
+    def test_window_pause_ratio_counts_its_own_silence(self):
+        windows = AudioFeatureExtractor().extract_window_features(self._signal(), window_seconds=4.0, step_seconds=2.0)
+        by_start = {window['start']: window for window in windows}
+        # The 2-6 s window holds the 2 s of digital silence
+        self.assertGreater(by_start[2.0]['pause_ratio'], 0.45)
+        self.assertLess(by_start[0.0]['pause_ratio'], by_start[2.0]['pause_ratio'])
@@ -0,0 +1,359 @@
+"""
+Resumable chunked uploads
+Large recordings arrive as numbered chunks written straight to local disk,
+so an interrupted upload resumes where it stopped and no worker ever holds
+the whole file in memory
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: limits are checked without a box-wide lock
+    fcntl = None
+
+
+UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class UploadError(Exception):
+    """Raised for a chunk or finalize call the session cannot accept"""
+
+
+class UploadNotFound(UploadError):
+    """Raised for an unknown, expired or foreign upload id"""
+
+
+class UploadLimitExceeded(UploadError):
+    """Raised when a new session would exceed a per-client or total limit"""
+
+
+class UploadStore:
+    """
+    Upload sessions kept as directories under root
+
+    Each session directory holds session.json (file name, sizes, analysis
+    options, owner), one file per received chunk and, after finalize, the
+    assembled recording. Once the recording has been analyzed it is
+    replaced by result.json, so finalizing again returns the same response
+    without keeping the audio. Chunks are written to a temporary file and
+    renamed into place, so a duplicate chunk simply replaces an identical
+    one, chunks may arrive in any order, and every worker on the machine
+    sees the same sessions.
+    """
+
+    def __init__(self, root, ttl=24 * 3600, max_bytes=200 * 1024 ** 2, max_chunk_bytes=8 * 1024 ** 2,
+                 completed_ttl=15 * 60, max_sessions_per_client=4, max_total_bytes=4 * 1024 ** 3):
+        """
+        Args:
+            root: Directory for the session directories
+            ttl: Seconds after its last activity that a session is deleted
+            max_bytes: Largest recording accepted
+            max_chunk_bytes: Largest chunk size a client may choose
+            completed_ttl: Seconds an assembled or analyzed session is kept
+            max_sessions_per_client: Sessions one client (user or anonymous
+                address) may have open before it finalizes them
+            max_total_bytes: Bytes all open sessions together may reserve
+        """
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_chunk_bytes = max_chunk_bytes
+        self.completed_ttl = completed_ttl
+        self.max_sessions_per_client = max_sessions_per_client
+        self.max_total_bytes = max_total_bytes
+
+    def _session_dir(self, upload_id):
+        if not UPLOAD_ID.match(upload_id or ''):
+            raise UploadNotFound('Unknown upload')
+        return self.root / upload_id
+
+    @contextmanager
+    def _create_lock(self):
+        """Serialize session creation across workers so limits hold"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / '.create.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _open_sessions(self):
+        """Metadata of every session still receiving chunks"""
+        sessions = []
+        for session_dir in self.root.iterdir():
+            if (session_dir / 'audio').exists() or (session_dir / 'result.json').exists():
+                continue
+            try:
+                with open(session_dir / 'session.json') as f:
+                    sessions.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sessions
+
+    def create(self, file_name, total_size, chunk_size, options=None, owner=None, client=None):
+        """
+        Open an upload session
+
+        Args:
+            file_name: Original file name (its extension picks the decoder)
+            total_size: Size of the whole recording in bytes
+            chunk_size: Size of every chunk but the last
+            options: Analysis options applied at finalize
+            owner: Optional user id allowed to use the session
+            client: Quota key (user or anonymous address) the session counts
+                against
+
+        Returns:
+            dict: Session metadata including 'upload_id' and 'total_chunks'
+
+        Raises:
+            UploadError: Bad sizes
+            UploadLimitExceeded: The client or the store has no room left
+        """
+        if total_size < 1 or total_size > self.max_bytes:
+            raise UploadError(f'total_size must be between 1 and {self.max_bytes} bytes')
+        if chunk_size < 1 or chunk_size > self.max_chunk_bytes:
+            raise UploadError(f'chunk_size must be between 1 and {self.max_chunk_bytes} bytes')
+
+        self.prune()
+        with self._create_lock():
+            open_sessions = self._open_sessions()
+            if client is not None and self.max_sessions_per_client:
+                held = sum(1 for session in open_sessions if session.get('client') == client)
+                if held >= self.max_sessions_per_client:
+                    raise UploadLimitExceeded(
+                        f'At most {self.max_sessions_per_client} unfinished uploads per client'
+                    )
+            reserved = sum(session['total_size'] for session in open_sessions)
+            if self.max_total_bytes and reserved + total_size > self.max_total_bytes:
+                raise UploadLimitExceeded('Upload storage is full')
+
+            upload_id = uuid.uuid4().hex
+            session = {
+                'upload_id': upload_id,
+                'file_name': Path(file_name).name,
+                'total_size': total_size,
+                'chunk_size': chunk_size,
+                'total_chunks': math.ceil(total_size / chunk_size),
+                'options': options or {},
+                'owner': owner,
+                'client': client,
+                'created_at': time.time(),
+            }
+            session_dir = self._session_dir(upload_id)
+            (session_dir / 'chunks').mkdir(parents=True)
+            with open(session_dir / 'session.json', 'w') as f:
+                json.dump(session, f)
+        return session
+
+    def get(self, upload_id, owner=None):
+        """
+        Load a session and the chunks received so far
+
+        Raises:
+            UploadNotFound: Unknown or expired id, or another user's session
+        """
+        session_dir = self._session_dir(upload_id)
+        try:
+            with open(session_dir / 'session.json') as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            raise UploadNotFound('Unknown upload')
+        if session['owner'] is not None and session['owner'] != owner:
+            raise UploadNotFound('Unknown upload')
+
+        session['received'] = sorted(
+            int(path.stem) for path in (session_dir / 'chunks').glob('*.part')
+        )
+        session['analyzed'] = (session_dir / 'result.json').exists()
+        session['complete'] = session['analyzed'] or (session_dir / 'audio').exists()
+        if session['complete']:
+            session['received'] = list(range(session['total_chunks']))
+        session['missing'] = sorted(set(range(session['total_chunks'])) - set(session['received']))
+        return session
+
+    def expected_size(self, session, index):
+        """Byte length chunk index must have"""
+        if index == session['total_chunks'] - 1:
+            return session['total_size'] - session['chunk_size'] * index
+        return session['chunk_size']
+
+    def write_chunk(self, upload_id, index, stream, owner=None, sha256=None, read_size=64 * 1024):
+        """
+        Stream one chunk from a file-like object to disk
+
+        Args:
+            upload_id: Session id
+            index: Zero-based chunk number
+            stream: Readable request body
+            owner: Requesting user id
+            sha256: Optional hex digest the chunk must match
+
+        Returns:
+            dict: Updated session (see get)
+
+        Raises:
+            UploadNotFound: Unknown session
+            UploadError: Bad index, wrong size or checksum mismatch
+        """
+        session = self.get(upload_id, owner)
+        if session['complete']:
+            return session
+        if not 0 <= index < session['total_chunks']:
+            raise UploadError(f"Chunk index must be between 0 and {session['total_chunks'] - 1}")
+
+        expected = self.expected_size(session, index)
+        chunks_dir = self._session_dir(upload_id) / 'chunks'
+        digest = hashlib.sha256()
+        written = 0
+        fd, temp_path = tempfile.mkstemp(dir=chunks_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while written <= expected:
+                    data = stream.read(min(read_size, expected + 1 - written))
+                    if not data:
+                        break
+                    f.write(data)
+                    digest.update(data)
+                    written += len(data)
+            if written != expected:
+                raise UploadError(f'Chunk {index} must be {expected} bytes, got {written}')
+            if sha256 and digest.hexdigest() != sha256.lower():
+                raise UploadError(f'Chunk {index} does not match its checksum')
+            os.replace(temp_path, chunks_dir / f'{index}.part')
+        finally:
+            Path(temp_path).unlink(missing_ok=True)
+
+        return self.get(upload_id, owner)
+
+    def assemble(self, upload_id, owner=None):
+        """
+        Join the chunks into the recording (idempotent)
+
+        Returns:
+            tuple: (session, path of the assembled recording)
+
+        Raises:
+            UploadError: Chunks are still missing
+        """
+        session = self.get(upload_id, owner)
+        session_dir = self._session_dir(upload_id)
+        audio_path = session_dir / 'audio'
+        if session['analyzed']:
+            raise UploadError('Upload was already analyzed')
+        if session['complete']:
+            return session, audio_path
+        if session['missing']:
+            raise UploadError(f"Missing chunks: {session['missing'][:20]}")
+
+        fd, temp_path = tempfile.mkstemp(dir=session_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                for index in range(session['total_chunks']):
+                    with open(session_dir / 'chunks' / f'{index}.part', 'rb') as chunk:
+                        shutil.copyfileobj(chunk, output)
+            os.replace(temp_path, audio_path)
+        except FileNotFoundError:
+            # A concurrent finalize assembled and removed the chunks first
+            if not audio_path.exists():
+                raise
+        finally:
+            Path(temp_path).unlink(missing_ok=True)
+
+        shutil.rmtree(session_dir / 'chunks', ignore_errors=True)
+        return self.get(upload_id, owner), audio_path
+
+    @contextmanager
+    def finalizing(self, upload_id, owner=None):
+        """
+        Hold a session's finalize lock, so concurrent finalize calls run one
+        at a time and later ones find the stored result
+
+        Raises:
+            UploadNotFound: Unknown session
+        """
+        self.get(upload_id, owner)
+        if fcntl is None:
+            yield
+            return
+        try:
+            lock_file = open(self._session_dir(upload_id) / '.finalize.lock', 'a')
+        except OSError:
+            raise UploadNotFound('Unknown upload')  # Pruned meanwhile
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def store_result(self, upload_id, result):
+        """
+        Keep the analysis response and delete the assembled recording
+
+        Args:
+            upload_id: Session id
+            result: JSON-serializable analyze response
+        """
+        session_dir = self._session_dir(upload_id)
+        fd, temp_path = tempfile.mkstemp(dir=session_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(temp_path, session_dir / 'result.json')
+        finally:
+            Path(temp_path).unlink(missing_ok=True)
+        (session_dir / 'audio').unlink(missing_ok=True)
+
+    def result(self, upload_id, owner=None):
+        """
+        Analysis response stored for a finalized session
+
+        Returns:
+            dict: Response data, or None before the recording was analyzed
+        """
+        self.get(upload_id, owner)
+        try:
+            with open(self._session_dir(upload_id) / 'result.json') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def delete(self, upload_id):
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+
+    def prune(self):
+        """
+        Delete sessions idle for longer than the TTL, and assembled or
+        analyzed ones after the shorter completed TTL
+        """
+        if not self.root.exists():
+            return
+        now = time.time()
+        for session_dir in self.root.iterdir():
+            if not session_dir.is_dir():
+                continue
+            try:
+                last_activity = max(
+                    (path.stat().st_mtime for path in session_dir.rglob('*')),
+                    default=session_dir.stat().st_mtime
+                )
+            except OSError:
+                continue
+            completed = (session_dir / 'audio').exists() or (session_dir / 'result.json').exists()
+            if last_activity < now - (self.completed_ttl if completed else self.ttl):
+                shutil.rmtree(session_dir, ignore_errors=True)
@@ -1,10 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import SpeechAnalysisViewSet
 
 router = DefaultRouter()
 router.register(r'speech-analysis', SpeechAnalysisViewSet, basename='speech-analysis')
 
 urlpatterns = [
+    # Async variants for ASGI deployments
+    path('speech-analysis/async/analyze/', async_views.analyze, name='speech-analysis-async-analyze'),
+    path('speech-analysis/async/predict/', async_views.predict, name='speech-analysis-async-predict'),
     path('', include(router.urls)),
 ]
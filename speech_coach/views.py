@@ -3,20 +3,116 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.conf import settings
 from pathlib import Path
+import io
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from .admission import AdmissionController, AdmissionRejected, client_key
+from .audio_storage import ranged_audio_response
+from .coalescing import SingleFlight, request_key
+from .feature_vectors import unpack_features
 from .models import SpeechAnalysis
+from .rollups import SCORE_FIELDS, progress_trends
 from .serializers import (
     SpeechAnalysisSerializer,
     SpeechPredictionInputSerializer,
     SpeechPredictionOutputSerializer,
-    AudioFileAnalysisSerializer
+    AudioFileAnalysisSerializer,
+    UploadSessionSerializer
 )
+from .similarity import ANALYSIS, get_similar_index, similar_speeches
+from .uploads import UploadError, UploadLimitExceeded, UploadNotFound, UploadStore
 
 # Add ml_models to path
 sys.path.append(str(Path(settings.BASE_DIR) / 'ml_models'))
-from speech_predictor import SpeechPredictor
+from model_registry import ModelRegistry
 from audio_processor import AudioFeatureExtractor
+from batch_scheduler import PredictionBatcher
+from extraction_pool import ExtractionPool, per_process_pool_size, score_timeline
+
+
+# Shared by every request in this process; hot-swaps to newly published models
+model_registry = ModelRegistry(
+    settings.ML_MODELS_DIR,
+    reload_interval=getattr(settings, 'ML_MODEL_RELOAD_INTERVAL', 5.0)
+)
+
+# Optional latency-budgeted model (ml_models/train_budgeted.py) for tier='fast'
+fast_model_registry = ModelRegistry(
+    settings.ML_FAST_MODELS_DIR,
+    reload_interval=getattr(settings, 'ML_MODEL_RELOAD_INTERVAL', 5.0)
+) if getattr(settings, 'ML_FAST_MODELS_DIR', None) else None
+
+# Admission control: analyze is CPU-heavy and limited per process and per box;
+# predict is a separate, wider lane so cheap calls are not stuck behind uploads
+analyze_admission = AdmissionController(
+    'analyze',
+    max_concurrent=getattr(settings, 'ANALYZE_MAX_CONCURRENT', 2),
+    max_queue=getattr(settings, 'ANALYZE_MAX_QUEUE', 8),
+    queue_timeout=getattr(settings, 'ANALYZE_QUEUE_TIMEOUT', 30.0),
+    per_user_limit=getattr(settings, 'ANALYZE_PER_USER_LIMIT', 2),
+    box_slots=getattr(settings, 'ANALYZE_BOX_SLOTS', None),
+    lock_dir=getattr(settings, 'ADMISSION_LOCK_DIR', None)
+)
+predict_admission = AdmissionController(
+    'predict',
+    max_concurrent=getattr(settings, 'PREDICT_MAX_CONCURRENT', 16),
+    max_queue=getattr(settings, 'PREDICT_MAX_QUEUE', 64),
+    queue_timeout=getattr(settings, 'PREDICT_QUEUE_TIMEOUT', 5.0),
+    per_user_limit=getattr(settings, 'PREDICT_PER_USER_LIMIT', 8)
+)
+
+# Concurrent single-row predictions are scored together (0 ms window disables)
+prediction_batcher = PredictionBatcher(
+    max_batch_size=getattr(settings, 'PREDICT_MAX_BATCH_SIZE', 32),
+    max_wait_ms=settings.PREDICT_BATCH_WINDOW_MS,
+    timeout=getattr(settings, 'PREDICT_BATCH_TIMEOUT', 30.0)
+) if getattr(settings, 'PREDICT_BATCH_WINDOW_MS', 0) else None
+
+# Optional warm extraction processes: EXTRACTION_POOL_SIZE is the machine's
+# budget, split across the web workers; workers are spawned on the first analysis
+extraction_pool = ExtractionPool(
+    per_process_pool_size(settings.EXTRACTION_POOL_SIZE, getattr(settings, 'WEB_WORKERS', 1)),
+    extractor_kwargs={
+        'res_type': getattr(settings, 'AUDIO_RESAMPLE_TYPE', 'soxr_hq'),
+        'voiced_only': getattr(settings, 'AUDIO_VOICED_ONLY', False),
+    },
+    task_timeout=getattr(settings, 'EXTRACTION_TASK_TIMEOUT', 120.0),
+    queue_timeout=getattr(settings, 'EXTRACTION_QUEUE_TIMEOUT', 30.0),
+    max_tasks_per_worker=getattr(settings, 'EXTRACTION_MAX_TASKS_PER_WORKER', 500),
+    reload_interval=getattr(settings, 'ML_MODEL_RELOAD_INTERVAL', 5.0)
+) if getattr(settings, 'EXTRACTION_POOL_SIZE', 0) else None
+
+# Identical analyze requests in flight (client retries) share one analysis
+analyze_flight = SingleFlight(
+    lock_dir=getattr(settings, 'ANALYZE_COALESCE_DIR', None),
+    result_ttl=getattr(settings, 'ANALYZE_COALESCE_TTL', 30.0),
+    wait_timeout=getattr(settings, 'ANALYZE_COALESCE_WAIT', 120.0)
+)
+
+# Resumable chunked uploads, shared by every worker on the machine
+upload_store = UploadStore(
+    settings.UPLOAD_SESSION_DIR,
+    ttl=getattr(settings, 'UPLOAD_SESSION_TTL', 24 * 3600),
+    max_bytes=getattr(settings, 'UPLOAD_MAX_BYTES', 200 * 1024 ** 2),
+    max_chunk_bytes=getattr(settings, 'UPLOAD_MAX_CHUNK_BYTES', 8 * 1024 ** 2),
+    completed_ttl=getattr(settings, 'UPLOAD_COMPLETED_TTL', 15 * 60),
+    max_sessions_per_client=getattr(settings, 'UPLOAD_MAX_SESSIONS_PER_CLIENT', 4),
+    max_total_bytes=getattr(settings, 'UPLOAD_MAX_TOTAL_BYTES', 4 * 1024 ** 3)
+)
+
+
+def build_audio_extractor():
+    """AudioFeatureExtractor configured from settings (one per request)"""
+    return AudioFeatureExtractor(
+        res_type=getattr(settings, 'AUDIO_RESAMPLE_TYPE', 'soxr_hq'),
+        voiced_only=getattr(settings, 'AUDIO_VOICED_ONLY', False),
+        workers=getattr(settings, 'AUDIO_EXTRACTION_WORKERS', 0),
+        segment_seconds=getattr(settings, 'AUDIO_SEGMENT_SECONDS', 30.0),
+        transcribe_workers=getattr(settings, 'TRANSCRIBE_WORKERS', 4),
+        transcribe_chunk_seconds=getattr(settings, 'TRANSCRIBE_CHUNK_SECONDS', 30.0),
+    )
 
 
 class SpeechAnalysisViewSet(viewsets.ModelViewSet):
@@ -32,15 +128,11 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
         self._load_model()
 
     def _load_model(self):
-        """Load the trained ML model"""
+        """Get the currently published ML model from the shared registry"""
         try:
-            model_dir = settings.ML_MODELS_DIR
-            if Path(model_dir).exists():
-                self.predictor = SpeechPredictor()
-                self.predictor.load(model_dir)
-                print("ML model loaded successfully")
-            else:
-                print(f"Warning: Model directory not found at {model_dir}")
+            self.predictor = model_registry.get()
+            if self.predictor is None:
+                print(f"Warning: No trained model found at {settings.ML_MODELS_DIR}")
                 print("Please train the model first using: python ml_models/train_model.py")
         except Exception as e:
             print(f"Error loading model: {e}")
@@ -71,8 +163,14 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
 
         # Get predictions
         try:
-            features = input_serializer.validated_data
-            predictions = self.predictor.predict(features)
+            features = dict(input_serializer.validated_data)
+            explain = features.pop('explain') and self.predictor.can_explain
+            explanation = {}
+            with predict_admission.admit(client_key(request)):
+                if explain:
+                    predictions, explanation = self._explain(self.predictor, features)
+                else:
+                    predictions = self._predict(self.predictor, features)
 
             # Generate feedback
             feedback = self._generate_feedback(predictions, features)
@@ -81,6 +179,7 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
             # Prepare response
             response_data = {
                 **predictions,
+                **explanation,
                 'feedback': feedback,
                 'recommendations': recommendations
             }
@@ -91,6 +190,9 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
             else:
                 return Response(response_data, status=status.HTTP_200_OK)
 
+        except AdmissionRejected as e:
+            return self._overloaded(e)
+
         except Exception as e:
             return Response(
                 {'error': 'Prediction failed', 'details': str(e)},
@@ -103,8 +205,10 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
         Analyze audio file and predict speech quality scores
 
         POST /api/speech-analysis/analyze/
-        Body: FormData with audio_file and category
-        Returns: Predicted scores (1-5 scale) with feedback
+        Body: FormData with audio_file and category (optional: tier, explain, timeline,
+              window_seconds, window_step_seconds)
+        Returns: Predicted scores (1-5 scale) with feedback, plus per-window
+                 scores when timeline is set
         """
         # Debug logging
         print("=== Analyze Endpoint Called ===")
@@ -121,57 +225,227 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        predictor, model_version, model_dir = self._select_predictor(
+            input_serializer.validated_data.get('tier')
+        )
+
         # Check if model is loaded
-        if self.predictor is None or not self.predictor.is_trained:
+        if predictor is None or not predictor.is_trained:
             return Response(
                 {'error': 'ML model not loaded. Please train the model first.'},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
 
+        # Get uploaded file
+        audio_file = input_serializer.validated_data['audio_file']
+        audio_bytes = audio_file.read()
+
+        # Determine file extension
+        file_name = audio_file.name
+        file_extension = file_name.split('.')[-1] if '.' in file_name else 'webm'
+
+        options = {
+            name: value
+            for name, value in input_serializer.validated_data.items()
+            if name != 'audio_file'
+        }
+        return self._analyze_audio(
+            request, predictor, model_version, model_dir, audio_bytes, file_extension, options
+        )
+
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def create_upload(self, request):
+        """
+        Open a resumable chunked upload
+
+        POST /api/speech-analysis/uploads/
+        Body: file_name, total_size (bytes), optional chunk_size and the
+              analyze options (category, tier, timeline, ...)
+        Returns: upload_id, chunk_size and total_chunks (429 when the client
+                 has too many unfinished uploads or upload storage is full)
+        """
+        input_serializer = UploadSessionSerializer(data=request.data)
+        if not input_serializer.is_valid():
+            return Response(
+                {'error': 'Invalid input', 'details': input_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = dict(input_serializer.validated_data)
+        file_name = data.pop('file_name')
+        total_size = data.pop('total_size')
+        chunk_size = data.pop('chunk_size', None) or getattr(settings, 'UPLOAD_CHUNK_BYTES', 1024 ** 2)
         try:
-            # Get uploaded file
-            audio_file = input_serializer.validated_data['audio_file']
-            category = input_serializer.validated_data.get('category', '')
-
-            # Extract features from audio file
-            audio_extractor = AudioFeatureExtractor()
-            audio_bytes = audio_file.read()
-
-            # Determine file extension
-            file_name = audio_file.name
-            file_extension = file_name.split('.')[-1] if '.' in file_name else 'webm'
-
-            # Extract features
-            features = audio_extractor.extract_features_from_bytes(
-                audio_bytes,
-                file_extension=file_extension
+            session = upload_store.create(
+                file_name, total_size, chunk_size, options=data,
+                owner=self._upload_owner(request), client=client_key(request)
             )
+        except UploadLimitExceeded as e:
+            return Response({'error': 'Too many uploads', 'details': str(e)},
+                            status=status.HTTP_429_TOO_MANY_REQUESTS)
+        except UploadError as e:
+            return Response({'error': 'Invalid input', 'details': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            # Extract transcript
-            transcript = audio_extractor.extract_transcript_from_bytes(
-                audio_bytes,
-                file_extension=file_extension
+        return Response(self._upload_status(upload_store.get(session['upload_id'], session['owner'])),
+                        status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path=r'uploads/(?P<upload_id>[0-9a-f]{32})')
+    def upload_status(self, request, upload_id=None):
+        """
+        Get the chunks received so far, to resume an interrupted upload
+
+        GET /api/speech-analysis/uploads/<upload_id>/
+        Returns: received and missing chunk indices
+        """
+        try:
+            session = upload_store.get(upload_id, self._upload_owner(request))
+        except UploadNotFound as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self._upload_status(session), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['put'], url_path=r'uploads/(?P<upload_id>[0-9a-f]{32})/chunks/(?P<index>[0-9]+)')
+    def upload_chunk(self, request, upload_id=None, index=None):
+        """
+        Upload one chunk (raw bytes; repeats and any order are fine)
+
+        PUT /api/speech-analysis/uploads/<upload_id>/chunks/<index>/
+        Body: Chunk bytes (optional X-Chunk-SHA256 header to verify them)
+        Returns: received and missing chunk indices
+        """
+        try:
+            session = upload_store.write_chunk(
+                upload_id,
+                int(index),
+                request.stream or io.BytesIO(),  # Read in blocks, never buffered whole
+                owner=self._upload_owner(request),
+                sha256=request.META.get('HTTP_X_CHUNK_SHA256')
             )
+        except UploadNotFound as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except UploadError as e:
+            return Response({'error': 'Invalid chunk', 'details': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self._upload_status(session), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path=r'uploads/(?P<upload_id>[0-9a-f]{32})/finalize')
+    def finalize_upload(self, request, upload_id=None):
+        """
+        Assemble a completed upload and analyze it
 
-            # Add category if provided
-            if category:
-                features['category'] = category
+        POST /api/speech-analysis/uploads/<upload_id>/finalize/
+        Returns: Same response as /api/speech-analysis/analyze/ (409 with the
+                 missing chunks if the upload is incomplete)
+        """
+        owner = self._upload_owner(request)
+        try:
+            session = upload_store.get(upload_id, owner)
+        except UploadNotFound as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        if session['missing']:
+            return Response(
+                {'error': 'Upload incomplete', **self._upload_status(session)},
+                status=status.HTTP_409_CONFLICT
+            )
+        options = session['options']
+        predictor, model_version, model_dir = self._select_predictor(options.get('tier'))
 
-            # Get predictions
-            predictions = self.predictor.predict(features)
+        # Concurrent finalize calls for one session run one at a time: the
+        # first analyzes and stores the result, the others return it
+        try:
+            with upload_store.finalizing(upload_id, owner):
+                return self._finalize_locked(
+                    request, upload_id, owner, predictor, model_version, model_dir, options
+                )
+        except UploadNotFound as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+    def _finalize_locked(self, request, upload_id, owner, predictor, model_version, model_dir, options):
+        """Body of finalize_upload, run under the session's finalize lock"""
+        # A client that lost the response, or a duplicate call, gets it again
+        result = upload_store.result(upload_id, owner)
+        if result is not None:
+            return Response(result, status=status.HTTP_200_OK)
+
+        if predictor is None or not predictor.is_trained:
+            return Response(
+                {'error': 'ML model not loaded. Please train the model first.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
-            # Generate feedback
-            feedback = self._generate_feedback(predictions, features)
-            recommendations = self._generate_recommendations(predictions)
+        try:
+            session, audio_path = upload_store.assemble(upload_id, owner)
+        except UploadError as e:
+            return Response({'error': 'Upload incomplete', 'details': str(e)}, status=status.HTTP_409_CONFLICT)
+
+        file_name = session['file_name']
+        file_extension = file_name.split('.')[-1] if '.' in file_name else 'webm'
+        response = self._analyze_audio(
+            request, predictor, model_version, model_dir, audio_path, file_extension, options
+        )
+        if response.status_code == status.HTTP_200_OK:
+            # Keep the response, not the recording; a failed analysis keeps
+            # the recording until UPLOAD_COMPLETED_TTL so it can be retried
+            try:
+                upload_store.store_result(upload_id, response.data)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Could not store the result of upload {upload_id}: {e}")
+        elif not audio_path.exists():
+            # Without fcntl nothing serializes finalize; a concurrent call
+            # stored the result and removed the recording mid-analysis
+            result = upload_store.result(upload_id, owner)
+            if result is not None:
+                return Response(result, status=status.HTTP_200_OK)
+        return response
+
+    @staticmethod
+    def _upload_owner(request):
+        return request.user.pk if request.user.is_authenticated else None
+
+    @staticmethod
+    def _upload_status(session):
+        return {
+            name: session[name]
+            for name in ('upload_id', 'file_name', 'total_size', 'chunk_size',
+                         'total_chunks', 'received', 'missing', 'complete')
+        }
 
-            # Prepare response
-            response_data = {
-                **predictions,
-                'transcript': transcript,
-                'duration': features.get('duration', 0),  # Audio duration in seconds
-                'feedback': feedback,
-                'recommendations': recommendations
-            }
+    def _select_predictor(self, tier):
+        """
+        Model for a request's tier; the fast tier falls back to the full
+        model when none is published
+
+        Returns:
+            tuple: (predictor, model_version, model_dir)
+        """
+        if tier == 'fast' and fast_model_registry is not None:
+            fast_predictor = fast_model_registry.get()
+            if fast_predictor is not None:
+                return fast_predictor, f'fast:{fast_model_registry.version}', settings.ML_FAST_MODELS_DIR
+        return self.predictor, model_registry.version, settings.ML_MODELS_DIR
+
+    def _analyze_audio(self, request, predictor, model_version, model_dir, audio, file_extension, options):
+        """
+        Analyze one recording (bytes, or the path of an assembled upload)
+        behind coalescing and admission control
+
+        Returns:
+            Response: analyze response
+        """
+        try:
+            # Retries of the same upload wait for the first one's result
+            key = request_key(
+                audio,
+                file_extension=file_extension,
+                model_version=model_version,
+                **options
+            )
+            response_data, shared = analyze_flight.do(
+                key,
+                lambda: self._run_admitted(
+                    client_key(request), predictor, audio, file_extension, options, model_dir
+                )
+            )
+            if shared:
+                print(f"Coalesced duplicate analyze request {key[:12]}")
 
             output_serializer = SpeechPredictionOutputSerializer(data=response_data)
             if output_serializer.is_valid():
@@ -179,6 +453,9 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
             else:
                 return Response(response_data, status=status.HTTP_200_OK)
 
+        except AdmissionRejected as e:
+            return self._overloaded(e)
+
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -187,6 +464,152 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _run_admitted(self, user_key, predictor, audio, file_extension, options, model_dir=None):
+        """Run the analysis once admission control grants a slot"""
+        with analyze_admission.admit(user_key):
+            return self._run_analysis(predictor, audio, file_extension, options, model_dir)
+
+    def _overloaded(self, rejection):
+        """Fast 429 telling the client when to retry"""
+        print(f"Admission rejected: {rejection.reason}")
+        return Response(
+            {'error': 'Server busy', 'details': rejection.reason, 'retry_after': rejection.retry_after},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': str(rejection.retry_after)}
+        )
+
+    def _run_analysis(self, predictor, audio, file_extension, options, model_dir=None):
+        """
+        Decode, extract, transcribe and score one upload (audio bytes or a
+        file path)
+
+        With an extraction pool, extraction and scoring run in a warm worker
+        process (by the current model in model_dir) while this thread
+        transcribes.
+
+        Returns:
+            dict: Response data for analyze
+        """
+        category = options.get('category', '')
+        explain = options.get('explain') and predictor.can_explain
+        timeline = None
+        explanation = {}
+
+        # Extract features from audio file
+        audio_extractor = build_audio_extractor()
+
+        # Decode once; features and transcript share the same PCM
+        signal = audio_extractor.decode(audio, file_extension=file_extension)
+
+        if extraction_pool is not None and model_dir is not None:
+            with ThreadPoolExecutor(max_workers=1) as transcriber:
+                transcription = transcriber.submit(audio_extractor.extract_transcript_from_signal, signal)
+                result = extraction_pool.analyze(
+                    signal,
+                    model_dir=model_dir,
+                    category=category,
+                    timeline=(options['window_seconds'], options['window_step_seconds'])
+                    if options.get('timeline') else None
+                )
+                transcript = transcription.result()
+            if 'predictions' not in result:
+                raise RuntimeError('No trained model available to the extraction workers')
+            features, predictions = result['features'], result['predictions']
+            timeline = result.get('timeline')
+            if explain:
+                predictions, explanation = self._explain(predictor, features)
+        else:
+            # Extract only the features the loaded model uses
+            features = audio_extractor.extract_features_from_signal(
+                signal,
+                features=predictor.feature_columns
+            )
+
+            # Extract transcript
+            transcript = audio_extractor.extract_transcript_from_signal(signal)
+
+            # Add category if provided
+            if category:
+                features['category'] = category
+
+            # Get predictions
+            if explain:
+                predictions, explanation = self._explain(predictor, features)
+            else:
+                predictions = self._predict(predictor, features)
+
+            if options.get('timeline'):
+                timeline = self._score_timeline(
+                    predictor,
+                    audio_extractor,
+                    signal,
+                    category,
+                    options['window_seconds'],
+                    options['window_step_seconds']
+                )
+
+        # Generate feedback
+        feedback = self._generate_feedback(predictions, features)
+        recommendations = self._generate_recommendations(predictions)
+
+        # Prepare response
+        response_data = {
+            **predictions,
+            **explanation,
+            'transcript': transcript,
+            'duration': features.get('duration', 0),  # Audio duration in seconds
+            'feedback': feedback,
+            'recommendations': recommendations
+        }
+
+        if timeline is not None:
+            response_data['timeline'] = timeline
+
+        # Long recordings are transcribed in chunks; report each one
+        if audio_extractor.transcript_segments is not None:
+            response_data['transcript_segments'] = audio_extractor.transcript_segments
+
+        return response_data
+
+    def _predict(self, predictor, features):
+        """Score one speech, micro-batched with concurrent requests when enabled"""
+        if prediction_batcher is None:
+            return predictor.predict(features)
+        return prediction_batcher.predict(predictor, features)
+
+    def _explain(self, predictor, features):
+        """
+        Score one speech with per-target uncertainty and top feature
+        contributions, read off the same forest pass as the scores
+
+        Returns:
+            tuple: (scores dict, {'uncertainty': ..., 'contributions': ...})
+        """
+        explanation = predictor.explain(features, top_n=getattr(settings, 'EXPLAIN_TOP_FEATURES', 5))
+        return explanation.pop('scores'), explanation
+
+    def _score_timeline(self, predictor, audio_extractor, signal, category, window_seconds, step_seconds):
+        """
+        Score sliding windows of a recording in one batched prediction
+
+        Returns:
+            list: {'start', 'end', <target>: score, ...} per window
+        """
+        return score_timeline(predictor, audio_extractor, signal, category, window_seconds, step_seconds)
+
+    @action(detail=False, methods=['get'])
+    def admission(self, request):
+        """
+        Get admission control state for this worker
+
+        GET /api/speech-analysis/admission/
+        Returns: Running, queued and rejected counts per lane
+        """
+        return Response({
+            'analyze': analyze_admission.stats(),
+            'predict': predict_admission.stats(),
+        }, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['get'])
     def model_info(self, request):
         """
@@ -202,9 +625,10 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
 
         try:
             info = {
+                'model_version': model_registry.version,
                 'model_type': self.predictor.model_type,
                 'is_trained': self.predictor.is_trained,
-                'features': self.predictor.FEATURE_COLUMNS,
+                'features': self.predictor.feature_columns,
                 'targets': self.predictor.TARGET_COLUMNS,
             }
 
@@ -221,6 +645,130 @@ class SpeechAnalysisViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['get'])
+    def progress(self, request):
+        """
+        Get weekly score trends for a user from the progress rollups
+
+        GET /api/speech-analysis/progress/?user=<id>&category=<category>&metrics=overall,speech_pace
+        Returns the authenticated user's trends; only staff may pass another
+        user id. Cost depends on the number of weekly buckets, not on the
+        size of the user's history.
+        """
+        if not request.user.is_authenticated:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        user_id = request.query_params.get('user', request.user.pk)
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Invalid input', 'details': {'user': ['A valid user id is required.']}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if user_id != request.user.pk and not request.user.is_staff:
+            return Response(
+                {'error': "Only staff can view another user's progress"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        metrics = request.query_params.get('metrics')
+        metrics = [m.strip() for m in metrics.split(',') if m.strip()] if metrics else None
+        unknown = [m for m in metrics or [] if m not in SCORE_FIELDS]
+        if unknown:
+            return Response(
+                {'error': 'Invalid input', 'details': {'metrics': [f'Unknown metrics: {unknown}']}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        trends = progress_trends(
+            user_id,
+            category=request.query_params.get('category'),
+            metrics=metrics
+        )
+        return Response(trends, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'])
+    def audio(self, request, pk=None):
+        """
+        Stream the stored recording of an analysis
+
+        GET /api/speech-analysis/<id>/audio/
+        Supports Range requests (206 Partial Content) for seeking, and
+        If-None-Match for recordings already cached by the client
+        """
+        analysis = self.get_object()
+        if not analysis.audio_file:
+            return Response({'error': 'No recording stored for this analysis'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return ranged_audio_response(request, analysis.audio_file)
+        except FileNotFoundError:
+            return Response({'error': 'Recording file is missing'}, status=status.HTTP_404_NOT_FOUND)
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Expert-labeled speeches that sounded most like this analysis
+
+        GET /api/speech-analysis/<id>/similar/?k=5&same_category=true
+        Neighbours are ranked by distance between feature vectors scaled
+        with the served model's scaler, and come with their expert scores
+        and coach notes.
+        """
+        analysis = self.get_object()
+        if self.predictor is None or not self.predictor.is_trained:
+            return Response(
+                {'error': 'ML model not loaded. Please train the model first.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        max_k = getattr(settings, 'SIMILAR_MAX_K', 20)
+        try:
+            k = int(request.query_params.get('k', 5))
+            if not 1 <= k <= max_k:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': 'Invalid input', 'details': {'k': [f'Must be an integer between 1 and {max_k}.']}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if analysis.feature_vector is None:
+            return Response({'error': 'No features stored for this analysis'}, status=status.HTTP_404_NOT_FOUND)
+        features = unpack_features(analysis.feature_vector, analysis.feature_schema)
+        if all(value is None for value in features.values()):
+            return Response({'error': 'No features stored for this analysis'}, status=status.HTTP_404_NOT_FOUND)
+        features['category'] = analysis.category or ''
+
+        same_category = request.query_params.get('same_category', '').lower() in ('1', 'true', 'yes')
+        index = get_similar_index(
+            self.predictor,
+            model_registry.version,
+            include_analyses=getattr(settings, 'SIMILAR_INCLUDE_ANALYSES', False),
+            refresh_interval=getattr(settings, 'SIMILAR_INDEX_REFRESH', 5.0),
+            reconcile_interval=getattr(settings, 'SIMILAR_INDEX_RECONCILE', 60.0)
+        )
+        started = time.perf_counter()
+        neighbours = similar_speeches(
+            index,
+            features,
+            k=k,
+            category=analysis.category if same_category else None,
+            exclude=[(ANALYSIS, analysis.pk)]
+        )
+        search_ms = (time.perf_counter() - started) * 1000
+
+        return Response({
+            'analysis_id': analysis.pk,
+            'model_version': model_registry.version,
+            'indexed': len(index),
+            'search_ms': round(search_ms, 2),
+            'neighbours': neighbours,
+        }, status=status.HTTP_200_OK)
+
     def _generate_feedback(self, predictions, features):
         """
         Generate human-readable feedback based on predictions.
@@ -4,6 +4,7 @@ Django settings for stage_ready_api project.
 
 from pathlib import Path
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -140,4 +141,67 @@ CORS_ALLOW_CREDENTIALS = True
 
 # ML Model settings
 ML_MODELS_DIR = BASE_DIR / 'ml_models' / 'trained_models'
+ML_FAST_MODELS_DIR = BASE_DIR / 'ml_models' / 'trained_models_fast'  # Latency-budgeted tier
+ML_MODEL_RELOAD_INTERVAL = 5.0  # Seconds between checks for a newly published model
+PREDICT_BATCH_WINDOW_MS = 2.0  # Concurrent predictions gathered into one model call (0 = off)
+PREDICT_MAX_BATCH_SIZE = 32  # Batch is dispatched early once it holds this many rows
+PREDICT_BATCH_TIMEOUT = 30.0  # Longest a prediction waits for its batch before failing
+EXPLAIN_TOP_FEATURES = 5  # Features listed per target when a request sets explain
+
+# Similar-speech retrieval (GET /api/speech-analysis/<id>/similar/)
+SIMILAR_INCLUDE_ANALYSES = False  # Also return expert-labeled analyses, not just TrainingDataset rows
+SIMILAR_INDEX_REFRESH = 5.0  # Seconds between checks for added or edited labeled rows
+SIMILAR_INDEX_RECONCILE = 60.0  # Seconds between checks for labeled rows deleted from the database
+SIMILAR_MAX_K = 20  # Most neighbours one request may ask for
+
+# Audio decoding
+AUDIO_RESAMPLE_TYPE = 'soxr_hq'  # 'soxr_lq' / 'soxr_qq' resample faster at lower quality
+AUDIO_VOICED_ONLY = False  # Spectral features over voiced segments only (see ml_models/validate_voiced.py)
+AUDIO_EXTRACTION_WORKERS = 0  # Processes for segment-parallel extraction of long recordings (0 = off)
+AUDIO_SEGMENT_SECONDS = 30.0  # Segment length for segment-parallel extraction
+EXTRACTION_POOL_SIZE = 0  # Warm extraction processes on this machine, split across WEB_WORKERS (0 = extract in the web worker)
+WEB_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))  # Web worker processes on this machine (gunicorn reads WEB_CONCURRENCY too)
+EXTRACTION_TASK_TIMEOUT = 120.0  # Seconds a worker may spend on one task before it is killed and replaced
+EXTRACTION_QUEUE_TIMEOUT = 30.0  # Seconds a task may wait for an idle extraction worker
+EXTRACTION_MAX_TASKS_PER_WORKER = 500  # Extraction workers are recycled after this many tasks
+
+# Transcription
+TRANSCRIBE_WORKERS = 4  # Concurrent recognizer calls for long recordings (0 = one call per recording)
+TRANSCRIBE_CHUNK_SECONDS = 30.0  # Longest chunk sent to the recognizer; chunks are cut at pauses
+
+# Request coalescing: identical analyze uploads in flight share one analysis
+ANALYZE_COALESCE_DIR = Path(tempfile.gettempdir()) / 'stage_ready_inflight'  # Per-box lock table (None = per process)
+ANALYZE_COALESCE_TTL = 30.0  # Seconds a finished result is served to duplicate requests
+ANALYZE_COALESCE_WAIT = 120.0  # Longest wait on another worker's identical analysis before computing it here
+
+# Stored recordings (SpeechAnalysis.audio_file) are deduplicated by content hash
+AUDIO_STORAGE_TRANSCODE = None  # 'opus' transcodes new recordings to mono Opus (needs ffmpeg)
+AUDIO_STORAGE_BITRATE = '24k'  # Opus bitrate for transcoded recordings
+
+# Resumable chunked uploads (POST /api/speech-analysis/uploads/)
+UPLOAD_SESSION_DIR = Path(tempfile.gettempdir()) / 'stage_ready_uploads'  # Chunks and assembled recordings
+UPLOAD_SESSION_TTL = 24 * 3600  # Seconds of inactivity before an upload session is deleted
+UPLOAD_MAX_BYTES = 200 * 1024 ** 2  # Largest recording accepted through chunked upload
+UPLOAD_CHUNK_BYTES = 1024 ** 2  # Chunk size when the client does not choose one
+UPLOAD_MAX_CHUNK_BYTES = 8 * 1024 ** 2  # Largest chunk size a client may choose
+UPLOAD_COMPLETED_TTL = 15 * 60  # Seconds an assembled or analyzed session is kept (the recording is deleted once analyzed)
+UPLOAD_MAX_SESSIONS_PER_CLIENT = 4  # Unfinished uploads one user (or anonymous address) may have open
+UPLOAD_MAX_TOTAL_BYTES = 4 * 1024 ** 3  # Bytes all unfinished uploads together may reserve
+
+# Admission control: bounded concurrency and queues; overflow gets 429 + Retry-After
+ADMISSION_LOCK_DIR = Path(tempfile.gettempdir()) / 'stage_ready_admission'  # Box-wide slot lock files
+ANALYZE_MAX_CONCURRENT = 2  # Analyses running at once per worker process
+ANALYZE_BOX_SLOTS = os.cpu_count() or 1  # Analyses running at once across all workers on this machine
+ANALYZE_MAX_QUEUE = 8  # Analyses waiting for a slot per worker; more are rejected
+ANALYZE_QUEUE_TIMEOUT = 30.0  # Seconds an analysis may wait for a slot
+ANALYZE_PER_USER_LIMIT = 2  # Analyses one user (or anonymous address) may have running or queued
+PREDICT_MAX_CONCURRENT = 16  # Separate lane so cheap predictions never queue behind uploads
+PREDICT_MAX_QUEUE = 64
+PREDICT_QUEUE_TIMEOUT = 5.0
+PREDICT_PER_USER_LIMIT = 8
+TRUSTED_PROXY_COUNT = 0  # Reverse proxies that append X-Forwarded-For; 0 keys anonymous quotas on REMOTE_ADDR
+
+# Async views (ASGI): bounded executors for CPU work and blocking waits
+ASYNC_CPU_WORKERS = 2  # Threads running admitted analyses and scoring for the async endpoints
+ASYNC_IO_WORKERS = 32  # Threads for coalescing and admission waits and model loading
 DATASET_DIR = BASE_DIR / 'data'